@@ -0,0 +1,117 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for the memory saved by deduplicating shared values in batch responses.
+
+This script builds a synthetic batch response for a large account, where tasks share a
+handful of projects, time zones, tags, and repeat flags, and validates it into a
+`GetBatchV2` model. Each run happens in a fresh process, once with the shared values
+deduplicated, as the models do by default, and once with the deduplication disabled.
+It reports the memory held by the validated model, measured with `tracemalloc`, and the
+peak resident set size (RSS) of the process.
+"""
+
+from __future__ import annotations
+
+import json
+import resource
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from bson import ObjectId
+from click import command, option
+from loguru import logger
+
+from pyticktick.models.v2 import GetBatchV2, models
+
+PROJECTS = [str(ObjectId()) for _ in range(20)]
+TIME_ZONES = ["America/New_York", "Europe/Paris", "Asia/Tokyo"]
+TAGS = ["work", "home", "errands", "health", "reading"]
+RULES = [None, "RRULE:FREQ=DAILY;INTERVAL=1", "RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO"]
+
+
+def _batch(n: int) -> bytes:
+    tasks = [
+        {
+            "id": str(ObjectId()),
+            "etag": "abcd1234",
+            "isFloating": False,
+            "items": [],
+            "modifiedTime": "2025-04-15T15:15:35.000+0000",
+            "priority": 0,
+            "projectId": PROJECTS[i % len(PROJECTS)],
+            "status": 0,
+            "title": f"Task {i}",
+            "creator": 1234567890,
+            "deleted": 0,
+            "sortOrder": -i,
+            "tags": TAGS[: i % len(TAGS)],
+            "timeZone": TIME_ZONES[i % len(TIME_ZONES)],
+            "repeatFlag": RULES[i % len(RULES)],
+        }
+        for i in range(n)
+    ]
+    batch = {
+        "inboxId": "inbox123",
+        "projectGroups": None,
+        "projectProfiles": [],
+        "syncTaskBean": {
+            "update": tasks,
+            "add": [],
+            "delete": [],
+            "empty": False,
+            "tagUpdate": [],
+        },
+        "tags": [],
+        "checkPoint": 1,
+        "checks": None,
+        "filters": None,
+        "syncOrderBean": {},
+        "syncOrderBeanV3": {"orderByType": {}},
+        "syncTaskOrderBean": {
+            "taskOrderByDate": {},
+            "taskOrderByPriority": {},
+            "taskOrderByProject": {},
+        },
+        "remindChanges": [],
+    }
+    return json.dumps(batch).encode()
+
+
+def _run(n: int, *, intern: bool) -> tuple[float, float]:
+    if not intern:
+        models.intern_value = lambda v: v  # pyright: ignore[reportAttributeAccessIssue]
+
+    raw = _batch(n)
+    tracemalloc.start()
+    batch = GetBatchV2.model_validate(json.loads(raw))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del batch
+
+    # `ru_maxrss` is in bytes on macOS and in kilobytes on Linux
+    scale = 1 if sys.platform == "darwin" else 2**10
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return current / 2**20, rss / 2**20
+
+
+@command()
+@option("-n", "--tasks", "n_tasks", default=50000, help="The number of tasks")
+def main(n_tasks: int) -> None:
+    """Measure the memory used by a validated batch response.
+
+    Args:
+        n_tasks (int): The number of tasks in the batch response.
+    """
+    for intern in [False, True]:
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            held, rss = executor.submit(_run, n_tasks, intern=intern).result()
+        label = "deduplicated" if intern else "not deduplicated"
+        logger.info(
+            f"{label}: {held:.1f} MiB held by the model, {rss:.1f} MiB peak RSS"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for the memory usage of compact tasks.
+
+This script builds a set of synthetic task JSON objects, like the ones returned by the
+V2 API, and measures how much memory it takes to hold them as raw dictionaries, as
+validated `TaskV2` models, and as `CompactTaskV2` objects with and without their JSON,
+using `tracemalloc`.
+"""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from bson import ObjectId
+from click import command, option
+from loguru import logger
+
+from pyticktick.compact import compact_tasks
+from pyticktick.models.v2 import TaskV2
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _data(n: int) -> bytes:
+    tasks = [
+        {
+            "id": str(ObjectId()),
+            "etag": "abcd1234",
+            "isFloating": False,
+            "items": [
+                {"id": str(ObjectId()), "title": f"Item {j}", "status": 0}
+                for j in range(i % 4)
+            ],
+            "kind": "CHECKLIST" if i % 4 else "TEXT",
+            "modifiedTime": "2025-04-15T15:15:35.000+0000",
+            "createdTime": "2025-04-15T15:15:35.000+0000",
+            "dueDate": "2025-04-16T04:00:00.000+0000",
+            "priority": 0,
+            "projectId": f"67ec273212e1101e875f0a0{i % 10}",
+            "status": 0,
+            "title": f"Task {i}",
+            "content": "Some notes about the task",
+            "creator": 123,
+            "deleted": 0,
+            "sortOrder": -i,
+            "tags": ["work", "errands"][: i % 3],
+            "timeZone": "America/New_York",
+        }
+        for i in range(n)
+    ]
+    return json.dumps(tasks).encode()
+
+
+def _measure(
+    label: str,
+    raw: bytes,
+    build: Callable[[list[dict[str, Any]]], Any],
+) -> Any:  # noqa: ANN401
+    tracemalloc.start()
+    t0 = perf_counter()
+    result = build(json.loads(raw))
+    t1 = perf_counter()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.info(f"{label}: {current / 2**20:.1f} MiB, built in {t1 - t0:.3f}s")
+    return result
+
+
+@command()
+@option("-n", "--tasks", "n_tasks", default=20000, help="The number of tasks")
+def main(n_tasks: int) -> None:
+    """Measure the memory used to hold tasks in each representation.
+
+    Args:
+        n_tasks (int): The number of tasks to build.
+    """
+    raw = _data(n_tasks)
+    _measure("raw dicts", raw, lambda data: data)
+    _measure(
+        "TaskV2 models",
+        raw,
+        lambda data: [TaskV2.model_validate(task) for task in data],
+    )
+    _measure(
+        "CompactTaskV2 objects, without JSON",
+        raw,
+        lambda data: compact_tasks(data, keep_raw=False),
+    )
+    tasks = _measure("CompactTaskV2 objects", raw, compact_tasks)
+
+    t0 = perf_counter()
+    for task in tasks[:1000]:
+        task.to_model()
+    t1 = perf_counter()
+    logger.info(f"to_model: {(t1 - t0) / min(len(tasks), 1000) * 1e6:.1f}us per task")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for the HTTP transport settings of the client, against the live V2 API.
+
+This script downloads the full batch response, `GET /batch/check/0`, several times
+with every combination of HTTP/2 and response compression, both sequentially and from
+a thread pool sharing the same client. It reports the wall time of each run, and the
+bytes that travelled over the wire compared to the size of the decoded responses.
+
+It requires the V2 API settings to be set as environment variables, see
+[`Settings`](https://pyticktick.pretzer.io/reference/settings/), and HTTP/2 is only
+benchmarked when the `h2` package is installed.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from time import perf_counter
+
+from click import command, option
+from loguru import logger
+
+from pyticktick import Client
+
+
+def _download(client: Client) -> tuple[int, int]:
+    resp = client.http_client.get(
+        str(client.v2_base_url.join("batch/check/0")),
+        headers=client.v2_headers,
+        cookies=client.v2_cookies,
+    )
+    resp.raise_for_status()
+    return resp.num_bytes_downloaded, len(resp.content)
+
+
+@command()
+@option("-n", "--requests", "n_requests", default=8, help="The number of requests")
+@option("-w", "--workers", "workers", default=8, help="The number of threads")
+def main(n_requests: int, workers: int) -> None:
+    """Time downloading the batch response with each transport setting.
+
+    Args:
+        n_requests (int): The number of requests to send per run.
+        workers (int): The number of threads to send the concurrent requests with.
+    """
+    base = Client()
+    configs = [(False, False), (False, True)]
+    if find_spec("h2") is not None:
+        configs += [(True, False), (True, True)]
+    else:
+        logger.warning("`h2` is not installed, skipping HTTP/2")
+
+    for http2, compression in configs:
+        with base.model_copy(
+            update={"http2": http2, "http_compression": compression},
+        ) as client:
+            _download(client)  # warm up the connection
+            label = (
+                f"HTTP/{'2' if http2 else '1.1'}, Accept-Encoding "
+                f"`{client.accept_encoding}`"
+            )
+
+            t0 = perf_counter()
+            sizes = [_download(client) for _ in range(n_requests)]
+            sequential = perf_counter() - t0
+
+            t0 = perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(lambda _: _download(client), range(n_requests)))
+            concurrent = perf_counter() - t0
+
+        wire = sum(s[0] for s in sizes) / n_requests
+        body = sum(s[1] for s in sizes) / n_requests
+        logger.info(
+            f"{label}: {sequential:.2f}s sequential, {concurrent:.2f}s concurrent, "
+            f"{wire / 2**10:.0f} KiB over the wire for {body / 2**10:.0f} KiB of JSON",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for encoding request bodies and decoding responses.
+
+This script compares the previous way the client handled JSON, dumping models to a
+dictionary and letting the standard library encode it, and decoding responses with the
+standard library, against encoding models straight to JSON bytes and decoding responses
+with every codec that is installed.
+"""
+
+from __future__ import annotations
+
+import json
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from bson import ObjectId
+from click import command, option
+from loguru import logger
+
+from pyticktick.codec import get_codec
+from pyticktick.models.v2 import PostBatchTaskV2
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _body(n: int) -> PostBatchTaskV2:
+    return PostBatchTaskV2.model_validate(
+        {
+            "add": [
+                {
+                    "id": str(ObjectId()),
+                    "project_id": "inbox123",
+                    "title": f"Task {i}",
+                    "content": "Some notes about the task",
+                    "start_date": "2025-04-15T15:00:00.000+0000",
+                    "time_zone": "America/New_York",
+                    "tags": ["work"],
+                }
+                for i in range(n)
+            ],
+        },
+    )
+
+
+def _time(label: str, func: Callable[[], object], repeat: int) -> None:
+    t0 = perf_counter()
+    for _ in range(repeat):
+        func()
+    t1 = perf_counter()
+    logger.info(f"{label}: {(t1 - t0) / repeat * 1000:.1f}ms")
+
+
+@command()
+@option("-n", "--tasks", "n_tasks", default=10000, help="The number of tasks")
+@option("-r", "--repeat", "repeat", default=5, help="The number of repetitions")
+def main(n_tasks: int, repeat: int) -> None:
+    """Time encoding a batch request body and decoding it back.
+
+    Args:
+        n_tasks (int): The number of tasks in the request body.
+        repeat (int): The number of times to repeat each measurement.
+    """
+    body = _body(n_tasks)
+    encoded = body.model_dump_json(by_alias=True).encode()
+    logger.info(f"request body of {len(encoded) / 2**20:.1f} MiB")
+
+    _time(
+        "encode, model_dump + json.dumps",
+        lambda: json.dumps(body.model_dump(by_alias=True, mode="json")).encode(),
+        repeat,
+    )
+    _time(
+        "encode, model_dump_json",
+        lambda: body.model_dump_json(by_alias=True).encode(),
+        repeat,
+    )
+    for name in ["json", "orjson", "msgspec"]:
+        try:
+            codec = get_codec(name)  # pyright: ignore[reportArgumentType]
+        except ValueError:
+            logger.info(f"decode, {name}: not installed")
+            continue
+        _time(f"decode, {name}", lambda codec=codec: codec.loads(encoded), repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for validating list responses with cached `TypeAdapter`s.
+
+This script builds synthetic closed task and project list responses, and times how long
+it takes to validate them through their `RootModel` wrappers, `ClosedRespV2` and
+`ProjectsRespV1`, against the cached adapters returned by `list_adapter`, which
+validate straight into plain lists. It also times building a new adapter for each
+response, as was done before adapters were cached.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from bson import ObjectId
+from click import command, option
+from loguru import logger
+from pydantic import TypeAdapter
+
+from pyticktick.models.v1 import ProjectV1
+from pyticktick.models.v1.responses.project import ProjectsRespV1
+from pyticktick.models.v2 import TaskV2
+from pyticktick.models.v2.responses.closed import ClosedRespV2
+from pyticktick.pydantic import list_adapter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _tasks(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(ObjectId()),
+            "etag": "abcd1234",
+            "isFloating": False,
+            "items": [],
+            "modifiedTime": "2025-04-15T15:15:35.000+0000",
+            "completedTime": "2025-04-16T15:15:35.000+0000",
+            "priority": 0,
+            "projectId": "inbox123",
+            "status": 2,
+            "title": f"Task {i}",
+            "creator": 123,
+            "deleted": 0,
+            "sortOrder": -i,
+            "startDate": "2025-04-15T15:00:00.000+0000",
+            "timeZone": "America/New_York",
+            "reminders": [{"id": str(ObjectId()), "trigger": "TRIGGER:-PT30M"}],
+        }
+        for i in range(n)
+    ]
+
+
+def _projects(n: int) -> list[dict]:
+    return [
+        {"id": str(ObjectId()), "name": f"Project {i}", "kind": "TASK", "sortOrder": i}
+        for i in range(n)
+    ]
+
+
+def _best(func: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        func()
+        times.append(perf_counter() - t0)
+    return min(times)
+
+
+@command()
+@option("-n", "--tasks", "n_tasks", default=20000, help="The number of closed tasks")
+@option("-p", "--projects", "n_projects", default=200, help="The number of projects")
+@option("-r", "--repeat", default=5, help="The number of runs, the best is reported")
+def main(n_tasks: int, n_projects: int, repeat: int) -> None:
+    """Time the validation of list responses through each path.
+
+    Args:
+        n_tasks (int): The number of tasks in the closed tasks response.
+        n_projects (int): The number of projects in the projects response.
+        repeat (int): The number of times each path is run.
+    """
+    cases = [
+        ("closed tasks", _tasks(n_tasks), ClosedRespV2, TaskV2),
+        ("projects", _projects(n_projects), ProjectsRespV1, ProjectV1),
+    ]
+    for name, data, root_model, model in cases:
+        root = _best(lambda: root_model.model_validate(data).root, repeat)  # noqa: B023
+        cached = _best(lambda: list_adapter(model).validate_python(data), repeat)  # noqa: B023
+        uncached = _best(
+            lambda: TypeAdapter(list[model]).validate_python(data),  # noqa: B023
+            repeat,
+        )
+        logger.info(
+            f"{name} ({len(data)}): RootModel {root * 1000:.2f}ms, cached adapter "
+            f"{cached * 1000:.2f}ms ({root / cached:.2f}x), new adapter "
+            f"{uncached * 1000:.2f}ms ({root / uncached:.2f}x)",
+        )
+
+
+if __name__ == "__main__":
+    main()
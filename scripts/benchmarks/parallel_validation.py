@@ -0,0 +1,79 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for validating the tasks of a large response across processes.
+
+This script builds a list of synthetic task JSON objects, with time zones, reminders,
+and repeat flags to exercise the custom validators, and times how long it takes to
+validate them into `TaskV2` models with an increasing number of workers.
+"""
+
+from __future__ import annotations
+
+import os
+from time import perf_counter
+
+from bson import ObjectId
+from click import command, option
+from loguru import logger
+
+from pyticktick.models.v2 import TaskV2
+from pyticktick.pydantic import validate_in_parallel
+
+
+def _tasks(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(ObjectId()),
+            "etag": "abcd1234",
+            "isFloating": False,
+            "items": [],
+            "modifiedTime": "2025-04-15T15:15:35.000+0000",
+            "priority": 0,
+            "projectId": "inbox123",
+            "status": 0,
+            "title": f"Task {i}",
+            "creator": 123,
+            "deleted": 0,
+            "sortOrder": -i,
+            "startDate": "2025-04-15T15:00:00.000+0000",
+            "timeZone": "America/New_York",
+            "reminders": [{"id": str(ObjectId()), "trigger": "TRIGGER:-PT30M"}],
+            "repeatFlag": "RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,WE",
+        }
+        for i in range(n)
+    ]
+
+
+@command()
+@option("-n", "--tasks", "n_tasks", default=50000, help="The number of tasks")
+@option(
+    "-w",
+    "--max-workers",
+    "max_workers",
+    default=os.cpu_count() or 1,
+    help="The maximum number of workers",
+)
+def main(n_tasks: int, max_workers: int) -> None:
+    """Time the validation of tasks with an increasing number of workers.
+
+    Args:
+        n_tasks (int): The number of tasks to validate.
+        max_workers (int): The maximum number of workers to validate the tasks with.
+    """
+    data = _tasks(n_tasks)
+    workers = 1
+    baseline = None
+    while workers <= max_workers:
+        t0 = perf_counter()
+        tasks = validate_in_parallel(TaskV2, data, workers)
+        elapsed = perf_counter() - t0
+        baseline = baseline or elapsed
+        logger.info(
+            f"{workers} worker(s): {elapsed:.3f}s for {len(tasks)} tasks, "
+            f"{baseline / elapsed:.2f}x",
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#! /usr/bin/env uv run python
+
+"""Benchmark for expanding the repeat flags of many tasks.
+
+This script builds a set of recurring tasks with a mix of TickTick repeat flags, and
+times how long it takes to expand all of them over a date window. It compares
+`expand_tasks`, which shares compiled rules between tasks, against parsing every rule
+from scratch with `rrulestr`, which is what the rules cost without the cache.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from bson import ObjectId
+from click import command, option
+from dateutil.rrule import rrulestr
+from loguru import logger
+
+from pyticktick.models.v2 import TaskV2
+from pyticktick.recurrence import compile_tt_rrule, expand_tasks
+
+RULES = [
+    "RRULE:FREQ=DAILY;INTERVAL=1",
+    "RRULE:FREQ=DAILY;INTERVAL=2",
+    "RRULE:FREQ=DAILY;INTERVAL=1;TT_SKIP=WEEKEND",
+    "RRULE:FREQ=WEEKLY;INTERVAL=1;WKST=SU;BYDAY=FR,TH,WE",
+    "RRULE:FREQ=MONTHLY;INTERVAL=1;BYMONTHDAY=20",
+    "RRULE:FREQ=MONTHLY;INTERVAL=4;BYDAY=5TU",
+    "RRULE:FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=1;TT_WORKDAY=1",
+    "RRULE:FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=-1;TT_WORKDAY=-1",
+    "ERULE:NAME=CUSTOM;BYDATE=20250731,20250819",
+]
+
+
+def _tasks(n: int, start: datetime) -> list[TaskV2]:
+    return [
+        TaskV2.model_validate(
+            {
+                "id": str(ObjectId()),
+                "etag": "abcd1234",
+                "isFloating": False,
+                "items": [],
+                "modifiedTime": "2025-04-15T15:15:35.000+0000",
+                "priority": 0,
+                "projectId": "inbox123",
+                "status": 0,
+                "title": f"Task {i}",
+                "creator": 123,
+                "deleted": 0,
+                "sortOrder": 0,
+                "repeatFlag": RULES[i % len(RULES)],
+                "startDate": (start + timedelta(hours=i % 24)).isoformat(),
+                "timeZone": "America/New_York",
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def _uncached(tasks: list[TaskV2], start: datetime, end: datetime) -> int:
+    total = 0
+    for task in tasks:
+        if task.repeat_flag is None or task.start_date is None:
+            continue
+        if task.repeat_flag.startswith("ERULE:"):
+            continue
+        rule = task.repeat_flag
+        for config in ["TT_SKIP=WEEKEND", "TT_WORKDAY=1", "TT_WORKDAY=-1"]:
+            rule = rule.replace(f";{config}", "")
+        parsed = rrulestr(rule, dtstart=task.start_date)
+        total += len(parsed.between(start, end))
+    return total
+
+
+@command()
+@option("-n", "--tasks", "n_tasks", default=5000, help="The number of tasks")
+@option("-d", "--days", "days", default=90, help="The size of the window, in days")
+def main(n_tasks: int, days: int) -> None:
+    """Time the expansion of recurring tasks over a date window.
+
+    Args:
+        n_tasks (int): The number of tasks to expand.
+        days (int): The size of the window to expand the tasks over, in days.
+    """
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    window_start = start + timedelta(days=120)
+    window_end = window_start + timedelta(days=days)
+    tasks = _tasks(n_tasks, start)
+
+    t0 = perf_counter()
+    total = _uncached(tasks, window_start, window_end)
+    t1 = perf_counter()
+    logger.info(f"rrulestr per task (no extensions): {t1 - t0:.3f}s, {total} dates")
+
+    compile_tt_rrule.cache_clear()
+    for label in ["cold cache", "warm cache"]:
+        t0 = perf_counter()
+        expanded = expand_tasks(tasks, window_start, window_end)
+        t1 = perf_counter()
+        total = sum(len(v) for v in expanded.values())
+        logger.info(f"expand_tasks ({label}): {t1 - t0:.3f}s, {total} dates")
+    logger.info(f"compiled rule cache: {compile_tt_rrule.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ from click import command, confirm, option
 from loguru import logger
 
 from pyticktick import Client
+from pyticktick.tag_index import TagIndex, execute_plan
 
 
 @command()
@@ -33,7 +34,7 @@ from pyticktick import Client
     default=None,
     help="The password for the V2 API",
 )
-def main(username: str | None, password: str | None) -> None:  # noqa: C901
+def main(username: str | None, password: str | None) -> None:
     """Delete all objects from a TickTick account.
 
     Args:
@@ -87,8 +88,8 @@ def main(username: str | None, password: str | None) -> None:  # noqa: C901
 
         if len(tags) > 0:
             logger.info("Deleting tags")
-            for tag in tags:
-                client.delete_tag_v2({"name": tag.name})
+            index = TagIndex(tags)
+            execute_plan(client, index.plan(deletes=[tag.name for tag in tags]))
 
         if len(tasks + projects + project_groups + tags) > 0:
             logger.info("All objects have been deleted.")
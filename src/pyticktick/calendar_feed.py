@@ -0,0 +1,366 @@
+"""iCalendar subscription feed of TickTick tasks, maintained incrementally.
+
+This module contains the `CalendarFeed` class, which publishes the tasks of an account
+as an `.ics` feed that calendar apps can subscribe to. Each
+[`TaskV2`](models/v2/models.md#pyticktick.models.v2.models.TaskV2) is mapped to a
+`VTODO` component, or to a `VEVENT` component for calendars that do not show to-dos:
+
+- `start_date` and `due_date` become `DTSTART` and `DUE`, or `DTEND` for events, as
+    dates for all-day tasks, and in the time zone of the task otherwise.
+- `repeat_flag` becomes an `RRULE`, or an `RDATE` for `ERULE` repeat flags.
+    `TT_WORKDAY` is translated to the equivalent `BYSETPOS` rule, while `TT_SKIP`, which
+    has no iCalendar equivalent, is dropped.
+- `reminders` become `VALARM` components.
+- `title`, `content`, `tags`, `priority`, and `status` become `SUMMARY`, `DESCRIPTION`,
+    `CATEGORIES`, `PRIORITY`, and `STATUS`.
+
+Building and serializing components with
+[icalendar](https://icalendar.readthedocs.io/) is by far the slowest part of
+generating a feed, so each task is serialized once, and its serialized component is
+cached along with the `etag` of the task. Applying a delta batch response only
+rebuilds the components of the tasks whose `etag` changed, and the feed itself is only
+reassembled when a component changed. The feed has its own `etag`, so that it can be
+served with an `ETag` header, and answered with `304 Not Modified` when unchanged.
+
+Dates in the time zone of a task refer to it with a `TZID` parameter, so the feed
+includes a `VTIMEZONE` component for each time zone used by its tasks, which is also
+only serialized once.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.calendar_feed import CalendarFeed
+
+    client = Client()
+    batch = client.get_batch_v2()
+    feed = CalendarFeed.from_batch(batch, name="My tasks")
+
+    # on each request for the feed
+    feed.apply_batch(client.get_batch_v2(check_point=batch.check_point))
+    if feed.not_modified(request_headers.get("If-None-Match")):
+        status, body = 304, b""
+    else:
+        status, body = 200, feed.to_ical()
+    headers = {"ETag": feed.etag, "Content-Type": "text/calendar; charset=utf-8"}
+    ```
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from icalendar import Alarm, Calendar, Event, Timezone, Todo, vRecur
+from loguru import logger
+
+from pyticktick.models.v2.types import convert_ical_trigger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date, tzinfo
+
+    from icalendar import Component
+
+    from pyticktick.models.v2.models import TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+FeedComponent = Literal["VTODO", "VEVENT"]
+"""The iCalendar component tasks are published as."""
+
+_END = b"END:VCALENDAR\r\n"
+_WEEKDAYS = "MO,TU,WE,TH,FR"
+_PRIORITIES = {1: 9, 3: 5, 5: 1}
+_STATUSES = {
+    "VTODO": {-1: "CANCELLED", 0: "NEEDS-ACTION", 1: "COMPLETED", 2: "COMPLETED"},
+    "VEVENT": {-1: "CANCELLED", 0: "CONFIRMED", 1: "CONFIRMED", 2: "CONFIRMED"},
+}
+
+_trigger_delta = lru_cache(maxsize=1024)(convert_ical_trigger)
+
+
+@lru_cache(maxsize=256)
+def _zone(name: str | None) -> tzinfo:
+    if name is None:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        logger.warning(f"Unknown time zone `{name}`, using UTC instead")
+        return timezone.utc
+
+
+@lru_cache(maxsize=256)
+def _vtimezone(tzid: str) -> bytes:
+    try:
+        return Timezone.from_tzid(tzid).to_ical()
+    except (ValueError, KeyError, ZoneInfoNotFoundError):
+        logger.warning(f"Cannot build the `VTIMEZONE` of time zone `{tzid}`")
+        return b""
+
+
+def _tzids(component: Component) -> frozenset[str]:
+    tzids = (
+        value.params.get("TZID")
+        for _, value in component.property_items(sorted=False)
+        if hasattr(value, "params")
+    )
+    return frozenset(tzid for tzid in tzids if tzid is not None)
+
+
+def _add_recurrence(component: Component, flag: str) -> None:
+    if flag.startswith("ERULE:"):
+        for part in flag.removeprefix("ERULE:").split(";"):
+            if part.startswith("BYDATE="):
+                dates = [
+                    datetime.strptime(d, "%Y%m%d").date()  # noqa: DTZ007
+                    for d in part.removeprefix("BYDATE=").split(",")
+                ]
+                component.add("rdate", dates)
+        return
+    parts = []
+    workday = None
+    for part in flag.removeprefix("RRULE:").split(";"):
+        if part.startswith("TT_WORKDAY="):
+            workday = part.removeprefix("TT_WORKDAY=")
+        elif part and not part.startswith("TT_"):
+            parts.append(part)
+    if workday is not None:
+        parts = [p for p in parts if not p.startswith(("BYMONTHDAY=", "BYDAY="))]
+        parts += [f"BYDAY={_WEEKDAYS}", f"BYSETPOS={workday}"]
+    component.add("rrule", vRecur.from_ical(";".join(parts)))
+
+
+def _add_alarms(component: Component, task: TaskV2) -> None:
+    triggers = {r.trigger for r in task.reminders or []}
+    if not triggers and task.reminder is not None:
+        triggers.add(task.reminder)
+    for trigger in sorted(triggers):
+        try:
+            delta = _trigger_delta(trigger)
+        except (ValueError, TypeError):
+            logger.warning(f"Skipping invalid reminder `{trigger}` of task `{task.id}`")
+            continue
+        if delta is None:
+            continue
+        alarm = Alarm()
+        alarm.add("action", "DISPLAY")
+        alarm.add("description", task.title or "")
+        alarm.add("trigger", delta)
+        component.add_component(alarm)
+
+
+def _dates(
+    task: TaskV2,
+    kind: FeedComponent,
+) -> tuple[date | datetime | None, date | datetime | None]:
+    tz = _zone(task.time_zone)
+
+    def _value(dt: datetime | None) -> date | datetime | None:
+        if dt is None:
+            return None
+        local = dt.astimezone(tz) if dt.tzinfo is not None else dt.replace(tzinfo=tz)
+        return local.date() if task.is_all_day else local
+
+    start = _value(task.start_date)
+    due = _value(task.due_date)
+    if kind == "VEVENT" and start is None:
+        start, due = due, None
+    if due is not None and start is not None and due <= start:
+        due = None
+    if kind == "VEVENT" and due is None and task.is_all_day and start is not None:
+        # All-day events end on the day after their last day.
+        due = start + timedelta(days=1)
+    return start, due
+
+
+def task_component(task: TaskV2, kind: FeedComponent = "VTODO") -> Component | None:
+    """Map a task to an iCalendar component.
+
+    Args:
+        task (TaskV2): The task to map.
+        kind (FeedComponent): The component to map the task to. Defaults to `VTODO`.
+
+    Returns:
+        Component | None: The component, or `None` if `kind` is `VEVENT` and the task
+            has neither a start date nor a due date, as events must have a start.
+    """
+    start, due = _dates(task, kind)
+    if kind == "VEVENT" and start is None:
+        return None
+
+    component = Todo() if kind == "VTODO" else Event()
+    component.add("uid", task.id)
+    component.add("dtstamp", task.modified_time)
+    component.add("summary", task.title or "")
+    if task.content or task.desc:
+        component.add("description", task.content or task.desc)
+    if start is not None:
+        component.add("dtstart", start)
+    if due is not None:
+        component.add("due" if kind == "VTODO" else "dtend", due)
+    if task.priority:
+        component.add("priority", _PRIORITIES[task.priority])
+    component.add("status", _STATUSES[kind][task.status])
+    if kind == "VTODO" and task.completed_time is not None and task.status > 0:
+        component.add("completed", task.completed_time.astimezone(timezone.utc))
+    if task.tags:
+        component.add("categories", task.tags)
+    if task.repeat_flag and (start is not None or due is not None):
+        _add_recurrence(component, task.repeat_flag)
+    _add_alarms(component, task)
+    return component
+
+
+class CalendarFeed:
+    """iCalendar feed of a set of tasks, with each task serialized at most once.
+
+    The serialized component of each task is cached by the `etag` of the task, and the
+    serialized feed is cached until a task is added, changed, or removed.
+
+    Attributes:
+        name (str | None): The name of the calendar, shown by calendar apps.
+        kind (FeedComponent): The component tasks are published as.
+        rebuilt (int): The number of task components serialized since the feed was
+            created.
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[TaskV2] = (),
+        *,
+        name: str | None = None,
+        kind: FeedComponent = "VTODO",
+    ) -> None:
+        """Build the feed from a collection of tasks.
+
+        Args:
+            tasks (Iterable[TaskV2]): The tasks to publish.
+            name (str | None): The name of the calendar. Defaults to `None`.
+            kind (FeedComponent): The component tasks are published as. Defaults to
+                `VTODO`.
+        """
+        self.name = name
+        self.kind = kind
+        # The `etag` of each task, its serialized component, and the time zones it
+        # uses, by task ID.
+        self._components: dict[str, tuple[str, bytes, frozenset[str]]] = {}
+        self._feed: bytes | None = None
+        self._etag: str | None = None
+        self.rebuilt = 0
+        for task in tasks:
+            self.upsert_task(task)
+
+    @classmethod
+    def from_batch(
+        cls,
+        batch: GetBatchV2,
+        *,
+        name: str | None = None,
+        kind: FeedComponent = "VTODO",
+    ) -> CalendarFeed:
+        """Build the feed from all the active tasks in a batch response.
+
+        Args:
+            batch (GetBatchV2): The batch response to build the feed from.
+            name (str | None): The name of the calendar. Defaults to `None`.
+            kind (FeedComponent): The component tasks are published as. Defaults to
+                `VTODO`.
+
+        Returns:
+            CalendarFeed: The feed of all the active tasks.
+        """
+        return cls(batch.sync_task_bean.update, name=name, kind=kind)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._components)
+
+    def upsert_task(self, task: TaskV2) -> None:
+        """Add a task to the feed, serializing it only if its `etag` changed.
+
+        Args:
+            task (TaskV2): The task to add or update.
+        """
+        cached = self._components.get(task.id)
+        if cached is not None and cached[0] == task.etag:
+            return
+        component = task_component(task, self.kind)
+        self.rebuilt += 1
+        if component is None:
+            self.remove_task(task.id)
+            return
+        self._components[task.id] = (
+            task.etag,
+            component.to_ical(),
+            _tzids(component),
+        )
+        self._feed = None
+
+    def remove_task(self, task_id: str) -> None:
+        """Remove a task from the feed, if it is in it.
+
+        Args:
+            task_id (str): The ID of the task to remove.
+        """
+        if self._components.pop(task_id, None) is not None:
+            self._feed = None
+
+    def apply_batch(self, batch: GetBatchV2) -> None:
+        """Apply the task changes of a batch response, including delta responses.
+
+        Args:
+            batch (GetBatchV2): The batch response to apply.
+        """
+        for task in batch.sync_task_bean.update:
+            self.upsert_task(task)
+        for task_id in batch.sync_task_bean.deleted_ids:
+            self.remove_task(task_id)
+
+    def to_ical(self) -> bytes:
+        """Serialize the feed, reusing the serialized components of unchanged tasks.
+
+        Returns:
+            bytes: The `.ics` feed.
+        """
+        if self._feed is None:
+            calendar = Calendar()
+            calendar.add("prodid", "-//pyticktick//CalendarFeed//EN")
+            calendar.add("version", "2.0")
+            if self.name is not None:
+                calendar.add("x-wr-calname", self.name)
+            head = calendar.to_ical().removesuffix(_END)
+            tzids = set().union(*(c[2] for c in self._components.values()))
+            head += b"".join(_vtimezone(tzid) for tzid in sorted(tzids))
+            # Components are sorted by task ID, so that the same tasks always give the
+            # same feed, and the same `etag`.
+            body = b"".join(self._components[k][1] for k in sorted(self._components))
+            self._feed = head + body + _END
+            self._etag = f'"{hashlib.sha256(self._feed).hexdigest()[:32]}"'
+        return self._feed
+
+    @property
+    def etag(self) -> str:
+        """Get the strong `ETag` of the feed, quoted as in an HTTP header.
+
+        Returns:
+            str: The `ETag`, which only changes when the content of the feed does.
+        """
+        self.to_ical()
+        return self._etag  # type: ignore[return-value]
+
+    def not_modified(self, if_none_match: str | None) -> bool:
+        """Check if a client already has the current feed.
+
+        Args:
+            if_none_match (str | None): The `If-None-Match` header of the request.
+
+        Returns:
+            bool: `True` if the header matches the `etag` of the feed, in which case
+                the request can be answered with `304 Not Modified`.
+        """
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
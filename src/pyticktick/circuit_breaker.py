@@ -0,0 +1,299 @@
+"""Circuit breakers that stop calling the TickTick APIs while they are degraded.
+
+When TickTick is overloaded or down, every request keeps waiting for its timeout, and
+the retries of the V1 API hold each caller for up to several minutes, which only adds to
+the load. A circuit breaker tracks the outcome and latency of the recent requests to an
+API and, once too many of them fail or are too slow, fails fast for a while instead of
+sending new requests.
+
+A circuit breaker goes through three states:
+
+- `closed`: requests are sent, and their outcomes are recorded.
+- `open`: requests fail immediately with a `CircuitOpenError`, until `reset_timeout`
+    has passed.
+- `half_open`: a limited number of probe requests are sent. If they all succeed, the
+    circuit closes again, otherwise it opens for another `reset_timeout`.
+
+Connection errors, timeouts, `429 Too Many Requests` and `5xx` responses count as
+failures, as well as requests slower than `slow_call_duration`, if set. Other error
+responses, like `404 Not Found`, mean that the API is healthy, and count as successes.
+
+Circuit breakers are disabled by default, and are enabled with the `circuit_breaker`
+setting of the client. There is one circuit breaker per API version, or one per
+endpoint family, like `v2/batch` or `v1/project`, with `per_endpoint`.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.circuit_breaker import CircuitBreakerConfig, CircuitOpenError
+
+
+    def on_state_change(name, old, new):
+        print(f"Circuit {name}: {old} -> {new}")
+
+
+    client = Client(
+        circuit_breaker=CircuitBreakerConfig(
+            failure_ratio=0.5,
+            reset_timeout=30,
+            on_state_change=on_state_change,
+        ),
+    )
+    try:
+        projects = client.get_projects_v1()
+    except CircuitOpenError:
+        projects = None
+    print(client.circuit_breakers["v1"].state)
+    ```
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Literal
+
+import httpx
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field
+
+from pyticktick.exceptions import RateLimitedError, ServerError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+CircuitState = Literal["closed", "open", "half_open"]
+"""The state of a circuit breaker."""
+
+_OVERLOADED_STATUS_CODES = frozenset({429})
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of sending a request while its circuit breaker is open."""
+
+
+class CircuitBreakerConfig(BaseModel):
+    """Configuration of the circuit breakers of the client."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    failure_ratio: float = Field(
+        default=0.5,
+        gt=0,
+        le=1,
+        description="The ratio of failed or slow requests that opens the circuit.",
+    )
+    window_size: int = Field(
+        default=20,
+        ge=1,
+        description="The number of recent requests the failure ratio is computed on.",
+    )
+    min_calls: int = Field(
+        default=10,
+        ge=1,
+        description="The minimum number of recorded requests before the circuit can open.",  # noqa: E501
+    )
+    slow_call_duration: float | None = Field(
+        default=None,
+        gt=0,
+        description="The duration, in seconds, past which a request counts as failed.",
+    )
+    reset_timeout: float = Field(
+        default=30,
+        gt=0,
+        description="The time, in seconds, the circuit stays open before probing the API.",  # noqa: E501
+    )
+    half_open_calls: int = Field(
+        default=1,
+        ge=1,
+        description="The number of probe requests that must succeed to close the circuit.",  # noqa: E501
+    )
+    per_endpoint: bool = Field(
+        default=False,
+        description="Whether to use one circuit per endpoint family, instead of per API.",  # noqa: E501
+    )
+    on_state_change: Callable[[str, CircuitState, CircuitState], None] | None = Field(
+        default=None,
+        exclude=True,
+        description="Called with the name, old state, and new state of a circuit.",
+    )
+
+
+def is_failure(error: Exception) -> bool:
+    """Check if an error raised by a request means that the API is degraded.
+
+    Args:
+        error (Exception): The error raised while sending the request.
+
+    Returns:
+        bool: `True` for connection errors, timeouts, `429` and `5xx` responses, as
+            well as the `RateLimitedError` and `ServerError` raised for them.
+    """
+    if isinstance(error, (RateLimitedError, ServerError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status in _OVERLOADED_STATUS_CODES or status >= 500  # noqa: PLR2004
+    return isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """Circuit breaker for the requests to an API, or to a family of endpoints.
+
+    Circuit breakers are thread-safe, so a single client can be shared across threads.
+
+    Attributes:
+        name (str): The name of the circuit, like `v1` or `v2/batch`.
+        config (CircuitBreakerConfig): The configuration of the circuit.
+    """
+
+    def __init__(self, name: str, config: CircuitBreakerConfig) -> None:
+        """Initialize a closed circuit breaker.
+
+        Args:
+            name (str): The name of the circuit, like `v1` or `v2/batch`.
+            config (CircuitBreakerConfig): The configuration of the circuit.
+        """
+        self.name = name
+        self.config = config
+        self._lock = Lock()
+        self._state: CircuitState = "closed"
+        self._outcomes: deque[bool] = deque(maxlen=config.window_size)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"CircuitBreaker(name={self.name!r}, state={self.state!r})"
+
+    @property
+    def state(self) -> CircuitState:
+        """Get the current state of the circuit.
+
+        Returns:
+            CircuitState: The state of the circuit. An open circuit whose
+                `reset_timeout` has passed is reported as `half_open`.
+        """
+        with self._lock:
+            if self._state == "open" and self._retry_in() <= 0:
+                return "half_open"
+            return self._state
+
+    @property
+    def failure_ratio(self) -> float:
+        """Get the ratio of failed or slow requests among the recent ones.
+
+        Returns:
+            float: The failure ratio, `0` if no request has been recorded yet.
+        """
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def _retry_in(self) -> float:
+        return self._opened_at + self.config.reset_timeout - monotonic()
+
+    def _transition(self, state: CircuitState) -> Callable[[], None] | None:
+        # Called with the lock held, the returned callback notifies the change once the
+        # lock is released, so that a slow hook does not block the other requests.
+        old, self._state = self._state, state
+        self._probes = self._probe_successes = 0
+        if state == "open":
+            self._opened_at = monotonic()
+        elif state == "closed":
+            self._outcomes.clear()
+        log = logger.warning if state == "open" else logger.info
+        log(f"Circuit `{self.name}` changed from `{old}` to `{state}`")
+
+        hook = self.config.on_state_change
+        if hook is None:
+            return None
+
+        def _notify() -> None:
+            try:
+                hook(self.name, old, state)
+            except Exception:  # noqa: BLE001
+                logger.exception(f"State change hook of circuit `{self.name}` failed")
+
+        return _notify
+
+    def before_call(self) -> None:
+        """Check that a request can be sent, and reserve a probe if half-open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or if all the probes of the
+                half-open circuit are already in flight.
+        """
+        notify = None
+        with self._lock:
+            if self._state == "open":
+                retry_in = self._retry_in()
+                if retry_in > 0:
+                    msg = f"Circuit `{self.name}` is open, retry in {retry_in:.1f}s"
+                    logger.error(msg)
+                    raise CircuitOpenError(msg)
+                notify = self._transition("half_open")
+            if self._state == "half_open":
+                if self._probes >= self.config.half_open_calls:
+                    msg = f"Circuit `{self.name}` is half-open, waiting on its probes"
+                    logger.error(msg)
+                    raise CircuitOpenError(msg)
+                self._probes += 1
+        if notify is not None:
+            notify()
+
+    def record(self, *, success: bool | None, duration: float) -> None:
+        """Record the outcome of a request allowed by `before_call`.
+
+        Args:
+            success (bool | None): Whether the API handled the request, or `None` if
+                the request was interrupted before an outcome was known.
+            duration (float): The duration of the request, in seconds.
+        """
+        slow = self.config.slow_call_duration
+        if success and slow is not None and duration > slow:
+            success = False
+        notify = None
+        with self._lock:
+            if self._state == "half_open":
+                self._probes -= 1
+                if success is False:
+                    notify = self._transition("open")
+                elif success:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.config.half_open_calls:
+                        notify = self._transition("closed")
+            elif self._state == "closed" and success is not None:
+                self._outcomes.append(success)
+                if (
+                    len(self._outcomes) >= self.config.min_calls
+                    and self._outcomes.count(False) / len(self._outcomes)
+                    >= self.config.failure_ratio
+                ):
+                    notify = self._transition("open")
+        if notify is not None:
+            notify()
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Send a request through the circuit, recording its outcome and latency.
+
+        Yields:
+            None: The request is sent within the context.
+        """  # noqa: DOC502
+        self.before_call()
+        start = monotonic()
+        success = None
+        try:
+            yield
+        except Exception as e:
+            success = not is_failure(e)
+            raise
+        else:
+            success = True
+        finally:
+            self.record(success=success, duration=monotonic() - start)
@@ -6,24 +6,50 @@ with the API endpoints and handle the responses.
 
 from __future__ import annotations
 
-import json
-from typing import TYPE_CHECKING, Any
+from collections.abc import Callable
+from contextlib import nullcontext
+from copy import deepcopy
+from functools import wraps
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from importlib.util import find_spec
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+from urllib.parse import urlsplit
 
 import httpx
 from loguru import logger
-
+from pydantic import BaseModel, PrivateAttr
+
+from pyticktick.circuit_breaker import CircuitBreaker
+from pyticktick.codec import get_codec
+from pyticktick.deadline import (
+    DeadlineExceededError,
+    check_deadline,
+    deadline,
+    remaining,
+)
+from pyticktick.exceptions import error_from_response
+from pyticktick.logger import LogConfig, excerpt, log_config, log_event, shared_sink
 from pyticktick.models.v1.parameters.project import CreateProjectV1, UpdateProjectV1
 from pyticktick.models.v1.parameters.task import CreateTaskV1, UpdateTaskV1
 from pyticktick.models.v1.responses.project import (
     ProjectDataRespV1,
     ProjectRespV1,
     ProjectsRespV1,
+    ProjectV1,
 )
 from pyticktick.models.v1.responses.task import TaskRespV1
+from pyticktick.models.v2.models import TaskV2
 from pyticktick.models.v2.parameters.closed import GetClosedV2
 from pyticktick.models.v2.parameters.project import PostBatchProjectV2
 from pyticktick.models.v2.parameters.project_group import PostBatchProjectGroupV2
-from pyticktick.models.v2.parameters.tag import DeleteTagV2, PostBatchTagV2, RenameTagV2
+from pyticktick.models.v2.parameters.tag import (
+    DeleteTagV2,
+    MergeTagV2,
+    PostBatchTagV2,
+    RenameTagV2,
+)
 from pyticktick.models.v2.parameters.task import PostBatchTaskV2
 from pyticktick.models.v2.parameters.task_parent import PostBatchTaskParentV2
 from pyticktick.models.v2.responses.batch import BatchRespV2, GetBatchV2
@@ -35,12 +61,73 @@ from pyticktick.models.v2.responses.user import (
     UserStatisticsV2,
     UserStatusV2,
 )
-from pyticktick.pydantic import update_model_config
+from pyticktick.pydantic import (
+    list_adapter,
+    update_model_config,
+    validate_in_parallel,
+    validation_executor,
+)
+from pyticktick.response_cache import CACHE_GROUPS, CacheStats, ResponseCache
 from pyticktick.retry import retry_api_v1
 from pyticktick.settings import Settings
+from pyticktick.single_flight import SingleFlight
 
 if TYPE_CHECKING:
-    from pydantic import BaseModel
+    from concurrent.futures import Executor
+
+    from typing_extensions import Self
+
+_OPTIONAL_ENCODINGS = {"zstd": ("zstandard",), "br": ("brotli", "brotlicffi")}
+
+_ClientMethod = TypeVar("_ClientMethod", bound=Callable[..., Any])
+
+
+def _with_call_context(func: _ClientMethod) -> _ClientMethod:
+    # Applied outside of the retry decorators, so that the `request_timeout` and the
+    # logging options cover every attempt of a call and the waits between them.
+    @wraps(func)
+    def wrapper(self: Client, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        with deadline(self.request_timeout), log_config(self.log_config):
+            return func(self, *args, **kwargs)
+
+    return cast("_ClientMethod", wrapper)
+
+
+def _coalesced(func: _ClientMethod) -> _ClientMethod:
+    # Concurrent calls with equal arguments share the call in flight. Arguments may be
+    # models or dictionaries, which are not hashable, so they are keyed by their repr.
+    @wraps(func)
+    def wrapper(self: Client, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        if not self.coalesce_reads:
+            return func(self, *args, **kwargs)
+        key = (func.__name__, repr(args), repr(sorted(kwargs.items())))
+        # Waiting for the call in flight is bounded by the `request_timeout` of this
+        # client, and not only by the timeout of the client that sent the call.
+        result, _ = self._single_flight.do(
+            key,
+            lambda: func(self, *args, **kwargs),
+            timeout=self.request_timeout,
+        )
+        return result
+
+    return cast("_ClientMethod", wrapper)
+
+
+def _invalidates(*groups: str) -> Callable[[_ClientMethod], _ClientMethod]:
+    # Invalidates the cached responses of the groups, even if the mutation failed, as
+    # it may still have been applied by the API.
+    def decorator(func: _ClientMethod) -> _ClientMethod:
+        @wraps(func)
+        def wrapper(self: Client, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                if self._response_cache is not None:
+                    self._response_cache.invalidate(*groups)
+
+        return cast("_ClientMethod", wrapper)
+
+    return decorator
 
 
 class Client(Settings):
@@ -74,78 +161,345 @@ class Client(Settings):
         configurations will be available in the client class.
     """
 
+    _http_client: httpx.Client | None = PrivateAttr(default=None)
+    _http_client_lock: Lock = PrivateAttr(default_factory=Lock)
+    _circuit_breakers: dict[str, CircuitBreaker] = PrivateAttr(default_factory=dict)
+    _response_cache: ResponseCache | None = PrivateAttr(default=None)
+    _single_flight: SingleFlight = PrivateAttr(default_factory=SingleFlight)
+    _validation_pool: tuple[int, Executor] | None = PrivateAttr(default=None)
+    _validation_lock: Lock = PrivateAttr(default_factory=Lock)
+
+    def model_post_init(self, context: Any, /) -> None:  # noqa: ANN401, D102
+        super().model_post_init(context)
+        if self.log_sink is not None:
+            shared_sink(
+                self.log_sink,
+                level=self.log_sink_level,
+                serialize=self.log_sink_serialize,
+            )
+
+    def __getstate__(self) -> dict[Any, Any]:  # noqa: D105
+        # The runtime state of the client, like its connections, locks, and validation
+        # workers, cannot be copied, so copies start with their own, created again.
+        return {**super().__getstate__(), "__pydantic_private__": None}
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:  # noqa: D105
+        private = {
+            name: attr.get_default(call_default_factory=True)
+            for name, attr in self.__private_attributes__.items()
+        }
+        super().__setstate__({**state, "__pydantic_private__": private})
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:  # noqa: D105
+        copied = type(self).__new__(type(self))
+        copied.__setstate__(deepcopy(self.__getstate__(), memo))
+        return copied
+
+    def __enter__(self) -> Self:  # noqa: D105
+        return self
+
+    def __exit__(self, *args: object) -> None:  # noqa: D105
+        self.close()
+
+    @property
+    def accept_encoding(self) -> str:
+        """Get the `Accept-Encoding` header sent with every request.
+
+        When `http_compression` is enabled, this lists every compression that httpx can
+        decode, from the most to the least efficient. Brotli and Zstandard are only
+        listed when the `brotli` or `zstandard` packages are installed.
+
+        Returns:
+            str: The value of the `Accept-Encoding` header.
+        """
+        if not self.http_compression:
+            return "identity"
+        encodings = [
+            encoding
+            for encoding, packages in _OPTIONAL_ENCODINGS.items()
+            if any(find_spec(package) is not None for package in packages)
+        ]
+        return ", ".join([*encodings, "gzip", "deflate"])
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Get the HTTP client shared by all the requests of this client.
+
+        The HTTP client is created on first use, and keeps its connections open
+        between requests, so that they do not need to be established again. With
+        `http2` enabled, concurrent requests, like the ones sent from a thread pool,
+        are multiplexed over a single connection.
+
+        Returns:
+            httpx.Client: The HTTP client.
+
+        Raises:
+            ValueError: If `http2` is enabled, but the `h2` package is not installed.
+        """
+        client = self._http_client
+        if client is not None:
+            return client
+        with self._http_client_lock:
+            if self._http_client is None:
+                if self.http2 and find_spec("h2") is None:
+                    msg = "`http2` requires the `h2` package, install `httpx[http2]`"
+                    logger.error(msg)
+                    raise ValueError(msg)
+                # Cookies set by the API are never stored, so that the session state
+                # of a V2 response does not leak into later V1 or V2 requests.
+                self._http_client = httpx.Client(
+                    http2=self.http2,
+                    headers={"Accept-Encoding": self.accept_encoding},
+                    cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=())),
+                )
+            return self._http_client
+
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """Get the circuit breakers that requests have gone through so far.
+
+        Circuit breakers are created on the first request to their API, or endpoint
+        family, and are keyed by their name, like `v1` or `v2/batch`. This can be used
+        to export the state of the circuits to a monitoring system.
+
+        Returns:
+            dict[str, CircuitBreaker]: The circuit breakers, by name.
+        """
+        return dict(self._circuit_breakers)
+
+    @property
+    def log_config(self) -> LogConfig:
+        """Get the logging options applied to the calls made by this client.
+
+        Returns:
+            LogConfig: The logging options, from the `log_body_limit` and
+                `log_sample_interval` settings.
+        """
+        return LogConfig(self.log_body_limit, self.log_sample_interval)
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """Get the hit, miss, eviction, and invalidation counts of the response cache.
+
+        Returns:
+            CacheStats | None: The metrics of the response cache, or `None` if the
+                `response_cache` setting is not set.
+        """
+        return None if self._response_cache is None else self._response_cache.stats
+
+    def clear_response_cache(self) -> None:
+        """Remove every response from the response cache, if it is enabled."""
+        if self._response_cache is not None:
+            self._response_cache.clear()
+
+    def _circuit_breaker(self, api: str, endpoint: str) -> CircuitBreaker | None:
+        config = self.circuit_breaker
+        if config is None:
+            return None
+        name = api
+        if config.per_endpoint:
+            name = f"{api}/{endpoint.strip('/').split('/', 1)[0]}"
+        breaker = self._circuit_breakers.get(name)
+        if breaker is None:
+            breaker = self._circuit_breakers.setdefault(
+                name,
+                CircuitBreaker(name, config),
+            )
+        return breaker
+
+    def _cached_get(
+        self,
+        method: str,
+        get: Callable[[str], Any],
+        endpoint: str,
+    ) -> Any:  # noqa: ANN401
+        config = self.response_cache
+        ttl = 0 if config is None else config.ttl(method)
+        if config is None or ttl <= 0:
+            return get(endpoint)
+        cache = self._response_cache
+        if cache is None:
+            cache = self._response_cache = ResponseCache(config.max_size)
+        key, group = (method, endpoint), CACHE_GROUPS[method]
+        hit, resp = cache.get(key)
+        if not hit:
+            # A mutation sent while the request is in flight invalidates the group,
+            # so the response is only cached if the group has not changed since.
+            generation = cache.generation(group)
+            resp = get(endpoint)
+            cache.set(key, resp, group, ttl, generation)
+        return resp
+
+    def close(self) -> None:
+        """Close the connections of the HTTP client, and the validation workers.
+
+        The client can still be used afterwards, a new HTTP client, and a new pool of
+        validation workers, are created when they are next needed. The client can also
+        be used as a context manager, which closes it on exit.
+        """
+        with self._http_client_lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+        with self._validation_lock:
+            if self._validation_pool is not None:
+                self._validation_pool[1].shutdown()
+                self._validation_pool = None
+
     @staticmethod
     def _model_dump(model: BaseModel) -> dict[str, Any]:
         return model.model_dump(by_alias=True, mode="json")
 
-    @retry_api_v1()
-    def _get_api_v1(self, endpoint: str) -> Any:  # noqa: ANN401
+    def _validation_executor(self) -> Executor:
+        # The pool is started on first use and kept until the client is closed, so
+        # that each large response does not pay for starting the workers again.
+        with self._validation_lock:
+            workers, executor = self._validation_pool or (0, None)
+            if executor is None or workers != self.validation_workers:
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                executor = validation_executor(self.validation_workers)
+                self._validation_pool = (self.validation_workers, executor)
+            return executor
+
+    def _validate_tasks_v2(self, tasks: Any) -> Any:  # noqa: ANN401
+        # Validated tasks are passed through as is when the full response is validated.
+        # Tasks of the chunks that failed are returned unvalidated, so that they are
+        # only validated again along with the full response, which raises the error
+        # with its location in the response, like `syncTaskBean.update.N`.
+        if self.validation_workers <= 1 or not isinstance(tasks, list):
+            return tasks
+        config_kwargs = {"extra": "allow"} if self.override_forbid_extra else {}
+        return validate_in_parallel(
+            TaskV2,
+            tasks,
+            self.validation_workers,
+            executor=self._validation_executor(),
+            revalidate_failed=False,
+            **config_kwargs,
+        )
+
+    def _request(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str],
+        params: dict[str, Any] | None = None,
+        data: BaseModel | dict[str, Any] | list[Any] | None = None,
+        expect_content: bool = True,
+        breaker: CircuitBreaker | None = None,
+    ) -> Any:  # noqa: ANN401
+        codec = get_codec(self.json_codec)
+        content = None
+        if data is not None:
+            # Models are serialized to JSON in a single step by pydantic-core, without
+            # building an intermediate dictionary first. Anything else, like payloads
+            # sent without validation, is assumed to already be in the wire format.
+            if isinstance(data, BaseModel):
+                content = data.model_dump_json(by_alias=True).encode()
+            else:
+                content = codec.dumps(data)
+            headers = {**headers, "Content-Type": "application/json"}
+        check_deadline()
+        left = remaining()
+        start = monotonic()
         try:
-            resp = httpx.get(
-                url=str(self.v1_base_url.join(endpoint)),
-                headers=self.v1_headers,
-            )
-            resp.raise_for_status()
-            if resp.content is None or len(resp.content) == 0:
+            with nullcontext() if breaker is None else breaker.guard():
+                resp = self.http_client.request(
+                    method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    content=content,
+                    timeout=httpx.USE_CLIENT_DEFAULT if left is None else left,
+                )
+                resp.raise_for_status()
+            if expect_content and (resp.content is None or len(resp.content) == 0):
                 msg = "Response content is empty"
                 raise ValueError(msg)
         except httpx.HTTPStatusError as e:
             try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
+                error_content = codec.loads(e.response.content)
+            except codec.errors:
+                error_content = e.response.content.decode()
+            status = e.response.status_code
+            error = error_from_response(
+                status,
+                error_content,
+                method=method,
+                endpoint=urlsplit(url).path,
+                retry_after=e.response.headers.get("Retry-After"),
+                max_retry_after=self.max_retry_after,
+            )
+            log_event(
+                "ERROR",
+                f"http_{status}",
+                "Response [{}]: {}",
+                status,
+                lambda: excerpt(error_content),
+                method=method,
+                endpoint=error.endpoint,
+                status=status,
+                error=type(error).__name__,
+                duration=monotonic() - start,
+            )
+            raise error  # noqa: B904
+        except httpx.TimeoutException as e:
+            if left is None:
+                raise
+            log_event(
+                "ERROR",
+                "timeout",
+                "Request `{} {}` timed out before the deadline",
+                method,
+                url,
+                method=method,
+                endpoint=urlsplit(url).path,
+                duration=monotonic() - start,
+            )
+            msg = f"Request `{method} {url}` timed out before the deadline"
+            raise DeadlineExceededError(msg) from e
 
-        return resp.json()
+        return codec.loads(resp.content) if expect_content else None
 
+    @_with_call_context
+    @retry_api_v1()
+    def _get_api_v1(self, endpoint: str) -> Any:  # noqa: ANN401
+        return self._request(
+            "GET",
+            str(self.v1_base_url.join(endpoint)),
+            headers=self.v1_headers,
+            breaker=self._circuit_breaker("v1", endpoint),
+        )
+
+    @_with_call_context
     @retry_api_v1()
     def _post_api_v1(
         self,
         endpoint: str,
-        data: dict[str, Any] | None = None,
+        data: BaseModel | dict[str, Any] | None = None,
     ) -> Any:  # noqa: ANN401
-        if data is None:
-            data = {}
-        try:
-            resp = httpx.post(
-                url=str(self.v1_base_url.join(endpoint)),
-                headers=self.v1_headers,
-                json=data,
-            )
-            resp.raise_for_status()
-            if resp.content is None or len(resp.content) == 0:
-                msg = "Response content is empty"
-                raise ValueError(msg)
-        except httpx.HTTPStatusError as e:
-            try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
-
-        return resp.json()
+        return self._request(
+            "POST",
+            str(self.v1_base_url.join(endpoint)),
+            headers=self.v1_headers,
+            breaker=self._circuit_breaker("v1", endpoint),
+            data={} if data is None else data,
+        )
 
+    @_with_call_context
     @retry_api_v1()
     def _delete_api_v1(self, endpoint: str) -> None:
-        try:
-            resp = httpx.delete(
-                url=str(self.v1_base_url.join(endpoint)),
-                headers=self.v1_headers,
-            )
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
+        self._request(
+            "DELETE",
+            str(self.v1_base_url.join(endpoint)),
+            headers=self.v1_headers,
+            breaker=self._circuit_breaker("v1", endpoint),
+            expect_content=False,
+        )
 
+    @_coalesced
     def get_projects_v1(self) -> ProjectsRespV1:
         """Get all projects from the V1 API.
 
@@ -202,9 +556,24 @@ class Client(Settings):
         Returns:
             ProjectsRespV1: List of projects from the V1 API.
         """
-        resp = self._get_api_v1("/project")
-        return ProjectsRespV1.model_validate(resp)
+        return ProjectsRespV1.model_construct(root=self.get_projects_list_v1())
+
+    @_coalesced
+    def get_projects_list_v1(self) -> list[ProjectV1]:
+        """Get all projects from the V1 API, as a plain list.
+
+        This method is equivalent to
+        [`get_projects_v1`](v1.md#pyticktick.client.Client.get_projects_v1), but
+        validates the response straight into a `list`, without the `ProjectsRespV1`
+        wrapper. Its responses are cached along with the ones of `get_projects_v1`.
+
+        Returns:
+            list[ProjectV1]: List of projects from the V1 API.
+        """
+        resp = self._cached_get("get_projects_v1", self._get_api_v1, "/project")
+        return list_adapter(ProjectV1).validate_python(resp)
 
+    @_coalesced
     def get_project_v1(self, project_id: str) -> ProjectRespV1:
         """Get a single project from the V1 API.
 
@@ -242,9 +611,14 @@ class Client(Settings):
         Returns:
             ProjectRespV1: Project object containing project details.
         """
-        resp = self._get_api_v1(f"/project/{project_id}")
+        resp = self._cached_get(
+            "get_project_v1",
+            self._get_api_v1,
+            f"/project/{project_id}",
+        )
         return ProjectRespV1.model_validate(resp)
 
+    @_coalesced
     def get_project_with_data_v1(self, project_id: str) -> ProjectDataRespV1:
         """Get details of a single project from the V1 API.
 
@@ -349,6 +723,7 @@ class Client(Settings):
         resp = self._get_api_v1(f"/project/{project_id}/data")
         return ProjectDataRespV1.model_validate(resp)
 
+    @_invalidates("project")
     def create_project_v1(
         self,
         data: CreateProjectV1 | dict[str, Any],
@@ -402,9 +777,10 @@ class Client(Settings):
         """
         if isinstance(data, dict):
             data = CreateProjectV1.model_validate(data)
-        resp = self._post_api_v1("/project", data=self._model_dump(data))
+        resp = self._post_api_v1("/project", data=data)
         return ProjectRespV1.model_validate(resp)
 
+    @_invalidates("project")
     def update_project_v1(
         self,
         project_id: str,
@@ -460,9 +836,10 @@ class Client(Settings):
         """
         if isinstance(data, dict):
             data = UpdateProjectV1.model_validate(data)
-        resp = self._post_api_v1(f"/project/{project_id}", data=self._model_dump(data))
+        resp = self._post_api_v1(f"/project/{project_id}", data=data)
         return ProjectRespV1.model_validate(resp)
 
+    @_invalidates("project")
     def delete_project_v1(self, project_id: str) -> None:
         """Delete a project in the V1 API.
 
@@ -485,6 +862,7 @@ class Client(Settings):
         """
         self._delete_api_v1(f"/project/{project_id}")
 
+    @_coalesced
     def get_task_v1(self, project_id: str, task_id: str) -> TaskRespV1:
         """Get a single task from the V1 API.
 
@@ -538,6 +916,7 @@ class Client(Settings):
         resp = self._get_api_v1(f"/project/{project_id}/task/{task_id}")
         return TaskRespV1.model_validate(resp)
 
+    @_invalidates("statistics")
     def create_task_v1(self, data: CreateTaskV1 | dict[str, Any]) -> TaskRespV1:
         """Create a task in the V1 API.
 
@@ -596,9 +975,10 @@ class Client(Settings):
         """
         if isinstance(data, dict):
             data = CreateTaskV1.model_validate(data)
-        resp = self._post_api_v1("/task", self._model_dump(data))
+        resp = self._post_api_v1("/task", data)
         return TaskRespV1.model_validate(resp)
 
+    @_invalidates("statistics")
     def update_task_v1(
         self,
         task_id: str,
@@ -665,9 +1045,10 @@ class Client(Settings):
         """
         if isinstance(data, dict):
             data = UpdateTaskV1.model_validate(data)
-        resp = self._post_api_v1(f"/task/{task_id}", self._model_dump(data))
+        resp = self._post_api_v1(f"/task/{task_id}", data)
         return TaskRespV1.model_validate(resp)
 
+    @_invalidates("statistics")
     def complete_task_v1(self, project_id: str, task_id: str) -> None:
         """Complete a task in the V1 API.
 
@@ -703,6 +1084,7 @@ class Client(Settings):
                 return
             raise
 
+    @_invalidates("statistics")
     def delete_task_v1(self, project_id: str, task_id: str) -> None:
         """Delete a task in the V1 API.
 
@@ -729,84 +1111,71 @@ class Client(Settings):
         """
         self._delete_api_v1(f"/project/{project_id}/task/{task_id}")
 
+    def _v2_request_headers(self) -> dict[str, str]:
+        # The token is sent as an explicit `Cookie` header, as the cookie jar of the
+        # HTTP client is shared with the V1 API, and never stores any cookie.
+        cookie = "; ".join(f"{k}={v}" for k, v in self.v2_cookies.items())
+        return {**self.v2_headers, "Cookie": cookie}
+
+    @_with_call_context
     def _get_api_v2(
         self,
         endpoint: str,
         data: dict[str, Any] | None = None,
     ) -> Any:  # noqa: ANN401
-        try:
-            resp = httpx.get(
-                url=str(self.v2_base_url.join(endpoint)),
-                headers=self.v2_headers,
-                cookies=self.v2_cookies,
-                params=data,
-            )
-            resp.raise_for_status()
-            if resp.content is None or len(resp.content) == 0:
-                msg = "Response content is empty"
-                raise ValueError(msg)
-        except httpx.HTTPStatusError as e:
-            try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
-
-        return resp.json()
+        return self._request(
+            "GET",
+            str(self.v2_base_url.join(endpoint)),
+            headers=self._v2_request_headers(),
+            breaker=self._circuit_breaker("v2", endpoint),
+            params=data,
+        )
 
+    @_with_call_context
     def _post_api_v2(
         self,
         endpoint: str,
-        data: dict[str, Any] | None = None,
+        data: BaseModel | dict[str, Any] | list[Any] | None = None,
     ) -> Any:  # noqa: ANN401
-        if data is None:
-            data = {}
-        try:
-            resp = httpx.post(
-                url=str(self.v2_base_url.join(endpoint)),
-                headers=self.v2_headers,
-                cookies=self.v2_cookies,
-                json=data,
-            )
-            resp.raise_for_status()
-            if resp.content is None or len(resp.content) == 0:
-                msg = "Response content is empty"
-                raise ValueError(msg)
-        except httpx.HTTPStatusError as e:
-            try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
+        return self._request(
+            "POST",
+            str(self.v2_base_url.join(endpoint)),
+            headers=self._v2_request_headers(),
+            breaker=self._circuit_breaker("v2", endpoint),
+            data={} if data is None else data,
+        )
 
-        return resp.json()
+    @_with_call_context
+    def _put_api_v2(
+        self,
+        endpoint: str,
+        data: BaseModel | dict[str, Any] | None = None,
+    ) -> None:
+        self._request(
+            "PUT",
+            str(self.v2_base_url.join(endpoint)),
+            headers=self._v2_request_headers(),
+            breaker=self._circuit_breaker("v2", endpoint),
+            data={} if data is None else data,
+            expect_content=False,
+        )
 
+    @_with_call_context
     def _delete_api_v2(
         self,
         endpoint: str,
         data: dict[str, Any] | None = None,
     ) -> None:
-        try:
-            resp = httpx.delete(
-                url=str(self.v2_base_url.join(endpoint)),
-                headers=self.v2_headers,
-                cookies=self.v2_cookies,
-                params=data,
-            )
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
+        self._request(
+            "DELETE",
+            str(self.v2_base_url.join(endpoint)),
+            headers=self._v2_request_headers(),
+            breaker=self._circuit_breaker("v2", endpoint),
+            params=data,
+            expect_content=False,
+        )
 
+    @_coalesced
     def get_profile_v2(self) -> UserProfileV2:
         """Get the user profile from the V2 API.
 
@@ -857,11 +1226,12 @@ class Client(Settings):
         Returns:
             UserProfileV2: The user profile object retrieved from the API.
         """
-        resp = self._get_api_v2("/user/profile")
+        resp = self._cached_get("get_profile_v2", self._get_api_v2, "/user/profile")
         if self.override_forbid_extra:
             update_model_config(UserProfileV2, extra="allow")
         return UserProfileV2.model_validate(resp)
 
+    @_coalesced
     def get_status_v2(self) -> UserStatusV2:
         """Get the user status from the V2 API.
 
@@ -908,11 +1278,12 @@ class Client(Settings):
         Returns:
             UserStatusV2: The user status object retrieved from the API.
         """
-        resp = self._get_api_v2("/user/status")
+        resp = self._cached_get("get_status_v2", self._get_api_v2, "/user/status")
         if self.override_forbid_extra:
             update_model_config(UserStatusV2, extra="allow")
         return UserStatusV2.model_validate(resp)
 
+    @_coalesced
     def get_statistics_v2(self) -> UserStatisticsV2:
         """Get user statistics from the V2 API.
 
@@ -1005,11 +1376,14 @@ class Client(Settings):
         Returns:
             UserStatisticsV2: The user statistics object retrieved from the API.
         """
-        resp = self._get_api_v2("/statistics/general")
+        resp = self._cached_get(
+            "get_statistics_v2", self._get_api_v2, "/statistics/general"
+        )
         if self.override_forbid_extra:
             update_model_config(UserStatisticsV2, extra="allow")
         return UserStatisticsV2.model_validate(resp)
 
+    @_coalesced
     def get_project_all_closed_v2(
         self,
         data: GetClosedV2 | dict[str, Any],
@@ -1137,23 +1511,72 @@ class Client(Settings):
             ClosedRespV2: The completed / abandoned tasks object retrieved from the API.
 
         """
+        return ClosedRespV2.model_construct(
+            root=self.get_project_all_closed_list_v2(data),
+        )
+
+    @_coalesced
+    def get_project_all_closed_list_v2(
+        self,
+        data: GetClosedV2 | dict[str, Any],
+    ) -> list[TaskV2]:
+        """Get all completed or abandoned tasks from the V2 API, as a plain list.
+
+        This method is equivalent to
+        [`get_project_all_closed_v2`](v2.md#pyticktick.client.Client.get_project_all_closed_v2),
+        but validates the response straight into a `list`, without the `ClosedRespV2`
+        wrapper.
+
+        Args:
+            data (GetClosedV2 | dict[str, Any]): Data to get the completed /
+                abandoned tasks.
+
+        Returns:
+            list[TaskV2]: The completed / abandoned tasks retrieved from the API.
+        """
+        resp = self.get_project_all_closed_raw_v2(data)
+        if self.override_forbid_extra:
+            update_model_config(TaskV2, extra="allow")
+        return list_adapter(TaskV2).validate_python(self._validate_tasks_v2(resp))
+
+    def get_project_all_closed_raw_v2(
+        self,
+        data: GetClosedV2 | dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """Get all completed or abandoned tasks from the V2 API, as raw JSON.
+
+        This method requests the same endpoint as
+        [`get_project_all_closed_v2`](v2.md#pyticktick.client.Client.get_project_all_closed_v2),
+        but returns the decoded JSON response without validating the tasks, for
+        callers that stream the response themselves.
+
+        Args:
+            data (GetClosedV2 | dict[str, Any]): Data to get the completed /
+                abandoned tasks.
+
+        Returns:
+            list[dict[str, Any]]: The tasks, with the camelCase keys of the API.
+        """
         if isinstance(data, dict):
             data = GetClosedV2.model_validate(data)
-        resp = self._get_api_v2("/project/all/closed", data=self._model_dump(data))
-        if self.override_forbid_extra:
-            update_model_config(ClosedRespV2, extra="allow")
-        return ClosedRespV2.model_validate(resp)
+        return self._get_api_v2("/project/all/closed", data=self._model_dump(data))
 
-    def get_batch_v2(self) -> GetBatchV2:
+    @_coalesced
+    def get_batch_v2(self, check_point: int = 0) -> GetBatchV2:
         """Get all active objects for the current user from the V2 API.
 
         This method gets the status of all objects for the current user from the
-        `GET /batch/check/0` V2 endpoint. This endpoint provides information about
-        the status of all active objects, including projects, tasks, etc. The structure
-        of the response is a little confusing. It seems like it was designed to be used
-        as an [Entity Bean](https://en.wikipedia.org/wiki/Entity_Bean),
+        `GET /batch/check/{check_point}` V2 endpoint. This endpoint provides information
+        about the status of all active objects, including projects, tasks, etc. The
+        structure of the response is a little confusing. It seems like it was designed
+        to be used as an [Entity Bean](https://en.wikipedia.org/wiki/Entity_Bean),
         making it easy to sync back to TickTick.
 
+        By default, `check_point` is `0`, which returns the full state of the account.
+        Passing the `check_point` of a previous response returns only the tasks that
+        have changed since that response, with deleted tasks listed in
+        `sync_task_bean.delete`.
+
         ??? example "Example"
             ```python hl_lines="4"
             from pyticktick import Client
@@ -1210,17 +1633,45 @@ class Client(Settings):
             This response is so large, that it was trimmed down significantly. Anywhere
             you see `...`, it means there should have been more data.
 
+        Args:
+            check_point (int): The `check_point` of a previous response, to only get
+                the changes since then. Defaults to `0`, which gets everything.
+
         Returns:
             GetBatchV2: The batch object retrieved from the API.
         """
-        resp = self._get_api_v2("/batch/check/0")
+        resp = self.get_batch_raw_v2(check_point)
         if self.override_forbid_extra:
             update_model_config(GetBatchV2, extra="allow")
+        sync_task_bean = resp.get("syncTaskBean") if isinstance(resp, dict) else None
+        if isinstance(sync_task_bean, dict) and "update" in sync_task_bean:
+            sync_task_bean["update"] = self._validate_tasks_v2(sync_task_bean["update"])
         return GetBatchV2.model_validate(resp)
 
+    def get_batch_raw_v2(self, check_point: int = 0) -> dict[str, Any]:
+        """Get all active objects for the current user from the V2 API, as raw JSON.
+
+        This method requests the same endpoint as
+        [`get_batch_v2`](v2.md#pyticktick.client.Client.get_batch_v2), but returns
+        the decoded JSON response without validating it, for callers that stream or
+        compact the response themselves. Responses are not shared between concurrent
+        calls, so the returned object can be modified freely.
+
+        Args:
+            check_point (int): The `check_point` of a previous response, to only get
+                the changes since then. Defaults to `0`, which gets everything.
+
+        Returns:
+            dict[str, Any]: The batch response, with the camelCase keys of the API.
+        """
+        return self._get_api_v2(f"/batch/check/{check_point}")
+
+    @_invalidates("project")
     def post_project_v2(
         self,
         data: PostBatchProjectV2 | dict[str, Any],
+        *,
+        validate: bool = True,
     ) -> BatchRespV2:
         """Create, update, or delete projects in bulk against the V2 API.
 
@@ -1312,19 +1763,30 @@ class Client(Settings):
         Args:
             data (PostBatchProjectV2 | dict[str, Any]): Data to create, update,
                 or delete projects.
+            validate (bool): Whether to validate `data` when it is not a model.
+                Defaults to `True`. Set to `False` for payloads that are already in
+                the format sent to the API, like the output of
+                `model_dump(by_alias=True, mode="json")` on a `PostBatchProjectV2`,
+                which are then encoded as is, without being validated.
 
         Returns:
             BatchRespV2: The response object containing the status of the batch
                 operation.
         """
-        if isinstance(data, dict):
+        if validate and isinstance(data, dict):
             data = PostBatchProjectV2.model_validate(data)
-        resp = self._post_api_v2("/batch/project", data=self._model_dump(data))
+        resp = self._post_api_v2("/batch/project", data=data)
         if self.override_forbid_extra:
             update_model_config(BatchRespV2, extra="allow")
         return BatchRespV2.model_validate(resp)
 
-    def post_task_v2(self, data: PostBatchTaskV2 | dict[str, Any]) -> BatchRespV2:
+    @_invalidates("statistics")
+    def post_task_v2(
+        self,
+        data: PostBatchTaskV2 | dict[str, Any],
+        *,
+        validate: bool = True,
+    ) -> BatchRespV2:
         """Create, update, or delete tasks in bulk against the V2 API.
 
         This method creates, updates, and deletes tasks in bulk using the
@@ -1440,21 +1902,29 @@ class Client(Settings):
         Args:
             data (PostBatchTaskV2 | dict[str, Any]): Data to create, update,
                 or delete tasks.
+            validate (bool): Whether to validate `data` when it is not a model.
+                Defaults to `True`. Set to `False` for payloads that are already in
+                the format sent to the API, like the output of
+                `model_dump(by_alias=True, mode="json")` on a `PostBatchTaskV2`,
+                which are then encoded as is, without being validated.
 
         Returns:
             BatchRespV2: The response object containing the status of the batch
                 operation.
         """
-        if isinstance(data, dict):
+        if validate and isinstance(data, dict):
             data = PostBatchTaskV2.model_validate(data)
-        resp = self._post_api_v2("/batch/task", data=self._model_dump(data))
+        resp = self._post_api_v2("/batch/task", data=data)
         if self.override_forbid_extra:
             update_model_config(BatchRespV2, extra="allow")
         return BatchRespV2.model_validate(resp)
 
+    @_invalidates("project")
     def post_project_group_v2(
         self,
         data: PostBatchProjectGroupV2 | dict[str, Any],
+        *,
+        validate: bool = True,
     ) -> BatchRespV2:
         """Create, update, or delete project groups in bulk against the V2 API.
 
@@ -1545,14 +2015,19 @@ class Client(Settings):
         Args:
             data (PostBatchProjectGroupV2 | dict[str, Any]): Data to create,
                 update, or delete project groups.
+            validate (bool): Whether to validate `data` when it is not a model.
+                Defaults to `True`. Set to `False` for payloads that are already in
+                the format sent to the API, like the output of
+                `model_dump(by_alias=True, mode="json")` on a `PostBatchProjectGroupV2`,
+                which are then encoded as is, without being validated.
 
         Returns:
             BatchRespV2: The response object containing the status of the batch
                 operation.
         """
-        if isinstance(data, dict):
+        if validate and isinstance(data, dict):
             data = PostBatchProjectGroupV2.model_validate(data)
-        resp = self._post_api_v2("/batch/projectGroup", data=self._model_dump(data))
+        resp = self._post_api_v2("/batch/projectGroup", data=data)
         if self.override_forbid_extra:
             update_model_config(BatchRespV2, extra="allow")
         return BatchRespV2.model_validate(resp)
@@ -1560,6 +2035,8 @@ class Client(Settings):
     def post_task_parent_v2(
         self,
         data: PostBatchTaskParentV2 | list[Any],
+        *,
+        validate: bool = True,
     ) -> BatchTaskParentRespV2:
         """Set or unset a task parent in bulk against the V2 API.
 
@@ -1637,14 +2114,19 @@ class Client(Settings):
         Args:
             data (PostBatchTaskParentV2 | list[Any]): Data to set or unset task
                 parents.
+            validate (bool): Whether to validate `data` when it is not a model.
+                Defaults to `True`. Set to `False` for payloads that are already in
+                the format sent to the API, like the output of
+                `model_dump(by_alias=True, mode="json")` on a `PostBatchTaskParentV2`,
+                which are then encoded as is, without being validated.
 
         Returns:
             BatchTaskParentRespV2: Response from the API after setting or unsetting the
             task parents.
         """
-        if isinstance(data, list):
+        if validate and isinstance(data, list):
             data = PostBatchTaskParentV2.model_validate(data)
-        resp = self._post_api_v2("/batch/taskParent", data=self._model_dump(data))
+        resp = self._post_api_v2("/batch/taskParent", data=data)
         if self.override_forbid_extra:
             update_model_config(BatchTaskParentRespV2, extra="allow")
         return BatchTaskParentRespV2.model_validate(resp)
@@ -1652,6 +2134,8 @@ class Client(Settings):
     def post_tag_v2(
         self,
         data: PostBatchTagV2 | dict[str, Any],
+        *,
+        validate: bool = True,
     ) -> BatchTagRespV2:
         """Create or update tags in bulk against the V2 API.
 
@@ -1758,13 +2242,18 @@ class Client(Settings):
 
         Args:
             data (PostBatchTagV2 | dict[str, Any]): Data to create or update tags.
+            validate (bool): Whether to validate `data` when it is not a model.
+                Defaults to `True`. Set to `False` for payloads that are already in
+                the format sent to the API, like the output of
+                `model_dump(by_alias=True, mode="json")` on a `PostBatchTagV2`,
+                which are then encoded as is, without being validated.
 
         Returns:
             BatchTagRespV2: Response from the API after creating or updating the tags.
         """
-        if isinstance(data, dict):
+        if validate and isinstance(data, dict):
             data = PostBatchTagV2.model_validate(data)
-        resp = self._post_api_v2("/batch/tag", data=self._model_dump(data))
+        resp = self._post_api_v2("/batch/tag", data=data)
         if self.override_forbid_extra:
             update_model_config(BatchTagRespV2, extra="allow")
         return BatchTagRespV2.model_validate(resp)
@@ -1794,28 +2283,39 @@ class Client(Settings):
 
         Args:
             data (RenameTagV2 | dict[str, Any]): Data to rename the tag.
-
-        Raises:
-            ValueError: The response had an error HTTP status of `4xx` or `5xx`.
         """
         if isinstance(data, dict):
             data = RenameTagV2.model_validate(data)
-        try:
-            resp = httpx.put(
-                url=str(self.v2_base_url.join("/tag/rename")),
-                headers=self.v2_headers,
-                cookies=self.v2_cookies,
-                json=self._model_dump(data),
+        self._put_api_v2("/tag/rename", data=data)
+
+    def put_merge_tag_v2(self, data: MergeTagV2 | dict[str, Any]) -> None:
+        """Merge a tag into another tag in the V2 API.
+
+        Merge a tag using the `PUT /tag/merge` V2 endpoint. Every task tagged with
+        `name` is re-tagged with `new_name`, and the `name` tag is removed, all in a
+        single request.
+
+        ??? example "Example"
+            ```python hl_lines="5"
+            from pyticktick import Client
+            from pyticktick.models.v2 import MergeTagV2
+
+            client = Client()
+            client.put_merge_tag_v2(
+                data=MergeTagV2(
+                    name="test_tag",
+                    new_name="other_tag",
+                ),
             )
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            try:
-                content = e.response.json()
-            except json.decoder.JSONDecodeError:
-                content = e.response.content.decode()
-            msg = f"Response [{e.response.status_code}]: {content}"
-            logger.error(msg)
-            raise ValueError(msg)  # noqa: B904
+            ```
+            This will return nothing if the tag is successfully merged.
+
+        Args:
+            data (MergeTagV2 | dict[str, Any]): Data to merge the tag.
+        """
+        if isinstance(data, dict):
+            data = MergeTagV2.model_validate(data)
+        self._put_api_v2("/tag/merge", data=data)
 
     def delete_tag_v2(self, data: DeleteTagV2 | dict[str, Any]) -> None:
         """Delete a tag in the V2 API.
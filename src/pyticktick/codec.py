@@ -0,0 +1,112 @@
+"""JSON codecs used to encode request bodies and decode responses.
+
+The client sends and receives a lot of JSON, and the largest responses, like the batch
+response of an account with thousands of tasks, spend a noticeable amount of time being
+decoded. This module picks the fastest JSON library available, out of
+[orjson](https://github.com/ijl/orjson), [msgspec](https://jcristharif.com/msgspec/),
+and the standard library `json` module, and wraps it behind a common interface.
+
+Neither orjson nor msgspec are dependencies of pyticktick, so they need to be installed
+separately to be used. The codec can be chosen with the `json_codec` setting, which
+defaults to `auto`, the fastest one that is installed.
+
+!!! example
+    ```python
+    from pyticktick.codec import get_codec
+
+    codec = get_codec("auto")
+    print(codec.name)
+    data = codec.loads(codec.dumps({"title": "Buy milk"}))
+    ```
+"""
+
+from __future__ import annotations
+
+import json
+from functools import cache
+from importlib import import_module
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CodecName = Literal["auto", "orjson", "msgspec", "json"]
+"""The name of a JSON codec, or `auto` to use the fastest one that is installed."""
+
+
+class Codec(NamedTuple):
+    """A JSON library, wrapped behind a common interface.
+
+    Attributes:
+        name (str): The name of the JSON library.
+        dumps (Callable[[Any], bytes]): Encode a Python object to JSON bytes.
+        loads (Callable[[bytes | str], Any]): Decode JSON bytes or text to a Python
+            object.
+        errors (tuple[type[Exception], ...]): The exceptions raised by `loads` when the
+            input is not valid JSON.
+    """
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+    errors: tuple[type[Exception], ...]
+
+
+def _json_dumps(obj: Any) -> bytes:  # noqa: ANN401
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _orjson() -> Codec:
+    orjson = import_module("orjson")
+    return Codec("orjson", orjson.dumps, orjson.loads, (orjson.JSONDecodeError,))
+
+
+def _msgspec() -> Codec:
+    msgspec_json = import_module("msgspec.json")
+    msgspec = import_module("msgspec")
+    return Codec(
+        "msgspec",
+        msgspec_json.encode,
+        msgspec_json.decode,
+        (msgspec.DecodeError,),
+    )
+
+
+def _stdlib() -> Codec:
+    return Codec("json", _json_dumps, json.loads, (json.JSONDecodeError,))
+
+
+_FACTORIES = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}
+
+
+@cache
+def get_codec(name: CodecName = "auto") -> Codec:
+    """Get a JSON codec by name.
+
+    With `auto`, the codecs are tried in order: orjson, msgspec, and finally the
+    standard library, which is always available.
+
+    Args:
+        name (CodecName): The name of the codec. Defaults to `auto`.
+
+    Returns:
+        Codec: The JSON codec.
+
+    Raises:
+        ValueError: If the requested codec is not installed.
+    """
+    if name != "auto":
+        try:
+            return _FACTORIES[name]()
+        except ImportError as e:
+            msg = f"JSON codec `{name}` is not installed"
+            logger.error(msg)
+            raise ValueError(msg) from e
+
+    for candidate in ("orjson", "msgspec"):
+        if find_spec(candidate) is not None:
+            return _FACTORIES[candidate]()
+    return _stdlib()
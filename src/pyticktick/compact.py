@@ -0,0 +1,278 @@
+"""Lightweight, read-only representations of TickTick tasks.
+
+A [`TaskV2`](models/v2/models.md#pyticktick.models.v2.models.TaskV2) is a full pydantic
+model, with dozens of fields and nested models for its checklist items and reminders.
+That is convenient for a handful of tasks, but holding the full history of an account
+in memory, including closed tasks, quickly adds up.
+
+This module contains `CompactTaskV2` and `CompactItemV2`, frozen dataclasses with
+`__slots__` that only keep the commonly used fields, under the same attribute names as
+the pydantic models. They are built straight from the JSON returned by the V2 API,
+without validating it, and repeated strings like project IDs and time zones are
+shared through a bounded cache, so that they are only stored once. Each compact task
+also keeps the compact JSON it was built from, so it can be converted to a full
+`TaskV2` when needed. Pass `keep_raw=False` to drop it and save more memory, when that
+is not needed.
+
+Run `scripts/benchmarks/compact_tasks.py` to compare the memory usage of both
+representations.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.compact import get_compact_tasks_v2
+
+    client = Client()
+    tasks = get_compact_tasks_v2(client)
+    overdue = [t for t in tasks if t.due_date is not None and t.status == 0]
+    full = overdue[0].to_model()
+    ```
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from pyticktick.models.v2.models import TaskV2
+from pyticktick.pydantic import intern_value
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pyticktick.client import Client
+
+
+def _intern(value: str | None) -> str | None:
+    return None if value is None else intern_value(value)
+
+
+def _datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    # The V2 API returns offsets like `+0000`, which `fromisoformat` only accepts from
+    # Python 3.11, and `strptime` is several times slower than `fromisoformat`.
+    if value[-5] in "+-" and value[-3] != ":":
+        value = f"{value[:-2]}:{value[-2:]}"
+    return datetime.fromisoformat(value)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactItemV2:
+    """Read-only checklist item, with the fields of `ItemV2` that are commonly used."""
+
+    id: str
+    title: str | None
+    status: int | None
+    completed_time: str | None
+    start_date: str | None
+    is_all_day: bool | None
+    sort_order: int | None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CompactItemV2:
+        """Build a compact checklist item from its V2 API JSON.
+
+        Args:
+            data (dict[str, Any]): The JSON of the checklist item.
+
+        Returns:
+            CompactItemV2: The compact checklist item.
+        """
+        return cls(
+            id=data["id"],
+            title=data.get("title"),
+            status=data.get("status"),
+            completed_time=data.get("completedTime"),
+            start_date=data.get("startDate"),
+            is_all_day=data.get("isAllDay"),
+            sort_order=data.get("sortOrder"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompactTaskV2:
+    """Read-only task, with the fields of `TaskV2` that are commonly used.
+
+    The data is not validated when the compact task is built, so invalid data is only
+    reported when converting it with `to_model`.
+    """
+
+    id: str
+    project_id: str
+    parent_id: str | None
+    etag: str
+    title: str | None
+    content: str | None
+    desc: str | None
+    kind: str
+    status: int
+    priority: int
+    is_all_day: bool | None
+    start_date: datetime | None
+    due_date: datetime | None
+    completed_time: datetime | None
+    created_time: datetime | None
+    modified_time: datetime | None
+    time_zone: str | None
+    repeat_flag: str | None
+    sort_order: int
+    tags: tuple[str, ...]
+    items: tuple[CompactItemV2, ...]
+    reminders: tuple[str, ...]
+    """The triggers of the reminders of the task."""
+    raw: bytes | None = field(repr=False, compare=False)
+    """The compact JSON the task was built from, if it was kept."""
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], *, keep_raw: bool = True) -> CompactTaskV2:
+        """Build a compact task from its V2 API JSON.
+
+        Args:
+            data (dict[str, Any]): The JSON of the task, as returned by the V2 API.
+            keep_raw (bool): Whether to keep the JSON of the task, so that it can be
+                converted with `to_model`. Defaults to `True`.
+
+        Returns:
+            CompactTaskV2: The compact task.
+        """
+        return cls(
+            id=data["id"],
+            project_id=_intern(data["projectId"]),
+            parent_id=data.get("parentId"),
+            etag=data["etag"],
+            title=data.get("title"),
+            content=data.get("content"),
+            desc=data.get("desc"),
+            kind=_intern(data.get("kind") or "TEXT"),
+            status=data["status"],
+            priority=data["priority"],
+            is_all_day=data.get("isAllDay"),
+            start_date=_datetime(data.get("startDate")),
+            due_date=_datetime(data.get("dueDate")),
+            completed_time=_datetime(data.get("completedTime")),
+            created_time=_datetime(data.get("createdTime")),
+            modified_time=_datetime(data.get("modifiedTime")),
+            time_zone=_intern(data.get("timeZone")),
+            repeat_flag=_intern(data.get("repeatFlag")),
+            sort_order=data["sortOrder"],
+            tags=tuple(_intern(tag) for tag in data.get("tags") or ()),
+            items=tuple(CompactItemV2.from_dict(i) for i in data.get("items") or ()),
+            reminders=tuple(_intern(r["trigger"]) for r in data.get("reminders") or ()),
+            raw=json.dumps(data, separators=(",", ":")).encode() if keep_raw else None,
+        )
+
+    @classmethod
+    def from_model(cls, task: TaskV2, *, keep_raw: bool = True) -> CompactTaskV2:
+        """Build a compact task from a full `TaskV2`.
+
+        Args:
+            task (TaskV2): The task to compact.
+            keep_raw (bool): Whether to keep the JSON of the task, so that it can be
+                converted back with `to_model`. Defaults to `True`.
+
+        Returns:
+            CompactTaskV2: The compact task.
+        """
+        return cls(
+            id=task.id,
+            project_id=_intern(task.project_id),
+            parent_id=task.parent_id,
+            etag=task.etag,
+            title=task.title,
+            content=task.content,
+            desc=task.desc,
+            kind=_intern(task.kind),
+            status=task.status,
+            priority=task.priority,
+            is_all_day=task.is_all_day,
+            start_date=task.start_date,
+            due_date=task.due_date,
+            completed_time=task.completed_time,
+            created_time=task.created_time,
+            modified_time=task.modified_time,
+            time_zone=_intern(task.time_zone),
+            repeat_flag=_intern(task.repeat_flag),
+            sort_order=task.sort_order,
+            tags=tuple(_intern(tag) for tag in task.tags),
+            items=tuple(
+                CompactItemV2(
+                    id=i.id,
+                    title=i.title,
+                    status=i.status,
+                    completed_time=i.completed_time,
+                    start_date=i.start_date,
+                    is_all_day=i.is_all_day,
+                    sort_order=i.sort_order,
+                )
+                for i in task.items
+            ),
+            reminders=tuple(_intern(r.trigger) for r in task.reminders or ()),
+            raw=task.model_dump_json(exclude_none=True).encode() if keep_raw else None,
+        )
+
+    def to_model(self) -> TaskV2:
+        """Convert the compact task to a full, validated `TaskV2`.
+
+        Returns:
+            TaskV2: The full task.
+
+        Raises:
+            ValueError: If the compact task was built without keeping its JSON.
+        """
+        if self.raw is None:
+            msg = f"Compact task `{self.id}` was built with `keep_raw=False`"
+            logger.error(msg)
+            raise ValueError(msg)
+        return TaskV2.model_validate_json(self.raw)
+
+
+def compact_tasks(
+    data: Iterable[dict[str, Any]],
+    *,
+    keep_raw: bool = True,
+) -> list[CompactTaskV2]:
+    """Build compact tasks from a list of task JSON objects.
+
+    This works with the `syncTaskBean.update` list of a batch response, as well as
+    with the list returned by the closed task endpoint.
+
+    Args:
+        data (Iterable[dict[str, Any]]): The JSON of the tasks.
+        keep_raw (bool): Whether to keep the JSON of each task, so that it can be
+            converted with `to_model`. Defaults to `True`.
+
+    Returns:
+        list[CompactTaskV2]: The compact tasks.
+    """
+    return [CompactTaskV2.from_dict(task, keep_raw=keep_raw) for task in data]
+
+
+def get_compact_tasks_v2(
+    client: Client,
+    check_point: int = 0,
+    *,
+    keep_raw: bool = True,
+) -> list[CompactTaskV2]:
+    """Get the active tasks of the account as compact tasks.
+
+    This requests the raw response of
+    [`get_batch_raw_v2`](client/v2.md#pyticktick.client.Client.get_batch_raw_v2),
+    and skips validating it into pydantic models.
+
+    Args:
+        client (Client): The client to request the tasks with.
+        check_point (int): The check point to request changes since, `0` for all the
+            active tasks. Defaults to `0`.
+        keep_raw (bool): Whether to keep the JSON of each task, so that it can be
+            converted with `to_model`. Defaults to `True`.
+
+    Returns:
+        list[CompactTaskV2]: The compact active tasks.
+    """
+    resp = client.get_batch_raw_v2(check_point)
+    return compact_tasks(resp["syncTaskBean"]["update"], keep_raw=keep_raw)
@@ -0,0 +1,104 @@
+"""End-to-end deadlines for calls to the TickTick APIs.
+
+By default, every request only inherits the per-phase timeouts of httpx, and retries
+of the V1 API can stretch a single call to several minutes. This module provides a
+deadline that bounds the total time of everything that runs within it: requests,
+retries, and the waits between retries.
+
+Deadlines are stored in a [`ContextVar`](https://docs.python.org/3/library/contextvars.html),
+so they follow the code that runs within them, including `asyncio` tasks and
+`asyncio.to_thread`. Deadlines can be nested, in which case the earliest one applies.
+The `request_timeout` setting of the client applies a deadline to every single call,
+on top of any deadline set with `deadline`.
+
+Once a deadline has passed, the next request, or the next wait before a retry that
+would end after it, raises a `DeadlineExceededError` instead of being sent. Long
+running loops can also call `check_deadline` to stop cooperatively.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.deadline import DeadlineExceededError, deadline
+
+    client = Client()
+    try:
+        with deadline(5):
+            projects = client.get_projects_v1()
+            batch = client.get_batch_v2()
+    except DeadlineExceededError:
+        print("TickTick is too slow right now")
+    ```
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_deadline: ContextVar[float | None] = ContextVar("pyticktick_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call to the TickTick APIs runs past its deadline."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Bound the total time of the code run within the context.
+
+    Args:
+        seconds (float | None): The time budget, in seconds. If `None`, no deadline is
+            added, but any outer deadline still applies.
+
+    Yields:
+        None: The deadline applies until the context exits.
+    """
+    if seconds is None:
+        yield
+        return
+    end = monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(end if current is None else min(current, end))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Get the time left before the current deadline.
+
+    Returns:
+        float | None: The time left, in seconds, which is negative once the deadline
+            has passed, or `None` if there is no deadline.
+    """
+    end = _deadline.get()
+    return None if end is None else end - monotonic()
+
+
+def check_deadline(needed: float = 0) -> None:
+    """Check that the current deadline leaves enough time for the next step.
+
+    Args:
+        needed (float): The time needed by the next step, in seconds. Defaults to `0`,
+            which only checks that the deadline has not passed yet.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed, or would pass before the
+            next step ends.
+    """
+    left = remaining()
+    if left is not None and left <= needed:
+        if left <= 0:
+            msg = f"Deadline exceeded by {-left:.2f}s"
+        else:
+            msg = f"Only {left:.2f}s left before the deadline, {needed:.2f}s needed"
+        logger.error(msg)
+        raise DeadlineExceededError(msg)
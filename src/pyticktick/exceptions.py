@@ -0,0 +1,198 @@
+"""Exceptions raised when the TickTick APIs return an error response.
+
+Every error response of the APIs is raised as a `TickTickAPIError`, or one of its
+subclasses, depending on the status code and error code of the response. They carry the
+status code, the endpoint, the parsed body, and the `Retry-After` header of the
+response, so that callers, the retries of the V1 API, and the circuit breakers can
+handle each kind of error without parsing the message.
+
+| Exception               | Raised on                                             |
+| ----------------------- | ----------------------------------------------------- |
+| `QuotaExceededError`    | Responses with the `exceed_query_limit` error code    |
+| `RateLimitedError`      | `429 Too Many Requests` responses                     |
+| `AuthExpiredError`      | `401 Unauthorized` and `403 Forbidden` responses      |
+| `ValidationFailedError` | `400 Bad Request` and `422 Unprocessable Content`     |
+| `ServerError`           | `5xx` responses                                       |
+| `TickTickAPIError`      | Any other error response                              |
+
+`QuotaExceededError` is a subclass of `RateLimitedError`, as both are only resolved by
+waiting. For backward compatibility, `TickTickAPIError` is a subclass of `ValueError`,
+with the same `Response [{status}]: {body}` message that the client raised before.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.exceptions import AuthExpiredError, RateLimitedError
+
+    client = Client()
+    try:
+        batch = client.get_batch_v2()
+    except RateLimitedError as e:
+        print(f"Rate limited, retry in {e.retry_after}s")
+    except AuthExpiredError:
+        print("The V2 token has expired, sign on again")
+    ```
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+QUOTA_EXCEEDED_ERROR_CODE = "exceed_query_limit"
+"""The error code of the responses of the V1 API when its query limit is exceeded."""
+
+DEFAULT_MAX_RETRY_AFTER = 300.0
+"""The default maximum number of seconds a `Retry-After` header can ask to wait."""
+
+
+class TickTickAPIError(ValueError):
+    """Raised when the TickTick APIs return an error response.
+
+    Attributes:
+        status (int): The status code of the response.
+        method (str): The HTTP method of the request.
+        endpoint (str): The path of the request.
+        body (Any): The body of the response, decoded from JSON if possible.
+        error_code (str | None): The `errorCode` of the body, if any.
+        retry_after (float | None): The number of seconds to wait before retrying, from
+            the `Retry-After` header of the response, if any.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        status: int,
+        body: Any,  # noqa: ANN401
+        *,
+        method: str = "",
+        endpoint: str = "",
+        error_code: str | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize the error from the details of the error response.
+
+        Args:
+            status (int): The status code of the response.
+            body (Any): The body of the response, decoded from JSON if possible.
+            method (str): The HTTP method of the request. Defaults to `""`.
+            endpoint (str): The path of the request. Defaults to `""`.
+            error_code (str | None): The `errorCode` of the body, if any. Defaults to
+                `None`.
+            retry_after (float | None): The number of seconds to wait before retrying,
+                if known. Defaults to `None`.
+        """
+        super().__init__(f"Response [{status}]: {body}")
+        self.status = status
+        self.method = method
+        self.endpoint = endpoint
+        self.body = body
+        self.error_code = error_code
+        self.retry_after = retry_after
+
+    def __reduce__(self) -> tuple[Any, ...]:  # noqa: D105
+        # The keyword arguments are not part of `args`, so they are restored from the
+        # instance dictionary when unpickling, like in worker processes.
+        return (type(self), (self.status, self.body), self.__dict__)
+
+
+class RateLimitedError(TickTickAPIError):
+    """Raised when the APIs rate limit the requests, with `429 Too Many Requests`."""
+
+
+class QuotaExceededError(RateLimitedError):
+    """Raised when the query limit of the V1 API is exceeded."""
+
+
+class AuthExpiredError(TickTickAPIError):
+    """Raised when the credentials are missing, invalid, or expired."""
+
+
+class ValidationFailedError(TickTickAPIError):
+    """Raised when the APIs reject the data sent in the request."""
+
+
+class ServerError(TickTickAPIError):
+    """Raised when the APIs fail to handle the request, with a `5xx` status code."""
+
+
+_STATUS_ERRORS: dict[int, type[TickTickAPIError]] = {
+    400: ValidationFailedError,
+    401: AuthExpiredError,
+    403: AuthExpiredError,
+    422: ValidationFailedError,
+    429: RateLimitedError,
+}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header, in seconds or as an HTTP date.
+
+    Args:
+        value (str | None): The value of the header.
+
+    Returns:
+        float | None: The number of seconds to wait, or `None` if the header is missing
+            or invalid, including negative, infinite, or `nan` numbers of seconds.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return seconds if math.isfinite(seconds) and seconds >= 0 else None
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def error_from_response(  # noqa: PLR0913
+    status: int,
+    body: Any,  # noqa: ANN401
+    *,
+    method: str = "",
+    endpoint: str = "",
+    retry_after: str | None = None,
+    max_retry_after: float | None = DEFAULT_MAX_RETRY_AFTER,
+) -> TickTickAPIError:
+    """Build the exception matching an error response.
+
+    Args:
+        status (int): The status code of the response.
+        body (Any): The body of the response, decoded from JSON if possible.
+        method (str): The HTTP method of the request. Defaults to `""`.
+        endpoint (str): The path of the request. Defaults to `""`.
+        retry_after (str | None): The `Retry-After` header of the response, if any.
+            Defaults to `None`.
+        max_retry_after (float | None): The maximum number of seconds to wait that the
+            header can ask for, longer waits are capped to it. Defaults to `300`,
+            `None` to not cap them.
+
+    Returns:
+        TickTickAPIError: The exception, of the subclass matching the response.
+    """
+    error_code = body.get("errorCode") if isinstance(body, dict) else None
+    if error_code == QUOTA_EXCEEDED_ERROR_CODE or (
+        isinstance(body, str) and QUOTA_EXCEEDED_ERROR_CODE in body
+    ):
+        cls: type[TickTickAPIError] = QuotaExceededError
+    elif status >= 500:  # noqa: PLR2004
+        cls = ServerError
+    else:
+        cls = _STATUS_ERRORS.get(status, TickTickAPIError)
+    wait = parse_retry_after(retry_after)
+    if wait is not None and max_retry_after is not None:
+        wait = min(wait, max_retry_after)
+    return cls(
+        status,
+        body,
+        method=method,
+        endpoint=endpoint,
+        error_code=error_code,
+        retry_after=wait,
+    )
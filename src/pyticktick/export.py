@@ -0,0 +1,322 @@
+"""Resumable, streaming export of a TickTick account to NDJSON.
+
+This module exports the projects, project groups, tags, active tasks, and closed task
+history of an account to a newline-delimited JSON file, with one object per line:
+
+```json
+{"type": "project", "data": {"id": "67ec23b18f08cf38dd957e10", "name": "Project 1"}}
+{"type": "task", "data": {"id": "67ec23c28f08cf38dd957ff1", "title": "Task 1"}}
+{"type": "closed_task", "data": {"id": "67ec23b68f08cf38dd957ece", "title": "Task 2"}}
+```
+
+The `data` of each line is the JSON returned by the V2 API, as is, without being
+validated into models. Objects are written as soon as they are downloaded, and the
+closed task history is downloaded in time windows, so only one response is held in
+memory at a time. The history is always split into windows, from `since`, which
+defaults to `EARLIEST_CLOSED_TIME`, before TickTick was launched. Setting `since` to
+the creation of the account skips the requests of the empty windows before it.
+
+After the active objects, and after each window of the closed task history, the
+progress of the export is saved to a checkpoint file next to the export. If the export
+is interrupted, running it again with the same arguments drops anything written after
+the last checkpoint, and resumes from there. The checkpoint file is removed once the
+export completes.
+
+Exports whose path ends with `.gz` are compressed with gzip, and exports whose path ends
+with `.zst` are compressed with Zstandard, which requires the `zstandard` package. Each
+checkpoint closes a compressed frame, so interrupted exports can still be decompressed
+up to their last checkpoint.
+
+!!! example
+    ```python
+    from datetime import datetime, timezone
+    from pathlib import Path
+
+    from pyticktick import Client
+    from pyticktick.export import export_account, export_accounts
+
+    client = Client()
+    summary = export_account(
+        client,
+        Path("backup.ndjson.gz"),
+        since=datetime(2020, 1, 1, tzinfo=timezone.utc),
+    )
+    print(summary.closed_tasks)
+
+    # Export several accounts at once
+    summaries = export_accounts(
+        {Path("alice.ndjson.zst"): Client(_env_file=".env.alice"), ...},
+        since=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        workers=4,
+    )
+    ```
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal, NamedTuple
+
+from loguru import logger
+
+from pyticktick.codec import get_codec
+from pyticktick.models.v2.parameters.closed import GetClosedV2
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from pathlib import Path
+
+    from pyticktick.client import Client
+
+Compression = Literal["none", "gzip", "zstd"]
+"""The compression of an export file."""
+
+EARLIEST_CLOSED_TIME = datetime(2013, 1, 1, tzinfo=timezone.utc)
+"""The default earliest time to export closed tasks from, before TickTick launched."""
+
+_CLOSED_STATUSES = ("Completed", "Abandoned")
+
+
+class ExportSummary(NamedTuple):
+    """Number of objects written by an export.
+
+    When an export is resumed, only the objects written since it was resumed are
+    counted.
+
+    Attributes:
+        projects (int): The number of projects.
+        project_groups (int): The number of project groups.
+        tags (int): The number of tags.
+        tasks (int): The number of active tasks.
+        closed_tasks (int): The number of completed and abandoned tasks.
+        resumed (bool): Whether the export was resumed from a checkpoint.
+    """
+
+    projects: int
+    project_groups: int
+    tags: int
+    tasks: int
+    closed_tasks: int
+    resumed: bool
+
+
+def _compression(path: Path) -> Compression:
+    if path.suffix == ".gz":
+        return "gzip"
+    if path.suffix == ".zst":
+        return "zstd"
+    return "none"
+
+
+@contextmanager
+def _frame(file: BinaryIO, compression: Compression) -> Iterator[BinaryIO]:
+    # Each frame is a complete gzip member, or Zstandard frame, and concatenated frames
+    # decompress as a single stream.
+    if compression == "gzip":
+        with gzip.GzipFile(fileobj=file, mode="wb") as writer:
+            yield writer  # type: ignore[misc]
+    elif compression == "zstd":
+        try:
+            zstandard = import_module("zstandard")
+        except ImportError as e:
+            msg = "Exporting to `.zst` requires the `zstandard` package"
+            logger.error(msg)
+            raise ValueError(msg) from e
+        with zstandard.ZstdCompressor().stream_writer(file, closefd=False) as writer:
+            yield writer
+    else:
+        yield file
+
+
+class _Checkpoint(NamedTuple):
+    offset: int
+    until: datetime
+    active: bool
+    closed: dict[str, str]
+
+    @classmethod
+    def load(cls, path: Path) -> _Checkpoint | None:
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return cls(
+            offset=data["offset"],
+            until=datetime.fromisoformat(data["until"]),
+            active=data["active"],
+            closed=data["closed"],
+        )
+
+    def save(self, path: Path) -> None:
+        # Written to a temporary file first, so that an interruption never leaves a
+        # partial checkpoint behind.
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "offset": self.offset,
+                    "until": self.until.isoformat(),
+                    "active": self.active,
+                    "closed": self.closed,
+                },
+            ),
+        )
+        tmp.replace(path)
+
+
+def _windows(
+    since: datetime,
+    until: datetime,
+    window: timedelta,
+) -> Iterator[tuple[datetime, datetime]]:
+    # Naive times are assumed to be in UTC, like the times returned by the APIs.
+    start = since if since.tzinfo is not None else since.replace(tzinfo=timezone.utc)
+    while start < until:
+        end = min(start + window, until)
+        yield start, end
+        start = end
+
+
+def export_account(
+    client: Client,
+    path: Path,
+    *,
+    since: datetime = EARLIEST_CLOSED_TIME,
+    window: timedelta = timedelta(days=30),
+    closed: bool = True,
+) -> ExportSummary:
+    """Export an account to an NDJSON file, resuming from its checkpoint if any.
+
+    Args:
+        client (Client): The client of the account to export.
+        path (Path): The path of the export. Paths ending with `.gz` or `.zst` are
+            compressed.
+        since (datetime): The earliest time to export closed tasks from. Defaults to
+            `EARLIEST_CLOSED_TIME`.
+        window (timedelta): The length of the time windows the closed task history is
+            requested in. Defaults to 30 days.
+        closed (bool): Whether to export the closed task history. Defaults to `True`.
+
+    Returns:
+        ExportSummary: The number of objects written.
+
+    Raises:
+        ValueError: If the export is compressed with Zstandard, and the `zstandard`
+            package is not installed.
+    """  # noqa: DOC502
+    compression = _compression(path)
+    checkpoint_path = path.with_name(f"{path.name}.checkpoint")
+    checkpoint = _Checkpoint.load(checkpoint_path)
+    resumed = checkpoint is not None
+    if checkpoint is None:
+        checkpoint = _Checkpoint(
+            offset=0,
+            until=datetime.now(tz=timezone.utc),
+            active=False,
+            closed={},
+        )
+    else:
+        logger.info(f"Resuming the export to `{path}` from byte {checkpoint.offset}")
+
+    dumps = get_codec(client.json_codec).dumps
+    counts = dict.fromkeys(
+        ("project", "project_group", "tag", "task", "closed_task"),
+        0,
+    )
+
+    with path.open("ab") as file:
+        # Anything written after the last checkpoint belongs to an interrupted step,
+        # and is written again.
+        file.truncate(checkpoint.offset)
+        file.seek(checkpoint.offset)
+
+        def _write(kind: str, objects: Iterable[dict[str, Any]]) -> None:
+            with _frame(file, compression) as writer:
+                for obj in objects:
+                    writer.write(dumps({"type": kind, "data": obj}) + b"\n")
+                    counts[kind] += 1
+
+        def _commit(**changes: Any) -> None:  # noqa: ANN401
+            nonlocal checkpoint
+            file.flush()
+            os.fsync(file.fileno())
+            checkpoint = checkpoint._replace(offset=file.tell(), **changes)
+            checkpoint.save(checkpoint_path)
+
+        if not checkpoint.active:
+            batch = client.get_batch_raw_v2()
+            _write("project", batch.get("projectProfiles") or ())
+            _write("project_group", batch.get("projectGroups") or ())
+            _write("tag", batch.get("tags") or ())
+            _write("task", batch["syncTaskBean"]["update"])
+            del batch
+            _commit(active=True)
+
+        for status in _CLOSED_STATUSES if closed else ():
+            done = checkpoint.closed.get(status)
+            start = since if done is None else datetime.fromisoformat(done)
+            for from_, to in _windows(start, checkpoint.until, window):
+                params = GetClosedV2(from_=from_, to=to, status=status)
+                tasks = client.get_project_all_closed_raw_v2(params)
+                _write("closed_task", tasks)
+                del tasks
+                _commit(closed={**checkpoint.closed, status: to.isoformat()})
+
+    checkpoint_path.unlink()
+    return ExportSummary(
+        projects=counts["project"],
+        project_groups=counts["project_group"],
+        tags=counts["tag"],
+        tasks=counts["task"],
+        closed_tasks=counts["closed_task"],
+        resumed=resumed,
+    )
+
+
+def export_accounts(
+    accounts: Mapping[Path, Client],
+    *,
+    workers: int = 4,
+    **kwargs: Any,  # noqa: ANN401
+) -> dict[Path, ExportSummary]:
+    """Export several accounts in parallel, each to its own NDJSON file.
+
+    Each account is exported with
+    [`export_account`](export.md#pyticktick.export.export_account), in a pool of
+    threads. If an export fails, the other exports still run to completion, or to their
+    own failure, and the first error is raised once they are all done. Running the
+    exports again resumes the failed ones from their checkpoints.
+
+    Args:
+        accounts (Mapping[Path, Client]): The path of each export, and the client of its
+            account.
+        workers (int): The number of accounts to export at once. Defaults to `4`.
+        **kwargs (Any): The options passed to `export_account`, like `since`.
+
+    Returns:
+        dict[Path, ExportSummary]: The summary of each export.
+
+    Raises:
+        Exception: The first error raised by an export, if any failed.
+    """  # noqa: DOC502
+    summaries: dict[Path, ExportSummary] = {}
+    errors: list[Exception] = []
+
+    def _export(item: tuple[Path, Client]) -> None:
+        path, client = item
+        try:
+            summaries[path] = export_account(client, path, **kwargs)
+        except Exception as e:  # noqa: BLE001
+            logger.exception(f"Export to `{path}` failed")
+            errors.append(e)
+
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(_export, accounts.items()))
+    if errors:
+        raise errors[0]
+    return summaries
@@ -0,0 +1,445 @@
+"""Bulk import of tasks, subtasks, tags, and projects from CSV and iCalendar files.
+
+Migrating from another tool usually means creating tens of thousands of tasks. Creating
+them with [`post_task_v2`](client/v2.md#pyticktick.client.Client.post_task_v2), then
+linking subtasks with
+[`post_task_parent_v2`](client/v2.md#pyticktick.client.Client.post_task_parent_v2),
+needs the IDs of the created tasks before the links can be sent. Instead, this module
+assigns an `ObjectId` to every project and task when the file is parsed, so that the
+whole import, including the links between subtasks and their parents, is known before
+any request is sent.
+
+An `ImportPlan` is built from a file with `ImportPlan.from_csv` or
+`ImportPlan.from_ics`, and sent with `import_plan`. The projects, tasks, and parent
+links are sent in batches, in a pool of threads, and each batch is sent as soon as the
+batches it depends on are done, so tasks of a project that is already created do not
+wait for the other projects, and parent links do not wait for the other tasks.
+
+CSV files have a header row, with the following columns, all optional but `title`:
+
+| Column       | Description                                                    |
+| ------------ | -------------------------------------------------------------- |
+| `id`         | Key of the task within the file, referenced by `parent`        |
+| `parent`     | Key of the parent task                                         |
+| `project`    | Name of the project, created by the import                     |
+| `title`      | Title of the task                                              |
+| `content`    | Content of the task                                            |
+| `start_date` | Start date, in ISO 8601 format                                 |
+| `due_date`   | Due date, in ISO 8601 format                                   |
+| `time_zone`  | IANA time zone of the dates                                    |
+| `is_all_day` | Whether the task is due any time on the due date               |
+| `priority`   | Priority of the task, `0`, `1`, `3`, or `5`                    |
+| `tags`       | Tags of the task, separated by commas or whitespace            |
+
+iCalendar files are imported from their `VTODO` components, into a project named after
+the `X-WR-CALNAME` of the calendar, and subtasks are linked to their parent with
+`RELATED-TO`. Tasks without a project are added to the project of their parent, or to
+`default_project` if they have none. Tag names are lowercased, as TickTick requires.
+
+!!! example
+    ```python
+    from pathlib import Path
+
+    from pyticktick import Client
+    from pyticktick.importer import ImportPlan, import_plan
+
+    client = Client()
+    plan = ImportPlan.from_csv(Path("todoist.csv"), default_project="Todoist")
+    summary = import_plan(client, plan, batch_size=200, max_workers=4)
+    print(f"{summary.tasks} tasks imported, {summary.rate:.0f} objects per second")
+    ```
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple
+from zoneinfo import ZoneInfo
+
+from bson import ObjectId as BsonObjectId
+from icalendar import Calendar
+from loguru import logger
+
+from pyticktick.deadline import check_deadline
+from pyticktick.logger import log_event
+from pyticktick.models.v2.parameters.project import CreateProjectV2, PostBatchProjectV2
+from pyticktick.models.v2.parameters.task import CreateTaskV2, PostBatchTaskV2
+from pyticktick.models.v2.parameters.task_parent import (
+    PostBatchTaskParentV2,
+    SetTaskParentV2,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from pathlib import Path
+
+    from pyticktick.client import Client
+
+_CSV_FIELDS = (
+    "title",
+    "content",
+    "start_date",
+    "due_date",
+    "time_zone",
+    "is_all_day",
+    "priority",
+)
+
+
+class _Row(NamedTuple):
+    key: str | None
+    parent: str | None
+    project: str | None
+    fields: dict[str, Any]
+
+
+def _tags(names: Iterable[str]) -> list[str]:
+    return [name.lower() for name in names if name]
+
+
+def _ical_priority(priority: int) -> int:
+    # iCalendar priorities go from 1, the highest, to 9, the lowest, with 0 undefined.
+    if priority == 0:
+        return 0
+    if priority < 5:  # noqa: PLR2004
+        return 5
+    return 3 if priority == 5 else 1  # noqa: PLR2004
+
+
+def _ical_date(fields: dict[str, Any], name: str, value: date | None) -> None:
+    if value is None:
+        return
+    if not isinstance(value, datetime):
+        fields["is_all_day"] = True
+        value = datetime(value.year, value.month, value.day)  # noqa: DTZ001
+    elif isinstance(value.tzinfo, ZoneInfo):
+        fields["time_zone"] = value.tzinfo.key
+    fields[name] = value
+
+
+class ImportPlan(NamedTuple):
+    """Projects, tasks, and parent links to create, with their IDs already assigned.
+
+    Attributes:
+        projects (list[CreateProjectV2]): The projects to create.
+        tasks (list[CreateTaskV2]): The tasks to create, grouped by project.
+        parents (list[SetTaskParentV2]): The links between subtasks and their parent.
+    """
+
+    projects: list[CreateProjectV2]
+    tasks: list[CreateTaskV2]
+    parents: list[SetTaskParentV2]
+
+    @classmethod
+    def _from_rows(cls, rows: Sequence[_Row], default_project: str) -> ImportPlan:
+        task_ids = {row.key: str(BsonObjectId()) for row in rows if row.key is not None}
+        by_key = {row.key: row for row in rows if row.key is not None}
+        for row in rows:
+            if row.parent is not None and row.parent not in by_key:
+                msg = f"Task `{row.key}` has an unknown parent `{row.parent}`"
+                logger.error(msg)
+                raise ValueError(msg)
+
+        def _project(row: _Row) -> str:
+            # Subtasks must be in the same project as their parent, so tasks without a
+            # project inherit the project of their closest ancestor that has one.
+            seen = set()
+            while row.project is None and row.parent is not None:
+                if row.key in seen:
+                    msg = f"Task `{row.key}` is its own ancestor"
+                    logger.error(msg)
+                    raise ValueError(msg)
+                seen.add(row.key)
+                row = by_key[row.parent]
+            return row.project or default_project
+
+        names = [_project(row) for row in rows]
+        project_ids = {name: str(BsonObjectId()) for name in dict.fromkeys(names)}
+        tasks = []
+        parents = []
+        for row, name in sorted(
+            zip(rows, names, strict=True), key=lambda item: item[1]
+        ):
+            task_id = task_ids.get(row.key) or str(BsonObjectId())
+            project_id = project_ids[name]
+            tasks.append(CreateTaskV2(id=task_id, project_id=project_id, **row.fields))
+            if row.parent is None:
+                continue
+            if _project(by_key[row.parent]) != name:
+                msg = f"Task `{row.key}` is not in the same project as its parent"
+                logger.error(msg)
+                raise ValueError(msg)
+            parents.append(
+                SetTaskParentV2(
+                    parent_id=task_ids[row.parent],
+                    project_id=project_id,
+                    task_id=task_id,
+                ),
+            )
+        return cls(
+            projects=[CreateProjectV2(id=i, name=n) for n, i in project_ids.items()],
+            tasks=tasks,
+            parents=parents,
+        )
+
+    @classmethod
+    def from_csv(cls, path: Path, *, default_project: str = "Imported") -> ImportPlan:
+        """Build a plan from a CSV file, with one task per row.
+
+        Args:
+            path (Path): The path of the CSV file.
+            default_project (str): The name of the project of the tasks without a
+                project. Defaults to `"Imported"`.
+
+        Returns:
+            ImportPlan: The plan to import the tasks of the file.
+
+        Raises:
+            ValueError: If a task references an unknown parent, or a parent in another
+                project.
+        """  # noqa: DOC502
+        rows = []
+        with path.open(newline="", encoding="utf-8-sig") as file:
+            for record in csv.DictReader(file):
+                values = {k: v.strip() for k, v in record.items() if k and v}
+                fields: dict[str, Any] = {
+                    k: values[k] for k in _CSV_FIELDS if k in values
+                }
+                if "priority" in fields:
+                    fields["priority"] = int(fields["priority"])
+                if "tags" in values:
+                    fields["tags"] = _tags(re.split(r"[,\s]+", values["tags"]))
+                rows.append(
+                    _Row(
+                        key=values.get("id"),
+                        parent=values.get("parent"),
+                        project=values.get("project"),
+                        fields=fields,
+                    ),
+                )
+        return cls._from_rows(rows, default_project)
+
+    @classmethod
+    def from_ics(cls, path: Path, *, default_project: str = "Imported") -> ImportPlan:
+        """Build a plan from the `VTODO` components of an iCalendar file.
+
+        Args:
+            path (Path): The path of the iCalendar file.
+            default_project (str): The name of the project of the tasks, if the
+                calendar does not have an `X-WR-CALNAME`. Defaults to `"Imported"`.
+
+        Returns:
+            ImportPlan: The plan to import the tasks of the file.
+
+        Raises:
+            ValueError: If a task references an unknown parent, or a parent in another
+                project.
+        """  # noqa: DOC502
+        rows = []
+        for calendar in Calendar.from_ical(path.read_bytes(), multiple=True):
+            project = calendar.get("X-WR-CALNAME")
+            for todo in calendar.walk("VTODO"):
+                fields: dict[str, Any] = {"title": str(todo.get("SUMMARY", ""))}
+                if "DESCRIPTION" in todo:
+                    fields["content"] = str(todo["DESCRIPTION"])
+                _ical_date(fields, "start_date", todo.decoded("DTSTART", None))
+                _ical_date(fields, "due_date", todo.decoded("DUE", None))
+                if "PRIORITY" in todo:
+                    fields["priority"] = _ical_priority(int(todo["PRIORITY"]))
+                if str(todo.get("STATUS", "")).upper() == "COMPLETED":
+                    fields["status"] = 2
+                    _ical_date(
+                        fields, "completed_time", todo.decoded("COMPLETED", None)
+                    )
+                categories = todo.get("CATEGORIES", [])
+                for category in (
+                    categories if isinstance(categories, list) else [categories]
+                ):
+                    fields.setdefault("tags", []).extend(
+                        _tags(str(c).replace(" ", "-") for c in category.cats),
+                    )
+
+                related = todo.get("RELATED-TO", [])
+                parent = next(
+                    (
+                        str(r)
+                        for r in (related if isinstance(related, list) else [related])
+                        if r.params.get("RELTYPE", "PARENT").upper() == "PARENT"
+                    ),
+                    None,
+                )
+                rows.append(
+                    _Row(
+                        key=str(todo["UID"]) if "UID" in todo else None,
+                        parent=parent,
+                        project=None if project is None else str(project),
+                        fields=fields,
+                    ),
+                )
+        return cls._from_rows(rows, default_project)
+
+
+class ImportSummary(NamedTuple):
+    """Number of objects created by an import, and how long it took.
+
+    Attributes:
+        projects (int): The number of projects created.
+        tasks (int): The number of tasks created.
+        parents (int): The number of subtasks linked to their parent.
+        errors (dict[str, str]): The error of each object the API refused to create,
+            by ID.
+        duration (float): The duration of the import, in seconds.
+    """
+
+    projects: int
+    tasks: int
+    parents: int
+    errors: dict[str, str]
+    duration: float
+
+    @property
+    def rate(self) -> float:
+        """The number of objects created per second."""
+        total = self.projects + self.tasks + self.parents
+        return total / self.duration if self.duration > 0 else 0.0
+
+
+def _batches(items: Sequence[Any], size: int) -> list[Sequence[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def import_plan(
+    client: Client,
+    plan: ImportPlan,
+    *,
+    batch_size: int = 200,
+    max_workers: int = 4,
+) -> ImportSummary:
+    """Send the projects, tasks, and parent links of a plan to the V2 API.
+
+    Each batch is sent as soon as the batches it depends on are done: a batch of tasks
+    waits for the projects of its tasks, and a batch of parent links waits for the
+    tasks it links. The progress and throughput of the import are logged after each
+    batch. If a batch fails, or the current
+    [`deadline`](deadline.md#pyticktick.deadline.deadline) has passed, the batches that
+    depend on it are not sent, while the others still are.
+
+    Args:
+        client (Client): The client to send the batches with.
+        plan (ImportPlan): The plan to import.
+        batch_size (int): The maximum number of objects sent in a single request.
+            Defaults to `200`.
+        max_workers (int): The maximum number of concurrent requests. Defaults to `4`.
+
+    Returns:
+        ImportSummary: The number of objects created.
+
+    Raises:
+        ValueError: If any batch failed, chained to the first error.
+    """
+    start = monotonic()
+    total = len(plan.projects) + len(plan.tasks) + len(plan.parents)
+    counts = {"projects": 0, "tasks": 0, "parents": 0}
+    errors: dict[str, str] = {}
+    lock = Lock()
+
+    def _send(
+        kind: str,
+        deps: Iterable[Future[None]],
+        post: Callable[[], Any],
+        size: int,
+    ) -> None:
+        for dep in deps:
+            dep.result()
+        check_deadline()
+        resp = post()
+        with lock:
+            errors.update(resp.id2error)
+            counts[kind] += size - len(resp.id2error)
+            done = sum(counts.values()) + len(errors)
+            elapsed = monotonic() - start
+        log_event(
+            "INFO",
+            "import",
+            "Imported {} of {} objects, at {:.0f} per second",
+            done,
+            total,
+            done / elapsed if elapsed > 0 else 0.0,
+            kind=kind,
+            done=done,
+            total=total,
+        )
+
+    # Batches only wait on batches submitted before them, which the executor has
+    # already started, as it runs them in order, so waiting cannot deadlock the pool.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def _submit(
+            kind: str,
+            deps: Iterable[Future[None]],
+            post: Callable[[], Any],
+            size: int,
+        ) -> Future[None]:
+            return executor.submit(copy_context().run, _send, kind, deps, post, size)
+
+        project_futures: dict[str, Future[None]] = {}
+        for batch in _batches(plan.projects, batch_size):
+            data = PostBatchProjectV2(add=list(batch))
+            future = _submit(
+                "projects", (), lambda d=data: client.post_project_v2(d), len(batch)
+            )
+            project_futures.update(dict.fromkeys((p.id for p in batch), future))
+
+        task_futures: dict[str, Future[None]] = {}
+        for batch in _batches(plan.tasks, batch_size):
+            deps = {
+                project_futures[t.project_id]
+                for t in batch
+                if t.project_id in project_futures
+            }
+            data = PostBatchTaskV2(add=list(batch))
+            future = _submit(
+                "tasks", deps, lambda d=data: client.post_task_v2(d), len(batch)
+            )
+            task_futures.update(dict.fromkeys((t.id for t in batch), future))
+
+        parent_futures = []
+        for batch in _batches(plan.parents, batch_size):
+            deps = {
+                task_futures[i]
+                for p in batch
+                for i in (p.task_id, p.parent_id)
+                if i in task_futures
+            }
+            data = PostBatchTaskParentV2(list(batch))
+            parent_futures.append(
+                _submit(
+                    "parents",
+                    deps,
+                    lambda d=data: client.post_task_parent_v2(d),
+                    len(batch),
+                ),
+            )
+
+    futures = [
+        *dict.fromkeys([*project_futures.values(), *task_futures.values()]),
+        *parent_futures,
+    ]
+    failed = [e for f in futures if (e := f.exception()) is not None]
+    if failed:
+        msg = f"{len(failed)} of {len(futures)} import batch(es) failed"
+        logger.error(msg)
+        raise ValueError(msg) from failed[0]
+    return ImportSummary(
+        projects=counts["projects"],
+        tasks=counts["tasks"],
+        parents=counts["parents"],
+        errors=errors,
+        duration=monotonic() - start,
+    )
@@ -13,6 +13,21 @@ You should use `from loguru import logger` for all other logging needs.
 This module was taken from [Delgan/loguru#969 (comment)](https://github.com/Delgan/loguru/issues/969#issuecomment-1703869863)
 and is endorsed as the best current workaround by the author of Loguru.
 
+It also contains the helpers that keep the logs of the client cheap under load, like
+during retry storms:
+
+- `log_event` logs a named event with structured fields, like the endpoint, status,
+    attempt, and duration, which Loguru stores in the `extra` dict of the record. Its
+    arguments are only formatted if a sink accepts the record, and callables are only
+    called then.
+- `excerpt` truncates response bodies to the `log_body_limit` setting of the client.
+- Events are sampled with the `log_sample_interval` setting of the client, which logs
+    each event at most once per interval, with the number of suppressed records.
+- `add_sink` adds a Loguru sink for the pyticktick logs that serializes the records to
+    JSON and writes them from a background thread, so that slow log pipelines do not
+    block requests. The `log_sink` setting of the client adds one with `shared_sink`,
+    once per file, however many clients use it.
+
 !!! Example
     ```python
     from loguru import logger
@@ -21,13 +36,41 @@ and is endorsed as the best current workaround by the author of Loguru.
     logger.info("This is a Loguru message")
     _logger.info("This is a standard logging message that will be sent to Loguru")
     ```
+
+!!! Example "Structured logs"
+    ```python
+    import sys
+
+    from pyticktick import Client
+    from pyticktick.logger import add_sink
+
+    add_sink(sys.stderr, level="WARNING")
+    client = Client(log_body_limit=500, log_sample_interval=10)
+    ```
 """
 
+from __future__ import annotations
+
 import logging
 import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from loguru import logger
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from loguru import Record
+    from tenacity import RetryCallState
+
+# Number of frames between the logging call and `emit`, by call site. It only depends on
+# the logging method that was called, so it is only computed once per call site.
+_depths: dict[tuple[str, int], int] = {}
+
 
 class InterceptHandler(logging.Handler):  # noqa: D101
     def emit(self, record: logging.LogRecord) -> None:  # noqa: D102
@@ -38,10 +81,14 @@ class InterceptHandler(logging.Handler):  # noqa: D101
             level = str(record.levelno)
 
         # Find caller from where originated the logged message.
-        frame, depth = sys._getframe(6), 6  # noqa: SLF001
-        while frame and frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back  # type: ignore[assignment] # ty: ignore[unused-ignore-comment]
-            depth += 1
+        site = (record.pathname, record.lineno)
+        depth = _depths.get(site)
+        if depth is None:
+            frame, depth = sys._getframe(6), 6  # noqa: SLF001
+            while frame and frame.f_code.co_filename == logging.__file__:
+                frame = frame.f_back  # type: ignore[assignment] # ty: ignore[unused-ignore-comment]
+                depth += 1
+            _depths[site] = depth
 
         logger.opt(depth=depth, exception=record.exc_info).log(
             level,
@@ -49,6 +96,208 @@ class InterceptHandler(logging.Handler):  # noqa: D101
         )
 
 
+class LogConfig(NamedTuple):
+    """Logging options of the calls made by a client.
+
+    Attributes:
+        body_limit (int): The maximum number of characters of response bodies to log.
+        sample_interval (float): The minimum time, in seconds, between two records of
+            the same event, `0` to log every record.
+    """
+
+    body_limit: int = 1000
+    sample_interval: float = 0
+
+
+_config: ContextVar[LogConfig] = ContextVar(
+    "pyticktick_log_config",
+    default=LogConfig(),  # noqa: B039
+)
+
+
+@contextmanager
+def log_config(config: LogConfig) -> Iterator[None]:
+    """Apply logging options to the code run within the context.
+
+    Args:
+        config (LogConfig): The logging options.
+
+    Yields:
+        None: The options apply until the context exits.
+    """
+    token = _config.set(config)
+    try:
+        yield
+    finally:
+        _config.reset(token)
+
+
+def excerpt(body: Any, limit: int | None = None) -> str:  # noqa: ANN401
+    """Truncate a response body before logging it.
+
+    Args:
+        body (Any): The response body, decoded or not.
+        limit (int | None): The maximum number of characters to keep. Defaults to the
+            `body_limit` of the current logging options.
+
+    Returns:
+        str: The body, truncated to `limit` characters if it is longer.
+    """
+    if limit is None:
+        limit = _config.get().body_limit
+    text = body.decode(errors="replace") if isinstance(body, bytes) else str(body)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text) - limit} more characters)"
+
+
+class _Sampler:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._last: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def allow(self, event: str, interval: float) -> int | None:
+        # Returns the number of records suppressed since the last allowed one, or
+        # `None` if this record should be suppressed.
+        if interval <= 0:
+            return 0
+        now = monotonic()
+        with self._lock:
+            last = self._last.get(event)
+            if last is not None and now - last < interval:
+                self._suppressed[event] = self._suppressed.get(event, 0) + 1
+                return None
+            self._last[event] = now
+            return self._suppressed.pop(event, 0)
+
+
+_sampler = _Sampler()
+
+
+class _Lazy:
+    # Loguru only formats the message if a sink accepts the record, so the function is
+    # only called then.
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]) -> None:
+        self.func = func
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.func(), format_spec)
+
+
+def log_event(level: str, event: str, message: str, *args: Any, **fields: Any) -> None:  # noqa: ANN401
+    """Log a named event with structured fields, sampled and formatted lazily.
+
+    The message is formatted with `str.format`, only if a sink accepts the record.
+    Arguments that are callables are only called then, so expensive values, like body
+    excerpts, can be passed as `lambda: excerpt(body)`.
+
+    Args:
+        level (str): The Loguru level of the record, like `ERROR`.
+        event (str): The name of the event, used for sampling and stored as the `event`
+            field.
+        message (str): The message, with `{}` placeholders for `args`.
+        *args (Any): The arguments of the message.
+        **fields (Any): The structured fields, stored in the `extra` dict of the record.
+    """
+    suppressed = _sampler.allow(event, _config.get().sample_interval)
+    if suppressed is None:
+        return
+    lazy_args = [_Lazy(arg) if callable(arg) else arg for arg in args]
+    logger.bind(event=event, suppressed=suppressed, **fields).opt(depth=1).log(
+        level,
+        message,
+        *lazy_args,
+    )
+
+
+def before_sleep(retry_state: RetryCallState) -> None:
+    """Log a retry of a call to the APIs, as a tenacity `before_sleep` callback.
+
+    Args:
+        retry_state (RetryCallState): The state of the call being retried.
+    """
+    outcome = retry_state.outcome
+    error = None if outcome is None else outcome.exception()
+    wait = 0 if retry_state.next_action is None else retry_state.next_action.sleep
+    name = getattr(retry_state.fn, "__qualname__", repr(retry_state.fn))
+    log_event(
+        "INFO",
+        "retry",
+        "Retrying {} in {:.1f} seconds, attempt {}, as it raised {}",
+        name,
+        wait,
+        retry_state.attempt_number,
+        lambda: excerpt(error),
+        attempt=retry_state.attempt_number,
+        wait=wait,
+    )
+
+
+def _is_pyticktick(record: Record) -> bool:
+    return record["name"] is not None and record["name"].startswith("pyticktick")
+
+
+def add_sink(
+    sink: Any,  # noqa: ANN401
+    *,
+    level: str = "INFO",
+    serialize: bool = True,
+) -> int:
+    """Add a non-blocking Loguru sink for the logs of pyticktick.
+
+    Records are put on a queue and written by a background thread, so a slow sink does
+    not block the requests. With `serialize`, each record is written as a JSON object,
+    including its structured fields.
+
+    Args:
+        sink (Any): Any sink accepted by [`logger.add`](https://loguru.readthedocs.io/en/stable/api/logger.html#loguru._logger.Logger.add),
+            like a file path or `sys.stderr`.
+        level (str): The minimum level of the records to write. Defaults to `INFO`.
+        serialize (bool): Whether to write the records as JSON. Defaults to `True`.
+
+    Returns:
+        int: The identifier of the sink, to remove it with `logger.remove`.
+    """
+    return logger.add(
+        sink,
+        level=level,
+        serialize=serialize,
+        enqueue=True,
+        filter=_is_pyticktick,
+    )
+
+
+_shared_sinks: dict[tuple[str, str, bool], int] = {}
+_shared_sinks_lock = Lock()
+
+
+def shared_sink(path: str, *, level: str = "INFO", serialize: bool = True) -> int:
+    """Add a sink with `add_sink`, unless the same sink was already added.
+
+    This is used by clients with the `log_sink` setting, so that several clients
+    writing to the same file do not write each record several times. The sink is kept
+    until it is removed with `logger.remove`.
+
+    Args:
+        path (str): The path of the file to write the records to.
+        level (str): The minimum level of the records to write. Defaults to `INFO`.
+        serialize (bool): Whether to write the records as JSON. Defaults to `True`.
+
+    Returns:
+        int: The identifier of the sink, to remove it with `logger.remove`.
+    """
+    key = (path, level, serialize)
+    with _shared_sinks_lock:
+        handler_id = _shared_sinks.get(key)
+        if handler_id is None:
+            handler_id = add_sink(path, level=level, serialize=serialize)
+            _shared_sinks[key] = handler_id
+        return handler_id
+
+
 _logger = logging.getLogger(__name__)
 _logger.addHandler(InterceptHandler())
 _logger.setLevel(logging.DEBUG)
@@ -0,0 +1,494 @@
+"""Local SQLite mirror of a TickTick account.
+
+This module contains the `Mirror` class, which persists the contents of the V2 API
+into a set of normalized SQLite tables. Once the account has been mirrored, reporting
+queries can be run locally, instead of re-downloading and re-validating the whole
+account on each request.
+
+The mirror is kept up to date incrementally. Active objects are synced via the
+`check_point` returned by
+[`get_batch_v2`](client/v2.md#pyticktick.client.Client.get_batch_v2)
+so only the tasks that changed since the last sync are downloaded. Rows are only
+rewritten when their `etag` has changed. Closed tasks are synced from
+[`get_project_all_closed_v2`](client/v2.md#pyticktick.client.Client.get_project_all_closed_v2)
+starting from the time of the last closed task sync.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.mirror import Mirror
+
+    client = Client()
+    with Mirror("ticktick.db") as mirror:
+        mirror.sync(client)
+        rows = mirror.query(
+            "SELECT project_id, COUNT(*) AS n FROM tasks GROUP BY project_id"
+        )
+    ```
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from pyticktick.models.v2.models import TaskV2
+from pyticktick.models.v2.parameters.closed import GetClosedV2
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+    from typing_extensions import Self
+
+    from pyticktick.client import Client
+    from pyticktick.models.v2.models import ProjectGroupV2, ProjectV2, TagV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_groups (
+    id TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    name TEXT NOT NULL,
+    sort_order INTEGER,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    name TEXT NOT NULL,
+    group_id TEXT,
+    kind TEXT,
+    color TEXT,
+    view_mode TEXT,
+    sort_order INTEGER,
+    modified_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_group_id ON projects (group_id);
+CREATE TABLE IF NOT EXISTS tags (
+    name TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    label TEXT NOT NULL,
+    raw_name TEXT,
+    parent TEXT,
+    color TEXT,
+    sort_order INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_parent ON tags (parent);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    parent_id TEXT,
+    title TEXT,
+    content TEXT,
+    "desc" TEXT,
+    kind TEXT,
+    status INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    is_all_day INTEGER,
+    start_date TEXT,
+    due_date TEXT,
+    completed_time TEXT,
+    created_time TEXT,
+    modified_time TEXT,
+    time_zone TEXT,
+    repeat_flag TEXT,
+    sort_order INTEGER,
+    closed INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_project_id ON tasks (project_id);
+CREATE INDEX IF NOT EXISTS tasks_parent_id ON tasks (parent_id);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS tasks_completed_time ON tasks (completed_time);
+CREATE TABLE IF NOT EXISTS task_items (
+    id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    title TEXT,
+    status INTEGER,
+    start_date TEXT,
+    completed_time TEXT,
+    sort_order INTEGER
+);
+CREATE INDEX IF NOT EXISTS task_items_task_id ON task_items (task_id);
+CREATE TABLE IF NOT EXISTS task_reminders (
+    task_id TEXT NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    id TEXT,
+    "trigger" TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS task_reminders_task_id ON task_reminders (task_id);
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id TEXT NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    tag_name TEXT NOT NULL,
+    PRIMARY KEY (task_id, tag_name)
+);
+CREATE INDEX IF NOT EXISTS task_tags_tag_name ON task_tags (tag_name);
+"""
+
+# SQLite limits the number of parameters of a statement, 999 before version 3.32.
+_MAX_PARAMETERS = 500
+_CHECK_POINT_KEY = "check_point"
+_CLOSED_UNTIL_KEY = "closed_until"
+
+
+def _dt(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+class Mirror:
+    """SQLite-backed local copy of a TickTick account.
+
+    The mirror stores projects, project groups, tags, tasks, checklist items, task
+    reminders, and task tags in their own tables. Each row also stores the full JSON
+    of the object it came from in the `data` column, keyed by the snake_case field
+    names of its model rather than the camelCase keys of the API, so the original model
+    can be rebuilt with [`get_task`](#pyticktick.mirror.Mirror.get_task) without
+    another request.
+
+    Open tasks are stored with `closed = 0`, while completed and abandoned tasks,
+    whether they come from the closed history or were closed in a delta batch, are
+    stored with `closed = 1`.
+
+    Attributes:
+        connection (sqlite3.Connection): The underlying SQLite connection.
+    """
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        """Open, and if necessary create, a mirror database.
+
+        Args:
+            path (str | Path): The path to the SQLite database. Defaults to
+                `:memory:`, which keeps the mirror in memory.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:  # noqa: D105
+        return self
+
+    def __exit__(self, *args: object) -> None:  # noqa: D105
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.connection.close()
+
+    def _get_state(self, key: str) -> str | None:
+        row = self.connection.execute(
+            "SELECT value FROM sync_state WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return None if row is None else row["value"]
+
+    def _set_state(self, key: str, value: str) -> None:
+        self.connection.execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @property
+    def check_point(self) -> int:
+        """The `check_point` of the last batch applied to the mirror, `0` if none."""
+        value = self._get_state(_CHECK_POINT_KEY)
+        return 0 if value is None else int(value)
+
+    @property
+    def closed_until(self) -> datetime | None:
+        """The time up to which the closed task history has been synced."""
+        value = self._get_state(_CLOSED_UNTIL_KEY)
+        return None if value is None else datetime.fromisoformat(value)
+
+    def _replace_project_groups(self, project_groups: Sequence[ProjectGroupV2]) -> None:
+        self.connection.execute("DELETE FROM project_groups")
+        self.connection.executemany(
+            "INSERT INTO project_groups (id, etag, name, sort_order, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    pg.id,
+                    pg.etag,
+                    pg.name,
+                    pg.sort_order,
+                    pg.model_dump_json(),
+                )
+                for pg in project_groups
+            ],
+        )
+
+    def _replace_projects(self, projects: Sequence[ProjectV2]) -> None:
+        self.connection.execute("DELETE FROM projects")
+        self.connection.executemany(
+            "INSERT INTO projects (id, etag, name, group_id, kind, color, view_mode, "
+            "sort_order, modified_time, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    p.id,
+                    p.etag,
+                    p.name,
+                    p.group_id,
+                    p.kind,
+                    None if p.color is None else str(p.color),
+                    p.view_mode,
+                    p.sort_order,
+                    _dt(p.modified_time),
+                    p.model_dump_json(),
+                )
+                for p in projects
+            ],
+        )
+
+    def _replace_tags(self, tags: Sequence[TagV2]) -> None:
+        self.connection.execute("DELETE FROM tags")
+        self.connection.executemany(
+            "INSERT INTO tags (name, etag, label, raw_name, parent, color, sort_order, "
+            "data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    t.name,
+                    t.etag,
+                    t.label,
+                    t.raw_name,
+                    t.parent,
+                    None if t.color is None else str(t.color),
+                    t.sort_order,
+                    t.model_dump_json(),
+                )
+                for t in tags
+            ],
+        )
+
+    def _delete_tasks(self, task_ids: Iterable[str]) -> None:
+        self.connection.executemany(
+            "DELETE FROM tasks WHERE id = ?",
+            [(id_,) for id_ in task_ids],
+        )
+
+    def _delete_missing_tasks(self, task_ids: Iterable[str]) -> None:
+        # The IDs of a full batch are loaded into a temporary table, so that the active
+        # tasks missing from it are deleted in a single statement, without reading the
+        # table while deleting from it.
+        conn = self.connection
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS batch_ids (id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM batch_ids")
+        conn.executemany(
+            "INSERT OR IGNORE INTO batch_ids (id) VALUES (?)",
+            [(id_,) for id_ in task_ids],
+        )
+        conn.execute(
+            "DELETE FROM tasks "
+            "WHERE closed = 0 AND id NOT IN (SELECT id FROM batch_ids)",
+        )
+        conn.execute("DELETE FROM batch_ids")
+
+    def _stored_etags(self, task_ids: Sequence[str]) -> dict[str, str]:
+        # Only the rows of the given tasks are read, so that applying a small delta
+        # does not scan the whole table.
+        etags = {}
+        for i in range(0, len(task_ids), _MAX_PARAMETERS):
+            chunk = task_ids[i : i + _MAX_PARAMETERS]
+            placeholders = ", ".join("?" * len(chunk))
+            etags.update(
+                (row["id"], row["etag"])
+                for row in self.connection.execute(
+                    f"SELECT id, etag FROM tasks WHERE id IN ({placeholders})",  # noqa: S608
+                    chunk,
+                )
+            )
+        return etags
+
+    def _upsert_tasks(self, tasks: Iterable[TaskV2]) -> int:
+        """Insert or update tasks in the mirror.
+
+        Tasks whose `etag` matches the stored row are skipped, so re-applying the same
+        tasks is cheap. The checklist items, reminders, and tags of a changed task are
+        replaced along with it. Tasks are marked as closed based on their `status`.
+
+        Args:
+            tasks (Iterable[TaskV2]): The tasks to insert or update.
+
+        Returns:
+            int: The number of tasks that were inserted or updated.
+        """
+        tasks = list(tasks)
+        etags = self._stored_etags([t.id for t in tasks])
+        changed = [t for t in tasks if etags.get(t.id) != t.etag]
+        if not changed:
+            return 0
+
+        self._delete_tasks(t.id for t in changed)
+        self.connection.executemany(
+            "INSERT INTO tasks (id, etag, project_id, parent_id, title, content, "
+            '"desc", kind, status, priority, is_all_day, start_date, due_date, '
+            "completed_time, created_time, modified_time, time_zone, repeat_flag, "
+            "sort_order, closed, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    t.id,
+                    t.etag,
+                    t.project_id,
+                    t.parent_id,
+                    t.title,
+                    t.content,
+                    t.desc,
+                    t.kind,
+                    t.status,
+                    t.priority,
+                    t.is_all_day,
+                    _dt(t.start_date),
+                    _dt(t.due_date),
+                    _dt(t.completed_time),
+                    _dt(t.created_time),
+                    _dt(t.modified_time),
+                    t.time_zone,
+                    t.repeat_flag,
+                    t.sort_order,
+                    int(t.status != 0),
+                    t.model_dump_json(),
+                )
+                for t in changed
+            ],
+        )
+        self.connection.executemany(
+            "INSERT INTO task_items (id, task_id, title, status, start_date, "
+            "completed_time, sort_order) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    i.id,
+                    t.id,
+                    i.title,
+                    i.status,
+                    i.start_date,
+                    i.completed_time,
+                    i.sort_order,
+                )
+                for t in changed
+                for i in t.items
+            ],
+        )
+        self.connection.executemany(
+            'INSERT INTO task_reminders (task_id, id, "trigger") VALUES (?, ?, ?)',
+            [(t.id, r.id, r.trigger) for t in changed for r in t.reminders or []],
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO task_tags (task_id, tag_name) VALUES (?, ?)",
+            [(t.id, tag) for t in changed for tag in t.tags],
+        )
+        return len(changed)
+
+    def apply_batch(self, batch: GetBatchV2, *, full: bool = False) -> None:
+        """Apply a batch response to the mirror.
+
+        Projects, project groups, and tags are always returned in full by the V2 API,
+        so they are replaced outright. Tasks are upserted by `etag`, and tasks listed
+        in `sync_task_bean.delete` are removed.
+
+        Args:
+            batch (GetBatchV2): The batch response to apply.
+            full (bool): Whether `batch` holds the full state of the account, i.e. it
+                was requested with a `check_point` of `0`. If so, active tasks missing
+                from the batch are removed as well. Defaults to `False`.
+        """
+        with self.connection:
+            self._replace_project_groups(batch.project_groups or [])
+            self._replace_projects(batch.project_profiles)
+            self._replace_tags(batch.tags)
+
+            tasks = batch.sync_task_bean.update
+            if full:
+                self._delete_missing_tasks(t.id for t in tasks)
+            self._delete_tasks(batch.sync_task_bean.deleted_ids)
+            changed = self._upsert_tasks(tasks)
+            self._set_state(_CHECK_POINT_KEY, str(batch.check_point))
+
+        logger.debug(
+            f"Applied batch at check point {batch.check_point}, "
+            f"{changed} of {len(tasks)} tasks changed",
+        )
+
+    def apply_closed(self, tasks: Iterable[TaskV2], until: datetime) -> None:
+        """Apply a window of the closed task history to the mirror.
+
+        Args:
+            tasks (Iterable[TaskV2]): The closed tasks to insert or update.
+            until (datetime): The end of the synced window, the next closed task sync
+                will start from here.
+        """
+        with self.connection:
+            self._upsert_tasks(tasks)
+            self._set_state(_CLOSED_UNTIL_KEY, _dt(until) or "")
+
+    def sync(self, client: Client, *, closed: bool = True) -> None:
+        """Bring the mirror up to date with the account.
+
+        The first sync downloads the full account. Each later sync only requests the
+        changes since the stored `check_point`, and the closed task history since the
+        last closed task sync.
+
+        Args:
+            client (Client): The client used to request the changes.
+            closed (bool): Whether to also sync the closed task history. Defaults to
+                `True`.
+        """
+        check_point = self.check_point
+        batch = client.get_batch_v2(check_point=check_point)
+        self.apply_batch(batch, full=check_point == 0)
+
+        if closed:
+            now = datetime.now(tz=timezone.utc)
+            tasks: list[TaskV2] = []
+            for status in ("Completed", "Abandoned"):
+                resp = client.get_project_all_closed_v2(
+                    GetClosedV2(from_=self.closed_until, to=now, status=status),
+                )
+                tasks.extend(resp.root)
+            self.apply_closed(tasks, until=now)
+
+    def query(
+        self,
+        sql: str,
+        parameters: Sequence[Any] | dict[str, Any] = (),
+    ) -> list[sqlite3.Row]:
+        """Run a read query against the mirror.
+
+        Args:
+            sql (str): The SQL query to run.
+            parameters (Sequence[Any] | dict[str, Any]): The parameters of the query.
+
+        Returns:
+            list[sqlite3.Row]: The rows returned by the query.
+        """
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def get_task(self, task_id: str) -> TaskV2 | None:
+        """Rebuild a task model from the mirror.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            TaskV2 | None: The task, or `None` if it is not in the mirror.
+        """
+        row = self.connection.execute(
+            "SELECT data FROM tasks WHERE id = ?",
+            (task_id,),
+        ).fetchone()
+        return None if row is None else TaskV2.model_validate_json(row["data"])
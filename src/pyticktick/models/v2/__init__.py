@@ -23,6 +23,7 @@ from pyticktick.models.v2.parameters.project_group import (
 from pyticktick.models.v2.parameters.tag import (
     CreateTagV2,
     DeleteTagV2,
+    MergeTagV2,
     PostBatchTagV2,
     RenameTagV2,
     UpdateTagV2,
@@ -88,6 +89,7 @@ __all__ = [
     "ICalTrigger",
     "ItemV2",
     "Kind",
+    "MergeTagV2",
     "ObjectId",
     "PostBatchProjectGroupV2",
     "PostBatchProjectV2",
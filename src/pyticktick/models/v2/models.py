@@ -38,6 +38,7 @@ from pyticktick.models.v2.types import (
     TimeZoneName,
     TTRRule,
 )
+from pyticktick.pydantic import intern_value
 
 
 class BaseModelV2(BaseModel):
@@ -83,6 +84,38 @@ class BaseModelV2(BaseModel):
             return None
         return v
 
+    @field_validator(
+        "column_id",
+        "creator",
+        "group_id",
+        "parent",
+        "project_id",
+        "repeat_flag",
+        "tags",
+        "time_zone",
+        mode="after",
+        check_fields=False,
+    )
+    @classmethod
+    def intern_shared_values(cls, v: Any) -> Any:
+        """Deduplicate values that are repeated across many objects.
+
+        A batch response repeats the same project IDs, time zones, tag names, repeat
+        flags, and creator IDs across thousands of tasks. This validator replaces them
+        with shared instances, using
+        [`intern_value`](../../pydantic.md#pyticktick.pydantic.intern_value), so that
+        each distinct value is only stored once in memory. Fields that are mostly
+        unique, like IDs, names, and parent task IDs, are left alone, as they would
+        only churn the cache.
+
+        Args:
+            v (Any): The validated value.
+
+        Returns:
+            Any: An equal value, shared with the other equal values.
+        """
+        return intern_value(v)
+
     @model_validator(mode="wrap")
     @classmethod
     def override_forbid_extra_message_injector(
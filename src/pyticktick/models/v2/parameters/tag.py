@@ -130,6 +130,22 @@ class RenameTagV2(BaseModelV2):
     )
 
 
+class MergeTagV2(BaseModelV2):
+    """Model for merging a tag into another tag via the V2 API.
+
+    This model is used to merge a tag via the V2 API endpoint `PUT /tag/merge`. All the
+    tasks tagged with `name` are tagged with `new_name` instead, and the `name` tag is
+    removed. This is not currently documented or supported in the official API docs.
+    """
+
+    # required fields
+    name: TagName = Field(description="Identifier of the tag to merge")
+    new_name: TagName = Field(
+        description="Identifier of the tag to merge into",
+        serialization_alias="newName",
+    )
+
+
 class DeleteTagV2(BaseModelV2):
     """Model for deleting a tag via the V2 API.
 
@@ -85,6 +85,18 @@ class SyncTaskBeanV2(BaseModelV2):
     empty: bool
     tag_update: list[Any] = Field(validation_alias="tagUpdate")
 
+    @property
+    def deleted_ids(self) -> list[str]:
+        """List of the IDs of all the tasks deleted since the requested checkpoint."""
+        ids = []
+        for item in self.delete:
+            if isinstance(item, dict):
+                if (id_ := item.get("taskId", item.get("id"))) is not None:
+                    ids.append(str(id_))
+            else:
+                ids.append(str(item))
+        return ids
+
 
 class SyncTaskOrderBeanV2(BaseModelV2):
     """Unknown model for the V2 API."""
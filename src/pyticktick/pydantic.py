@@ -8,11 +8,22 @@
 
 from __future__ import annotations
 
+import math
+import sys
 import types
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from inspect import isclass
-from typing import Any, Union, get_origin
+from typing import TYPE_CHECKING, Any, TypeVar, Union, get_origin
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_LIST_ADAPTERS: dict[type[BaseModel], tuple[Any, TypeAdapter[Any]]] = {}
 
 
 # https://discuss.python.org/t/how-to-check-if-a-type-annotation-represents-an-union/77692
@@ -30,6 +41,40 @@ def _issubclass_safe(
         return False
 
 
+@lru_cache(maxsize=4096, typed=True)
+def _shared(value: Any) -> Any:  # noqa: ANN401
+    return value
+
+
+def intern_value(value: Any) -> Any:  # noqa: ANN401
+    """Deduplicate a value that is likely to be repeated across many models.
+
+    Fields like project IDs, time zones, tag names, and repeat flags hold the same
+    value across thousands of tasks, but each occurrence in an API response is a
+    separate Python object. This function returns a shared instance for equal values,
+    so that the duplicates can be freed once the response has been validated.
+
+    Hashable values, including strings, are shared through a bounded cache of the most
+    recently used values. Strings are not passed to
+    [`sys.intern`](https://docs.python.org/3/library/sys.html#sys.intern), as interned
+    strings are never freed on Python 3.12+, which would make a long-running process
+    grow with every distinct value it has seen. Lists are deduplicated item by item,
+    and unhashable values are returned as is.
+
+    Args:
+        value (Any): The value to deduplicate.
+
+    Returns:
+        Any: An equal value, shared with the other equal values.
+    """
+    if isinstance(value, list):
+        return [intern_value(v) for v in value]
+    try:
+        return _shared(value)
+    except TypeError:
+        return value
+
+
 def _check_field_for_submodel(
     annotation: type[Any] | None,
     **config_kwargs: Any,  # noqa: ANN401
@@ -98,3 +143,134 @@ def update_model_config(model: type[BaseModel], **config_kwargs: Any) -> None:
         ConfigDict(**config_kwargs)  # type: ignore[typeddict-item] # ty: ignore[unused-ignore-comment]
     )
     model.model_rebuild(force=True)
+
+
+def list_adapter(model: type[ModelT]) -> TypeAdapter[list[ModelT]]:
+    """Get a cached `TypeAdapter` that validates a list of objects into models.
+
+    Validating a list response through a `RootModel`, like
+    [`ClosedRespV2`](models/v2/responses/closed.md#pyticktick.models.v2.responses.closed.ClosedRespV2),
+    builds a wrapper object that callers then unwrap. The adapter validates straight
+    into a plain `list`, and is built once per model, as building it generates a core
+    schema.
+
+    The adapter is rebuilt when the model is, so that overrides applied with
+    [`update_model_config`](pydantic.md#pyticktick.pydantic.update_model_config), like
+    `extra="allow"`, also apply to the lists it validates.
+
+    Args:
+        model (type[ModelT]): The Pydantic model to validate each object into.
+
+    Returns:
+        TypeAdapter[list[ModelT]]: The adapter for a list of `model`.
+    """
+    validator = model.__pydantic_validator__
+    cached = _LIST_ADAPTERS.get(model)
+    if cached is None or cached[0] is not validator:
+        cached = _LIST_ADAPTERS[model] = (validator, TypeAdapter(list[model]))
+    return cached[1]
+
+
+def _validate_chunk(
+    model: type[ModelT],
+    chunk: Sequence[Any],
+    config_kwargs: dict[str, Any],
+) -> list[ModelT] | None:
+    # Worker processes do not share the model config of the main process, so any
+    # override, like `extra="allow"`, needs to be applied again.
+    if any(model.model_config.get(k) != v for k, v in config_kwargs.items()):
+        update_model_config(model, **config_kwargs)
+    try:
+        return [model.model_validate(item) for item in chunk]
+    except ValidationError:
+        return None
+
+
+def validation_executor(workers: int) -> Executor:
+    """Create a pool of workers to validate models with.
+
+    The pool can be passed to
+    [`validate_in_parallel`](pydantic.md#pyticktick.pydantic.validate_in_parallel)
+    and reused across calls, so that the cost of starting the workers is only paid
+    once. Free-threaded interpreters (3.13+) get a pool of threads, which avoids
+    pickling the data and the models between processes, and other interpreters get a
+    pool of processes.
+
+    Args:
+        workers (int): The number of workers.
+
+    Returns:
+        Executor: The pool, which the caller is responsible for shutting down.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is not None and not is_gil_enabled():
+        return ThreadPoolExecutor(workers)
+    return ProcessPoolExecutor(workers)
+
+
+def validate_in_parallel(  # noqa: PLR0913
+    model: type[ModelT],
+    data: Sequence[Any],
+    workers: int,
+    *,
+    min_chunk_size: int = 1000,
+    executor: Executor | None = None,
+    revalidate_failed: bool = True,
+    **config_kwargs: Any,  # noqa: ANN401
+) -> list[ModelT]:
+    """Validate a list of objects into Pydantic models, across a pool of workers.
+
+    Validating tens of thousands of models, each with their own custom validators, is
+    CPU-bound. This function splits `data` into chunks, validates each chunk in a
+    separate worker, and reassembles the models in the original order.
+
+    If an object fails validation, only the chunks that failed are validated again in
+    the current process, so that the raised error is exactly the one that validating
+    the list without workers would raise, with the index of the object in `data`.
+
+    Args:
+        model (type[ModelT]): The Pydantic model to validate each object into.
+        data (Sequence[Any]): The objects to validate.
+        workers (int): The number of workers. Lists that are too small to be split, or
+            a single worker, are validated in the current process.
+        min_chunk_size (int): The minimum number of objects sent to a worker at once.
+            Defaults to `1000`.
+        executor (Executor | None): The pool to validate the chunks in, like one
+            created with
+            [`validation_executor`](pydantic.md#pyticktick.pydantic.validation_executor).
+            Defaults to `None`, which starts a pool for this call only.
+        revalidate_failed (bool): Whether to validate the chunks that failed again in
+            the current process, to raise their error. If `False`, the objects of
+            those chunks are returned as is, among the models of the other chunks, so
+            that the caller can validate them as part of a larger model, which reports
+            the error with its full location. Defaults to `True`.
+        **config_kwargs (Any): Model config overrides to apply in the workers, like the
+            ones applied with
+            [`update_model_config`](pydantic.md#pyticktick.pydantic.update_model_config)
+            in the current process.
+
+    Returns:
+        list[ModelT]: The validated models, in the same order as `data`.
+    """  # noqa: DOC502
+    chunk_size = max(min_chunk_size, math.ceil(len(data) / (workers * 4)))
+    if workers <= 1 or len(data) <= chunk_size:
+        return list_adapter(model).validate_python(data)
+
+    chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+    args = ([model] * len(chunks), chunks, [config_kwargs] * len(chunks))
+    if executor is None:
+        with validation_executor(min(workers, len(chunks))) as pool:
+            results = list(pool.map(_validate_chunk, *args))
+    else:
+        results = list(executor.map(_validate_chunk, *args))
+
+    items: list[Any] = []
+    failed = False
+    for chunk, result in zip(chunks, results, strict=True):
+        failed = failed or result is None
+        items.extend(chunk if result is None else result)
+    if failed and revalidate_failed:
+        # Validated models are passed through as is, so only the failed chunks are
+        # validated again.
+        return list_adapter(model).validate_python(items)
+    return items
@@ -0,0 +1,272 @@
+"""Expansion of TickTick repeat flags into occurrences.
+
+This module turns a [`TTRRule`](models/v2/types.md#pyticktick.models.v2.types.TTRRule),
+the `repeat_flag` of a task, into the actual dates the task repeats on. The standard
+parts of the rule are evaluated by
+[dateutil](https://dateutil.readthedocs.io/en/stable/rrule.html), while the TickTick
+extensions are evaluated here:
+
+- `TT_SKIP=WEEKEND`: occurrences that fall on a Saturday or Sunday are skipped.
+- `TT_WORKDAY=1` / `TT_WORKDAY=-1`: the task repeats on the first or last weekday of
+    the period, instead of on a day of the month.
+- `ERULE:NAME=CUSTOM;BYDATE=...`: the task repeats on an explicit list of dates.
+
+Parsing a rule is far more expensive than evaluating it, so compiled rules are cached
+and shared between all the tasks with the same repeat flag. Occurrences are computed
+in the wall clock time of the start date, so that a task repeating at 9:00 keeps doing
+so across daylight saving time changes.
+
+!!! example
+    ```python
+    from datetime import datetime, timedelta, timezone
+
+    from pyticktick import Client
+    from pyticktick.recurrence import expand_tasks
+
+    client = Client()
+    now = datetime.now(tz=timezone.utc)
+    tasks = client.get_batch_v2().sync_task_bean.update
+    for task_id, occurrences in expand_tasks(
+        tasks, now, now + timedelta(days=30)
+    ).items():
+        print(task_id, occurrences)
+    ```
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.rrule import rrule, rrulestr
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import tzinfo
+
+    from pyticktick.models.v2.models import TaskV2
+
+_WEEKDAYS = "MO,TU,WE,TH,FR"
+_WEEKEND = frozenset({5, 6})
+
+
+class CompiledRule(NamedTuple):
+    """A TickTick repeat flag, parsed once and ready to be expanded from any start."""
+
+    rule: rrule | None
+    """The standard part of the rule, or `None` for an `ERULE`."""
+    dates: tuple[date, ...]
+    """The explicit dates of an `ERULE`, sorted, or empty for an `RRULE`."""
+    skip_weekend: bool
+    """Whether occurrences on a Saturday or Sunday are skipped."""
+    period: timedelta | None = None
+    """The length of one period of the rule, if the start can be moved by whole periods
+    without changing the occurrences."""
+
+
+def _compile_erule(rule: str) -> CompiledRule:
+    for part in rule.removeprefix("ERULE:").split(";"):
+        if part.startswith("BYDATE="):
+            try:
+                dates = sorted(
+                    datetime.strptime(d, "%Y%m%d").date()  # noqa: DTZ007
+                    for d in part.removeprefix("BYDATE=").split(",")
+                )
+            except ValueError as e:
+                msg = f"Invalid TickTick RRULE: {rule}"
+                raise ValueError(msg) from e
+            return CompiledRule(None, tuple(dates), skip_weekend=False)
+    msg = f"Invalid TickTick RRULE: {rule}"
+    raise ValueError(msg)
+
+
+def _period(parts: list[str]) -> timedelta | None:
+    # Daily and weekly periods have a fixed length, so a start moved forward by whole
+    # periods yields the same occurrences, unless they are counted from the start.
+    # Monthly and yearly periods are not fixed, and the start also sets their day.
+    keys = dict(part.split("=", 1) for part in parts if "=" in part)
+    if "COUNT" in keys or not keys.get("INTERVAL", "1").isdigit():
+        return None
+    days = {"DAILY": 1, "WEEKLY": 7}.get(keys.get("FREQ", ""))
+    if days is None:
+        return None
+    return timedelta(days=days * max(int(keys.get("INTERVAL", "1")), 1))
+
+
+@lru_cache(maxsize=4096)
+def compile_tt_rrule(rule: str) -> CompiledRule:
+    """Parse a TickTick repeat flag, including its TickTick extensions.
+
+    The result is cached, so compiling the same rule again is a dictionary lookup.
+
+    Args:
+        rule (str): The TickTick repeat flag, as stored in `TaskV2.repeat_flag`.
+
+    Returns:
+        CompiledRule: The compiled rule.
+
+    Raises:
+        ValueError: If the rule is invalid.
+    """
+    if rule.startswith("ERULE:"):
+        return _compile_erule(rule)
+
+    skip_weekend = False
+    workday = None
+    parts = []
+    for part in rule.removeprefix("RRULE:").split(";"):
+        if part == "TT_SKIP=WEEKEND":
+            skip_weekend = True
+        elif part in {"TT_WORKDAY=1", "TT_WORKDAY=-1"}:
+            workday = part.removeprefix("TT_WORKDAY=")
+        elif part:
+            parts.append(part)
+    if workday is not None:
+        parts = [p for p in parts if not p.startswith(("BYMONTHDAY=", "BYDAY="))]
+        parts += [f"BYDAY={_WEEKDAYS}", f"BYSETPOS={workday}"]
+    period = _period(parts)
+
+    try:
+        compiled = rrulestr(";".join(parts), ignoretz=True, cache=False)
+    except ValueError as e:
+        msg = f"Invalid TickTick RRULE: {rule}"
+        raise ValueError(msg) from e
+    if not isinstance(compiled, rrule):
+        msg = f"Invalid TickTick RRULE: {rule}"
+        raise ValueError(msg)  # noqa: TRY004
+    return CompiledRule(compiled, (), skip_weekend, period)
+
+
+def _wall(dt: datetime, tz: tzinfo | None) -> datetime:
+    if dt.tzinfo is not None and tz is not None:
+        dt = dt.astimezone(tz)
+    return dt.replace(tzinfo=None)
+
+
+def _candidates(
+    compiled: CompiledRule,
+    dtstart: datetime,
+    start: datetime | None,
+) -> Iterator[datetime]:
+    if compiled.rule is None:
+        time = dtstart.time()
+        return (
+            datetime.combine(d, time)
+            for d in compiled.dates
+            if d >= dtstart.date() and (start is None or d >= start.date())
+        )
+    if start is not None and start > dtstart and compiled.period is not None:
+        dtstart += (start - dtstart) // compiled.period * compiled.period
+    rule = compiled.rule.replace(dtstart=dtstart)
+    if start is not None and start > dtstart:
+        return rule.xafter(start, inc=True)
+    return iter(rule)
+
+
+def expand_tt_rrule(
+    rule: str | CompiledRule,
+    dtstart: datetime,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    count: int | None = None,
+) -> list[datetime]:
+    """Get the occurrences of a TickTick repeat flag.
+
+    Occurrences are computed in the wall clock time of `dtstart`, and returned in the
+    same time zone. Like in dateutil, `dtstart` itself is only an occurrence if it
+    matches the rule.
+
+    Args:
+        rule (str | CompiledRule): The TickTick repeat flag, or an already compiled
+            one.
+        dtstart (datetime): The start of the recurrence, usually the start date of the
+            task.
+        start (datetime | None): If set, only return occurrences at or after it.
+        end (datetime | None): If set, only return occurrences before it.
+        count (int | None): If set, return at most this many occurrences.
+
+    Returns:
+        list[datetime]: The occurrences, in chronological order.
+
+    Raises:
+        ValueError: If neither `end` nor `count` is set, or if the rule is invalid.
+    """
+    if end is None and count is None:
+        msg = "Either `end` or `count` must be set to expand a repeat flag"
+        logger.error(msg)
+        raise ValueError(msg)
+    compiled = compile_tt_rrule(rule) if isinstance(rule, str) else rule
+
+    tz = dtstart.tzinfo
+    local_start = _wall(dtstart, tz)
+    window_start = None if start is None else _wall(start, tz)
+    window_end = None if end is None else _wall(end, tz)
+
+    occurrences: list[datetime] = []
+    for occurrence in _candidates(compiled, local_start, window_start):
+        if window_end is not None and occurrence >= window_end:
+            break
+        if (compiled.skip_weekend and occurrence.weekday() in _WEEKEND) or (
+            window_start is not None and occurrence < window_start
+        ):
+            continue
+        occurrences.append(occurrence.replace(tzinfo=tz))
+        if count is not None and len(occurrences) >= count:
+            break
+    return occurrences
+
+
+def _task_start(task: TaskV2) -> datetime | None:
+    dtstart = task.start_date or task.due_date
+    if dtstart is None or task.time_zone is None or dtstart.tzinfo is None:
+        return dtstart
+    try:
+        return dtstart.astimezone(ZoneInfo(task.time_zone))
+    except ZoneInfoNotFoundError:
+        return dtstart
+
+
+def expand_tasks(
+    tasks: Iterable[TaskV2],
+    start: datetime,
+    end: datetime,
+    *,
+    count: int | None = None,
+) -> dict[str, list[datetime]]:
+    """Get the occurrences of many recurring tasks over the same window.
+
+    Each task repeats from its start date, or its due date if it has no start date,
+    in its own time zone. Tasks without a repeat flag or without a date are skipped,
+    as are tasks with an invalid repeat flag, which are logged as a warning instead.
+
+    Args:
+        tasks (Iterable[TaskV2]): The tasks to expand.
+        start (datetime): Only return occurrences at or after this time.
+        end (datetime): Only return occurrences before this time.
+        count (int | None): If set, return at most this many occurrences per task.
+
+    Returns:
+        dict[str, list[datetime]]: The occurrences of each recurring task, keyed by
+            the task ID.
+    """
+    expanded: dict[str, list[datetime]] = {}
+    for task in tasks:
+        if task.repeat_flag is None or (dtstart := _task_start(task)) is None:
+            continue
+        try:
+            compiled = compile_tt_rrule(task.repeat_flag)
+        except ValueError:
+            logger.warning(f"Skipping task `{task.id}` with invalid repeat flag")
+            continue
+        expanded[task.id] = expand_tt_rrule(
+            compiled,
+            dtstart,
+            start=start,
+            end=end,
+            count=count,
+        )
+    return expanded
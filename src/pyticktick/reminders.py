@@ -0,0 +1,236 @@
+"""Schedule of the reminders of TickTick tasks.
+
+This module contains the `ReminderSchedule` class, which precomputes the absolute
+time that every reminder of a set of
+[`TaskV2`](models/v2/models.md#pyticktick.models.v2.models.TaskV2) objects fires at,
+and keeps them sorted. Questions like "which reminders fire in the next 15 minutes?"
+then become a binary search, instead of converting every
+[`ICalTrigger`](models/v2/types.md#pyticktick.models.v2.types.ICalTrigger) of every
+task again.
+
+Reminders of timed tasks are relative to the start date of the task, or its due date
+if it has no start date. Reminders of all-day tasks are relative to midnight of that
+date, in the time zone of the task. Only the current occurrence of a repeating task is
+scheduled, and reminders of tasks that are not active are ignored.
+
+!!! example
+    ```python
+    from datetime import timedelta
+
+    from pyticktick import Client
+    from pyticktick.reminders import ReminderSchedule
+
+    client = Client()
+    schedule = ReminderSchedule.from_batch(client.get_batch_v2())
+    for reminder in schedule.due_within(timedelta(minutes=15)):
+        print(reminder.fire_time, reminder.task_id)
+    ```
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from loguru import logger
+
+from pyticktick.models.v2.types import convert_ical_trigger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pyticktick.models.v2.models import TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+
+class Reminder(NamedTuple):
+    """A reminder of a task, along with the time it fires at."""
+
+    fire_time: datetime
+    task_id: str
+    trigger: str
+
+
+_trigger_delta = lru_cache(maxsize=1024)(convert_ical_trigger)
+
+
+@lru_cache(maxsize=256)
+def _zone(name: str | None) -> timezone | ZoneInfo:
+    if name is None:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        logger.warning(f"Unknown time zone `{name}`, using UTC instead")
+        return timezone.utc
+
+
+def _fire_times(task: TaskV2) -> list[tuple[float, str, str]]:
+    anchor = task.start_date or task.due_date
+    if anchor is None or task.status != 0:
+        return []
+    triggers = {r.trigger for r in task.reminders or []}
+    if not triggers and task.reminder is not None:
+        triggers.add(task.reminder)
+
+    tz = _zone(task.time_zone)
+    midnight = None
+    if task.is_all_day:
+        day = anchor.astimezone(tz).date() if anchor.tzinfo else anchor.date()
+        midnight = datetime.combine(day, time())
+
+    entries = []
+    for trigger in triggers:
+        try:
+            delta = _trigger_delta(trigger)
+        except (ValueError, TypeError):
+            logger.warning(f"Skipping invalid reminder `{trigger}` of task `{task.id}`")
+            continue
+        if delta is None:
+            continue
+        if midnight is not None:
+            # Offsets of all-day tasks are in wall clock time, like "9:00 am the day
+            # before", so they are applied before the time zone is.
+            fire_time = (midnight + delta).replace(tzinfo=tz)
+        else:
+            fire_time = anchor + delta
+        entries.append((fire_time.timestamp(), task.id, trigger))
+    return entries
+
+
+class ReminderSchedule:
+    """Reminders of a set of tasks, sorted by the time they fire at.
+
+    The schedule is kept sorted as tasks are added, updated, or removed, so that range
+    queries and next-due lookups are always a binary search away.
+    """
+
+    def __init__(self, tasks: Iterable[TaskV2] = ()) -> None:
+        """Build the schedule from a collection of tasks.
+
+        Args:
+            tasks (Iterable[TaskV2]): The tasks to schedule the reminders of.
+        """
+        self._by_task: dict[str, list[tuple[float, str, str]]] = {}
+        entries = []
+        for task in tasks:
+            task_entries = _fire_times(task)
+            if task_entries:
+                self._by_task[task.id] = task_entries
+                entries.extend(task_entries)
+        entries.sort()
+        self._entries: list[tuple[float, str, str]] = entries
+
+    @classmethod
+    def from_batch(cls, batch: GetBatchV2) -> ReminderSchedule:
+        """Build the schedule from all the active tasks in a batch response.
+
+        Args:
+            batch (GetBatchV2): The batch response to build the schedule from.
+
+        Returns:
+            ReminderSchedule: The schedule of all the reminders of active tasks.
+        """
+        return cls(batch.sync_task_bean.update)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._entries)
+
+    @staticmethod
+    def _reminder(entry: tuple[float, str, str]) -> Reminder:
+        return Reminder(datetime.fromtimestamp(entry[0], tz=timezone.utc), *entry[1:])
+
+    def upsert_task(self, task: TaskV2) -> None:
+        """Add the reminders of a task, replacing the ones it had before.
+
+        Args:
+            task (TaskV2): The task to add or update.
+        """
+        self.remove_task(task.id)
+        task_entries = _fire_times(task)
+        if task_entries:
+            self._by_task[task.id] = task_entries
+            for entry in task_entries:
+                insort(self._entries, entry)
+
+    def remove_task(self, task_id: str) -> None:
+        """Remove all the reminders of a task, if it has any.
+
+        Args:
+            task_id (str): The ID of the task to remove.
+        """
+        for entry in self._by_task.pop(task_id, ()):
+            del self._entries[bisect_left(self._entries, entry)]
+
+    def apply_batch(self, batch: GetBatchV2) -> None:
+        """Apply the task changes of a batch response, including delta responses.
+
+        Args:
+            batch (GetBatchV2): The batch response to apply.
+        """
+        for task in batch.sync_task_bean.update:
+            self.upsert_task(task)
+        for task_id in batch.sync_task_bean.deleted_ids:
+            self.remove_task(task_id)
+
+    def for_task(self, task_id: str) -> list[Reminder]:
+        """Get the reminders of a task.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            list[Reminder]: The reminders of the task, sorted by fire time.
+        """
+        return [self._reminder(e) for e in sorted(self._by_task.get(task_id, ()))]
+
+    def between(self, start: datetime, end: datetime) -> list[Reminder]:
+        """Get the reminders that fire in a time range.
+
+        Args:
+            start (datetime): The start of the range, inclusive.
+            end (datetime): The end of the range, exclusive.
+
+        Returns:
+            list[Reminder]: The reminders in the range, sorted by fire time.
+        """
+        lo = bisect_left(self._entries, (start.timestamp(),))
+        hi = bisect_left(self._entries, (end.timestamp(),), lo)
+        return [self._reminder(e) for e in self._entries[lo:hi]]
+
+    def due_within(
+        self,
+        window: timedelta,
+        now: datetime | None = None,
+    ) -> list[Reminder]:
+        """Get the reminders that fire within a window from now.
+
+        Args:
+            window (timedelta): The size of the window.
+            now (datetime | None): The start of the window, defaults to the current
+                time.
+
+        Returns:
+            list[Reminder]: The reminders in the window, sorted by fire time.
+        """
+        if now is None:
+            now = datetime.now(tz=timezone.utc)
+        return self.between(now, now + window)
+
+    def next_after(self, after: datetime | None = None) -> Reminder | None:
+        """Get the next reminder to fire.
+
+        Args:
+            after (datetime | None): Only consider reminders at or after this time,
+                defaults to the current time.
+
+        Returns:
+            Reminder | None: The next reminder, or `None` if there are none left.
+        """
+        if after is None:
+            after = datetime.now(tz=timezone.utc)
+        i = bisect_left(self._entries, (after.timestamp(),))
+        return self._reminder(self._entries[i]) if i < len(self._entries) else None
@@ -0,0 +1,223 @@
+"""Cache for the responses of TickTick endpoints that rarely change.
+
+The user profile, status, and statistics, as well as the list of projects, rarely
+change, but applications that call them on every page render send a request each time.
+This module contains a size-bounded cache that keeps their responses for a short time,
+and evicts the least recently used ones once it is full.
+
+The cache is disabled by default, and is enabled with the `response_cache` setting of
+the client. Each cached client method has its own time-to-live, which can be overridden
+with `ttls`, and cached responses are invalidated as soon as the same client sends a
+request that could change them, for example creating or updating a project
+invalidates the cached projects. Changes made by other clients, or in the TickTick
+apps, are only seen once the time-to-live has passed.
+
+The decoded JSON of the responses is cached, rather than the validated models, so that
+every call still returns a new model that can be safely modified.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.response_cache import ResponseCacheConfig
+
+    client = Client(
+        response_cache=ResponseCacheConfig(max_size=128, ttls={"get_projects_v1": 30}),
+    )
+    projects = client.get_projects_v1()
+    projects = client.get_projects_v1()  # served from the cache
+    print(client.cache_stats)
+    ```
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, NamedTuple
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field
+
+CACHE_GROUPS: dict[str, str] = {
+    "get_profile_v2": "user",
+    "get_status_v2": "user",
+    "get_statistics_v2": "statistics",
+    "get_projects_v1": "project",
+    "get_project_v1": "project",
+}
+"""The client methods that can be cached, and the group they are invalidated with."""
+
+DEFAULT_TTLS: dict[str, float] = {
+    "get_profile_v2": 300,
+    "get_status_v2": 60,
+    "get_statistics_v2": 60,
+    "get_projects_v1": 60,
+    "get_project_v1": 60,
+}
+"""The default time-to-live, in seconds, of the responses of each cached method."""
+
+
+class ResponseCacheConfig(BaseModel):
+    """Configuration of the response cache of the client."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_size: int = Field(
+        default=256,
+        ge=1,
+        description="The maximum number of responses to keep in the cache.",
+    )
+    ttls: dict[str, float] = Field(
+        default_factory=dict,
+        description="The time-to-live, in seconds, of each cached method, `0` to disable it.",  # noqa: E501
+    )
+
+    def ttl(self, method: str) -> float:
+        """Get the time-to-live of the responses of a client method.
+
+        Args:
+            method (str): The name of the client method, like `get_projects_v1`.
+
+        Returns:
+            float: The time-to-live, in seconds, `0` if the method is not cached.
+        """
+        return self.ttls.get(method, DEFAULT_TTLS.get(method, 0))
+
+
+class CacheStats(NamedTuple):
+    """Metrics of a response cache.
+
+    Attributes:
+        hits (int): The number of responses served from the cache.
+        misses (int): The number of responses requested from the API.
+        evictions (int): The number of responses evicted to make room for new ones.
+        invalidations (int): The number of responses invalidated by a mutation.
+        size (int): The number of responses currently in the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+
+class ResponseCache:
+    """Thread-safe, size-bounded LRU cache of API responses, with expiration."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): The maximum number of responses to keep in the cache.
+        """
+        self.max_size = max_size
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[str, ...], tuple[float, str, Any]] = (
+            OrderedDict()
+        )
+        self._generations: dict[str, int] = {}
+        self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get the hit, miss, eviction, and invalidation counts of the cache.
+
+        Returns:
+            CacheStats: The metrics of the cache.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def get(self, key: tuple[str, ...]) -> tuple[bool, Any]:
+        """Get a response from the cache.
+
+        Args:
+            key (tuple[str, ...]): The key of the response.
+
+        Returns:
+            tuple[bool, Any]: Whether the response was found and has not expired, and
+                the response if it was.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, entry[2]
+
+    def generation(self, group: str) -> int:
+        """Get the number of times a group has been invalidated.
+
+        Args:
+            group (str): The group, like `project`.
+
+        Returns:
+            int: The generation of the group, to pass to `set`.
+        """
+        with self._lock:
+            return self._generations.get(group, 0)
+
+    def set(
+        self,
+        key: tuple[str, ...],
+        value: Any,  # noqa: ANN401
+        group: str,
+        ttl: float,
+        generation: int | None = None,
+    ) -> None:
+        """Add a response to the cache, evicting the least recently used if full.
+
+        Args:
+            key (tuple[str, ...]): The key of the response.
+            value (Any): The response.
+            group (str): The group the response is invalidated with, like `project`.
+            ttl (float): The time-to-live of the response, in seconds.
+            generation (int | None): The generation of the group before the response
+                was requested. If the group has been invalidated since, the response
+                may be stale, and is not cached. Defaults to `None`, which always
+                caches the response.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generations.get(group, 0):
+                return
+            self._entries[key] = (monotonic() + ttl, group, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, *groups: str) -> None:
+        """Remove the responses of the given groups from the cache.
+
+        Args:
+            *groups (str): The groups to invalidate, like `project`.
+        """
+        with self._lock:
+            for group in groups:
+                self._generations[group] = self._generations.get(group, 0) + 1
+            keys = [k for k, (_, g, _) in self._entries.items() if g in groups]
+            for key in keys:
+                del self._entries[key]
+            self._invalidations += len(keys)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached responses of {groups}")
+
+    def clear(self) -> None:
+        """Remove every response from the cache, keeping the metrics."""
+        with self._lock:
+            self._entries.clear()
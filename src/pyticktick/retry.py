@@ -2,8 +2,10 @@
 
 This module contains the retry decorator for the TickTick API. This uses tenacity to
 provide the retry mechanism. Currently, this only retries for V1 API errors, and
-specifically for the `exceed_query_limit` error message. No other retriable errors are
-known as of now, but this can be expanded in the future.
+specifically for rate limiting errors, like the `exceed_query_limit` error code, which
+the client raises as a
+[`RateLimitedError`](exceptions.md#pyticktick.exceptions.RateLimitedError). No other
+retriable errors are known as of now, but this can be expanded in the future.
 
 !!! Example
     ```python
@@ -18,50 +20,99 @@ known as of now, but this can be expanded in the future.
 
 from __future__ import annotations
 
-import logging
 from typing import TYPE_CHECKING
 
 from tenacity import (
+    RetryCallState,
     WrappedFn,
-    before_sleep_log,
+    nap,
     retry,
-    retry_if_exception_message,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
 )
 
-from pyticktick.logger import _logger
+from pyticktick.deadline import check_deadline
+from pyticktick.exceptions import (
+    DEFAULT_MAX_RETRY_AFTER,
+    QUOTA_EXCEEDED_ERROR_CODE,
+    RateLimitedError,
+)
+from pyticktick.logger import before_sleep
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
 
+def _sleep_within_deadline(seconds: float) -> None:
+    check_deadline(seconds)
+    nap.sleep(seconds)
+
+
+def _is_rate_limited(error: BaseException) -> bool:
+    # Errors raised by the client are classified by type. Plain `ValueError`s, raised
+    # by code that predates the typed errors, are still matched on their message.
+    if isinstance(error, RateLimitedError):
+        return True
+    return type(error) is ValueError and QUOTA_EXCEEDED_ERROR_CODE in str(error)
+
+
+class _WaitRetryAfter(wait_exponential):
+    """Wait exponentially, or for the `Retry-After` of the response, if longer.
+
+    The `Retry-After` wait is capped to `max_retry_after` seconds, so that a response
+    cannot make the retries wait for an unbounded time.
+    """
+
+    def __init__(self, *, max_retry_after: float, **kwargs: float) -> None:
+        super().__init__(**kwargs)
+        self.max_retry_after = max_retry_after
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        wait = super().__call__(retry_state)
+        outcome = retry_state.outcome
+        error = None if outcome is None else outcome.exception()
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is None:
+            return wait
+        return max(wait, min(retry_after, self.max_retry_after))
+
+
 def retry_api_v1(
     attempts: int = 10,
     min_wait: float = 4,
     max_wait: float = 20,
+    max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
 ) -> Callable[[WrappedFn], WrappedFn]:
     """Retry decorator for the V1 API.
 
-    This decorator retries the function if the error message is `exceed_query_limit`.
-    The defaults have been set via trial and error, and may need to be adjusted
-    depending on the use case.
+    This decorator retries the function if it raises a `RateLimitedError`, or a plain
+    `ValueError` with the `exceed_query_limit` message. If the response had a
+    `Retry-After` header, the wait before the next attempt is at least that long, up to
+    `max_retry_after`. The defaults have been set via trial and error, and may need to
+    be adjusted depending on the use case. If a
+    [`deadline`](deadline.md#pyticktick.deadline.deadline) would pass during the wait
+    before the next attempt, a `DeadlineExceededError` is raised instead of waiting.
 
     Args:
         attempts (int): The number of attempts to make. Defaults to 10.
         min_wait (float): The minimum wait time between attempts. Defaults to 4.
         max_wait (float): The maximum wait time between attempts. Defaults to 20.
+        max_retry_after (float): The maximum wait time between attempts asked for by a
+            `Retry-After` header. Defaults to 300.
 
     Returns:
         Callable[[WrappedFn], WrappedFn]: The tenacity retry decorator.
     """
     return retry(
-        retry=(
-            retry_if_exception_type(ValueError)
-            & retry_if_exception_message(match=r"^.*exceed\_query\_limit.*$")
-        ),
+        retry=retry_if_exception(_is_rate_limited),
         stop=stop_after_attempt(attempts),
-        wait=wait_exponential(multiplier=1, min=min_wait, max=max_wait),
-        before_sleep=before_sleep_log(_logger, logging.INFO),  # ty: ignore[invalid-argument-type]
+        wait=_WaitRetryAfter(
+            multiplier=1,
+            min=min_wait,
+            max=max_wait,
+            max_retry_after=max_retry_after,
+        ),
+        before_sleep=before_sleep,
+        sleep=_sleep_within_deadline,
     )
@@ -0,0 +1,298 @@
+"""Full-text search over TickTick tasks.
+
+This module contains the `SearchIndex` class, an in-memory inverted index over the
+title, content, description, and checklist items of a set of
+[`TaskV2`](models/v2/models.md#pyticktick.models.v2.models.TaskV2) objects. Searching
+for a task by name or by any word in it then only looks at the tasks that contain the
+searched words, instead of scanning every task.
+
+Text is split into lowercase words. Every word of a query must match, and the last
+word also matches as a prefix, so that results can be shown while the query is being
+typed. Results are ranked with [BM25](https://en.wikipedia.org/wiki/Okapi_BM25), with
+words in the title weighing more than words in the rest of the task.
+
+The index can be kept up to date from batch deltas, and saved to and loaded from an
+SQLite database, as an [FTS5](https://www.sqlite.org/fts5.html) table.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.search import SearchIndex
+
+    client = Client()
+    index = SearchIndex.from_batch(client.get_batch_v2())
+    for hit in index.search("groc"):
+        print(hit.task_id, hit.score)
+    ```
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from pyticktick.models.v2.models import TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+_TOKEN = re.compile(r"\w+")
+_WEIGHTS = (3.0, 1.0, 1.0, 1.5)
+
+# BM25 parameters, with the usual defaults
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into the lowercase words used by the search index.
+
+    Args:
+        text (str | None): The text to split.
+
+    Returns:
+        list[str]: The words of the text, in order.
+    """
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+class SearchHit(NamedTuple):
+    """A task matching a search, along with its relevance score."""
+
+    task_id: str
+    score: float
+
+
+def _task_fields(task: TaskV2) -> tuple[str, str, str, str]:
+    return (
+        task.title or "",
+        task.content or "",
+        task.desc or "",
+        "\n".join(item.title or "" for item in task.items),
+    )
+
+
+class SearchIndex:
+    """Inverted index from words to the tasks that contain them.
+
+    Both active and closed tasks can be added to the index. Tasks are identified by
+    their ID, so adding a task again replaces it.
+    """
+
+    def __init__(self, tasks: Iterable[TaskV2] = ()) -> None:
+        """Build the index from a collection of tasks.
+
+        Args:
+            tasks (Iterable[TaskV2]): The tasks to index.
+        """
+        self._fields: dict[str, tuple[str, str, str, str]] = {}
+        self._terms: dict[str, dict[str, float]] = {}
+        self._lengths: dict[str, float] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._vocabulary: list[str] = []
+        self._total_length = 0.0
+        for task in tasks:
+            self.upsert_task(task)
+
+    @classmethod
+    def from_batch(
+        cls,
+        batch: GetBatchV2,
+        closed: Iterable[TaskV2] = (),
+    ) -> SearchIndex:
+        """Build the index from the active tasks in a batch response.
+
+        Args:
+            batch (GetBatchV2): The batch response to index.
+            closed (Iterable[TaskV2]): Closed tasks to index as well, for example from
+                [`get_project_all_closed_v2`](client/v2.md#pyticktick.client.Client.get_project_all_closed_v2).
+
+        Returns:
+            SearchIndex: The index of all the tasks.
+        """
+        index = cls(batch.sync_task_bean.update)
+        for task in closed:
+            index.upsert_task(task)
+        return index
+
+    def __contains__(self, task_id: object) -> bool:  # noqa: D105
+        return task_id in self._fields
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._fields)
+
+    def _add(self, task_id: str, fields: tuple[str, str, str, str]) -> None:
+        terms: Counter[str] = Counter()
+        for text, weight in zip(fields, _WEIGHTS, strict=True):
+            for token in tokenize(text):
+                terms[token] += weight
+
+        self._fields[task_id] = fields
+        self._terms[task_id] = dict(terms)
+        length = sum(terms.values())
+        self._lengths[task_id] = length
+        self._total_length += length
+        for token, frequency in terms.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[task_id] = frequency
+
+    def upsert_task(self, task: TaskV2) -> None:
+        """Add a task to the index, or update it.
+
+        Args:
+            task (TaskV2): The task to add or update.
+        """
+        fields = _task_fields(task)
+        if self._fields.get(task.id) == fields:
+            return
+        self.remove_task(task.id)
+        self._add(task.id, fields)
+
+    def remove_task(self, task_id: str) -> None:
+        """Remove a task from the index, if it is part of it.
+
+        Args:
+            task_id (str): The ID of the task to remove.
+        """
+        if task_id not in self._fields:
+            return
+        del self._fields[task_id]
+        self._total_length -= self._lengths.pop(task_id)
+        for token in self._terms.pop(task_id):
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def apply_batch(self, batch: GetBatchV2) -> None:
+        """Apply the task changes of a batch response, including delta responses.
+
+        Args:
+            batch (GetBatchV2): The batch response to apply.
+        """
+        for task in batch.sync_task_bean.update:
+            self.upsert_task(task)
+        for task_id in batch.sync_task_bean.deleted_ids:
+            self.remove_task(task_id)
+
+    def _expand(self, token: str) -> list[str]:
+        i = bisect_left(self._vocabulary, token)
+        expanded = []
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(token):
+            expanded.append(self._vocabulary[i])
+            i += 1
+        return expanded
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int | None = 20,
+        prefix: bool = True,
+    ) -> list[SearchHit]:
+        """Search for the tasks containing every word of a query.
+
+        Args:
+            query (str): The words to search for.
+            limit (int | None): The maximum number of results, or `None` for all of
+                them. Defaults to `20`.
+            prefix (bool): Whether the last word of the query also matches as a
+                prefix. Defaults to `True`.
+
+        Returns:
+            list[SearchHit]: The matching tasks, from the most to the least relevant.
+        """
+        tokens = tokenize(query)
+        if not tokens or not self._fields:
+            return []
+
+        n = len(self._fields)
+        average_length = self._total_length / n or 1.0
+        scores: dict[str, float] | None = None
+        for token in dict.fromkeys(tokens):
+            expanded = (
+                self._expand(token) if prefix and token == tokens[-1] else [token]
+            )
+            term_scores: dict[str, float] = {}
+            for term in expanded:
+                postings = self._postings.get(term, {})
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for task_id, frequency in postings.items():
+                    norm = _K1 * (1 - _B + _B * self._lengths[task_id] / average_length)
+                    term_scores[task_id] = term_scores.get(task_id, 0.0) + (
+                        idf * frequency * (_K1 + 1) / (frequency + norm)
+                    )
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    task_id: score + term_scores[task_id]
+                    for task_id, score in scores.items()
+                    if task_id in term_scores
+                }
+            if not scores:
+                return []
+
+        hits = sorted(
+            (SearchHit(task_id, score) for task_id, score in (scores or {}).items()),
+            key=lambda hit: (-hit.score, hit.task_id),
+        )
+        return hits if limit is None else hits[:limit]
+
+    def save(self, path: str | Path) -> None:
+        """Save the index to an SQLite database, as an FTS5 table.
+
+        The `tasks_fts` table holds one row per task, with the `task_id`, `title`,
+        `content`, `desc`, and `items` columns, and replaces any existing one. It can
+        also be queried directly with SQLite, using `MATCH`.
+
+        Args:
+            path (str | Path): The path to the SQLite database.
+        """
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS tasks_fts")
+                connection.execute(
+                    "CREATE VIRTUAL TABLE tasks_fts USING fts5(task_id UNINDEXED, "
+                    "title, content, desc, items, prefix = '2 3')",
+                )
+                connection.executemany(
+                    "INSERT INTO tasks_fts (task_id, title, content, desc, items) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(task_id, *fields) for task_id, fields in self._fields.items()],
+                )
+        finally:
+            connection.close()
+
+    @classmethod
+    def load(cls, path: str | Path) -> SearchIndex:
+        """Load an index saved with `save`, without downloading the tasks again.
+
+        Args:
+            path (str | Path): The path to the SQLite database.
+
+        Returns:
+            SearchIndex: The loaded index.
+        """
+        index = cls()
+        connection = sqlite3.connect(path)
+        try:
+            rows = connection.execute(
+                "SELECT task_id, title, content, desc, items FROM tasks_fts",
+            )
+            for task_id, title, content, desc, items in rows:
+                index._add(task_id, (title, content, desc, items))
+        finally:
+            connection.close()
+        return index
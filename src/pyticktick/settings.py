@@ -32,10 +32,14 @@ from pydantic import (
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pyotp import TOTP
 
+from pyticktick.circuit_breaker import CircuitBreakerConfig
+from pyticktick.codec import CodecName
+from pyticktick.exceptions import DEFAULT_MAX_RETRY_AFTER
 from pyticktick.models.pydantic import HttpUrl
 from pyticktick.models.v1.parameters.oauth import OAuthAuthorizeURLV1, OAuthTokenURLV1
 from pyticktick.models.v1.responses.oauth import OAuthTokenV1
 from pyticktick.models.v2.responses.user import UserSignOnV2, UserSignOnWithTOTPV2
+from pyticktick.response_cache import ResponseCacheConfig
 
 TICKTICK_INCORRECT_HEADER_CODE = 429
 
@@ -214,6 +218,43 @@ class Settings(BaseSettings):  # noqa: DOC601, DOC603
             browser request. Defaults to a JSON string with platform `web`, version
             `6430`, and a random MongoDB ObjectId string as the ID.
         override_forbid_extra (bool): Whether to override forbidding extra fields.
+        validation_workers (int): The number of processes to validate the tasks of
+            large V2 responses with, like batch and closed tasks responses. Defaults to
+            `1`, which validates them in the current process.
+        json_codec (CodecName): The JSON library used to encode request bodies and
+            decode responses, one of `orjson`, `msgspec`, or `json`. Defaults to `auto`,
+            the fastest one that is installed.
+        http2 (bool): Whether to negotiate HTTP/2 with the APIs, which requires the
+            `h2` package, installed with `httpx[http2]`. Defaults to `False`.
+        http_compression (bool): Whether to request compressed responses. Brotli and
+            Zstandard are requested on top of gzip and deflate when the `brotli` or
+            `zstandard` packages are installed. Defaults to `True`.
+        request_timeout (Optional[float]): The maximum time, in seconds, of a single
+            call to the APIs, including retries and the waits between them. Defaults to
+            `None`, which only applies the per-request timeouts of httpx.
+        max_retry_after (Optional[float]): The maximum time, in seconds, to wait before
+            retrying that a `Retry-After` header can ask for, longer waits are capped
+            to it. Defaults to `300`, `None` to not cap them.
+        circuit_breaker (Optional[CircuitBreakerConfig]): The configuration of the
+            circuit breakers that fail fast while the APIs are degraded. Defaults to
+            `None`, which disables them.
+        response_cache (Optional[ResponseCacheConfig]): The configuration of the cache
+            of the responses of endpoints that rarely change, like the user profile and
+            the projects. Defaults to `None`, which disables it.
+        coalesce_reads (bool): Whether concurrent calls to the same read method, with
+            the same arguments, share a single request and its validated result.
+            Defaults to `False`.
+        log_body_limit (int): The maximum number of characters of response bodies
+            included in logs. Defaults to `1000`.
+        log_sample_interval (float): The minimum time, in seconds, between two logs of
+            the same event, like a retry or an error status code. Defaults to `0`,
+            which logs every event.
+        log_sink (Optional[str]): The path of a file to write the logs of pyticktick
+            to, from a background thread. Defaults to `None`, which adds no sink.
+        log_sink_level (str): The minimum level of the logs written to `log_sink`.
+            Defaults to `INFO`.
+        log_sink_serialize (bool): Whether to write the logs to `log_sink` as JSON
+            lines, with their structured fields. Defaults to `True`.
     """
 
     # NOTE: Docstring attributes are required here, as griffe_pydantic does not support
@@ -279,6 +320,67 @@ class Settings(BaseSettings):  # noqa: DOC601, DOC603
         default=False,
         description="Override any API models that may be out of date and should contain new fields.",  # noqa: E501
     )
+    validation_workers: int = Field(
+        default=1,
+        ge=1,
+        description="The number of processes to validate the tasks of large V2 responses with.",  # noqa: E501
+    )
+    json_codec: CodecName = Field(
+        default="auto",
+        description="The JSON library used to encode request bodies and decode responses.",  # noqa: E501
+    )
+    http2: bool = Field(
+        default=False,
+        description="Whether to negotiate HTTP/2 with the APIs, requires `httpx[http2]`.",  # noqa: E501
+    )
+    http_compression: bool = Field(
+        default=True,
+        description="Whether to request compressed responses.",
+    )
+    request_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="The maximum time, in seconds, of a single call to the APIs, including retries.",  # noqa: E501
+    )
+    max_retry_after: float | None = Field(
+        default=DEFAULT_MAX_RETRY_AFTER,
+        ge=0,
+        description="The maximum wait, in seconds, that a `Retry-After` header can ask for.",  # noqa: E501
+    )
+    circuit_breaker: CircuitBreakerConfig | None = Field(
+        default=None,
+        description="The configuration of the circuit breakers, disabled if `None`.",
+    )
+    response_cache: ResponseCacheConfig | None = Field(
+        default=None,
+        description="The configuration of the response cache, disabled if `None`.",
+    )
+    coalesce_reads: bool = Field(
+        default=False,
+        description="Whether concurrent identical reads share a single request and result.",  # noqa: E501
+    )
+    log_body_limit: int = Field(
+        default=1000,
+        ge=0,
+        description="The maximum number of characters of response bodies included in logs.",  # noqa: E501
+    )
+    log_sample_interval: float = Field(
+        default=0,
+        ge=0,
+        description="The minimum time, in seconds, between two logs of the same event.",
+    )
+    log_sink: str | None = Field(
+        default=None,
+        description="The path of a file to write the logs of pyticktick to, disabled if `None`.",  # noqa: E501
+    )
+    log_sink_level: str = Field(
+        default="INFO",
+        description="The minimum level of the logs written to `log_sink`.",
+    )
+    log_sink_serialize: bool = Field(
+        default=True,
+        description="Whether to write the logs to `log_sink` as JSON lines.",
+    )
 
     @staticmethod
     def _parse_url_params(url: str) -> dict[str, str]:
@@ -0,0 +1,141 @@
+"""De-duplication of concurrent identical calls to the TickTick APIs.
+
+Threaded services often call the same read method of a client several times at once,
+for example when a handful of requests arrive together and each one gets the tasks of
+the account with `get_batch_v2`. Each call downloads and validates the same response,
+even though a single call would have been enough.
+
+This module contains `SingleFlight`, which lets the first of several concurrent
+identical calls run, while the others wait for it and share its result, or its error.
+Once the call returns, the next call runs again, so results are never reused past the
+calls that were waiting on them. To keep results for longer, use the
+[response cache](response_cache.md) instead.
+
+Single flight is disabled by default, and is enabled with the `coalesce_reads` setting
+of the client, which applies it to every read method. As the result is shared between
+the callers, it should be treated as read-only.
+
+!!! example
+    ```python
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyticktick import Client
+
+    client = Client(coalesce_reads=True)
+    with ThreadPoolExecutor(10) as executor:
+        batches = list(executor.map(lambda _: client.get_batch_v2(), range(10)))
+    assert all(batch is batches[0] for batch in batches)
+    ```
+"""
+
+from __future__ import annotations
+
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from loguru import logger
+
+from pyticktick.deadline import DeadlineExceededError, deadline, remaining
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "error", "result", "waiters")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    # Each waiter raises its own copy of the error, as raising the same exception object
+    # from several threads makes them all rewrite its `__traceback__`. The copy is built
+    # without calling `__init__`, whose signature may not match the `args`.
+    try:
+        copy = type(error).__new__(type(error), *error.args)
+        copy.__dict__.update(getattr(error, "__dict__", {}))
+    except Exception:  # noqa: BLE001
+        return error
+    copy.args = error.args
+    copy.__cause__ = error.__cause__
+    copy.__context__ = error.__context__
+    copy.__suppress_context__ = error.__suppress_context__
+    return copy.with_traceback(error.__traceback__)
+
+
+class SingleFlight:
+    """Group of calls, where concurrent calls with the same key share a single run."""
+
+    def __init__(self) -> None:
+        """Initialize a group without any call in flight."""
+        self._lock = Lock()
+        self._calls: dict[Hashable, _Call[Any]] = {}
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._calls)
+
+    def do(
+        self,
+        key: Hashable,
+        func: Callable[[], T],
+        *,
+        timeout: float | None = None,
+    ) -> tuple[T, bool]:
+        """Run `func`, unless a call with the same key is already in flight.
+
+        If another call with the same key is in flight, this waits for it, up to the
+        current [`deadline`](deadline.md#pyticktick.deadline.deadline), if any, and
+        `timeout`, and returns its result, or raises a copy of its error.
+
+        Args:
+            key (Hashable): The key of the call, equal for calls that can share a
+                result.
+            func (Callable[[], T]): The function to run.
+            timeout (float | None): The maximum time to wait for a call in flight, in
+                seconds, on top of the current deadline. Defaults to `None`, which only
+                waits up to the current deadline.
+
+        Returns:
+            tuple[T, bool]: The result of the call, and whether it was shared with
+                another caller.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes while waiting for the call in
+                flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result, call.waiters > 0
+
+        with deadline(timeout):
+            left = remaining()
+        if not call.done.wait(left):
+            msg = f"Deadline exceeded while waiting for the call in flight `{key}`"
+            logger.error(msg)
+            raise DeadlineExceededError(msg)
+        if call.error is not None:
+            error = _copy_error(call.error)
+            raise error
+        return call.result, True  # type: ignore[return-value]
@@ -0,0 +1,187 @@
+"""Binary snapshots of an account, to start from without a full download.
+
+A new process usually starts with
+[`get_batch_v2`](client/v2.md#pyticktick.client.Client.get_batch_v2), which downloads
+and validates every active task of the account before anything can be served. This
+module saves the validated `GetBatchV2`, along with its `check_point`, to a snapshot,
+and loads it back without downloading it again. A delta sync, from the `check_point` of
+the snapshot, then brings it up to date with a small response.
+
+Snapshots only hold data: the dump of the models, encoded with the
+[JSON codec](codec.md) of the client, which is validated back into the models when the
+snapshot is loaded. Unlike formats like `pickle`, loading a snapshot cannot run code,
+even if the file was tampered with. The garbage collector is paused while loading, as
+none of the objects created are garbage. A snapshot written by another version of
+pyticktick or pydantic is ignored, as the models it holds may differ.
+
+!!! example
+    ```python
+    from pathlib import Path
+
+    from pyticktick import Client
+    from pyticktick.snapshot import warm_start
+
+    client = Client()
+    # loads the snapshot, applies the changes since it was saved, and saves it again
+    batch = warm_start(client, Path("~/.cache/ticktick.snapshot").expanduser())
+    print(len(batch.sync_task_bean.update))
+    ```
+"""
+
+from __future__ import annotations
+
+import gc
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from pyticktick.codec import get_codec
+from pyticktick.models.v2.responses.batch import GetBatchV2
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pyticktick.client import Client
+    from pyticktick.codec import CodecName
+
+_MAGIC = b"PYTTSNAP"
+_FORMAT = 2
+
+
+def _version(package: str) -> str:
+    # pyticktick may be used from a source checkout, without being installed.
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return "0"
+
+
+def _header() -> bytes:
+    versions = f"{_FORMAT}:{_version('pyticktick')}:{_version('pydantic')}"
+    return _MAGIC + versions.encode() + b"\n"
+
+
+def apply_delta(batch: GetBatchV2, delta: GetBatchV2) -> GetBatchV2:
+    """Apply a delta batch response to a full batch response.
+
+    Projects, project groups, and tags are always returned in full by the V2 API, so
+    they are taken from the delta. Tasks are updated by ID, and the deleted ones, along
+    with the ones that were completed or abandoned since, are removed, as the full
+    batch response only holds active tasks.
+
+    Args:
+        batch (GetBatchV2): The full batch response to update.
+        delta (GetBatchV2): The batch response requested with the `check_point` of
+            `batch`.
+
+    Returns:
+        GetBatchV2: The full batch response, at the `check_point` of `delta`. Neither
+            `batch` nor `delta` are modified.
+    """
+    tasks = {task.id: task for task in batch.sync_task_bean.update}
+    for task in delta.sync_task_bean.update:
+        if task.status == 0:
+            tasks[task.id] = task
+        else:
+            tasks.pop(task.id, None)
+    for task_id in delta.sync_task_bean.deleted_ids:
+        tasks.pop(task_id, None)
+    bean = delta.sync_task_bean.model_copy(
+        update={"update": list(tasks.values()), "delete": []},
+    )
+    return delta.model_copy(update={"sync_task_bean": bean})
+
+
+def save_snapshot(
+    batch: GetBatchV2,
+    path: Path,
+    *,
+    codec: CodecName = "auto",
+) -> None:
+    """Save a batch response to a snapshot, replacing it atomically.
+
+    Args:
+        batch (GetBatchV2): The full batch response to save.
+        path (Path): The path of the snapshot.
+        codec (CodecName): The JSON codec to encode the snapshot with. Defaults to
+            `auto`, the fastest one that is installed.
+    """
+    payload = get_codec(codec).dumps(batch.model_dump(mode="json"))
+    # Written to a temporary file first, so that an interruption, or another process
+    # loading the snapshot, never sees a partial snapshot.
+    tmp = path.with_name(f"{path.name}.tmp")
+    with tmp.open("wb") as file:
+        file.write(_header())
+        file.write(payload)
+    tmp.replace(path)
+    logger.debug(
+        f"Saved snapshot `{path}` at check point {batch.check_point}, "
+        f"{len(batch.sync_task_bean.update)} tasks",
+    )
+
+
+def load_snapshot(path: Path, *, codec: CodecName = "auto") -> GetBatchV2 | None:
+    """Load a batch response from a snapshot, validating it back into the models.
+
+    Args:
+        path (Path): The path of the snapshot.
+        codec (CodecName): The JSON codec to decode the snapshot with. Defaults to
+            `auto`, the fastest one that is installed.
+
+    Returns:
+        GetBatchV2 | None: The batch response, or `None` if the snapshot does not
+            exist, is corrupted, or was written by another version of pyticktick or
+            pydantic.
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    header = _header()
+    if not data.startswith(header):
+        logger.info(f"Ignoring snapshot `{path}`, written by another version")
+        return None
+    json_codec = get_codec(codec)
+    # Loading allocates hundreds of thousands of objects, none of them garbage, which
+    # would otherwise trigger many pointless garbage collections.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return GetBatchV2.model_validate(json_codec.loads(data[len(header) :]))
+    except (*json_codec.errors, ValueError, KeyError, TypeError, IndexError) as e:
+        # `ValidationError`s, raised for snapshots that do not hold a batch response,
+        # are `ValueError`s.
+        logger.warning(f"Ignoring corrupted snapshot `{path}`: {e}")
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def warm_start(client: Client, path: Path) -> GetBatchV2:
+    """Get the full batch response of an account, starting from its snapshot.
+
+    If the snapshot can be loaded, only the changes since it was saved are requested,
+    and applied to it. Otherwise, the full batch response is requested. Either way, the
+    snapshot is then saved again, at the latest `check_point`.
+
+    Args:
+        client (Client): The client of the account.
+        path (Path): The path of the snapshot.
+
+    Returns:
+        GetBatchV2: The full, up to date, batch response.
+    """
+    batch = load_snapshot(path, codec=client.json_codec)
+    if batch is None:
+        batch = client.get_batch_v2()
+    else:
+        delta = client.get_batch_v2(check_point=batch.check_point)
+        logger.debug(
+            f"Applying {len(delta.sync_task_bean.update)} changed tasks to snapshot "
+            f"`{path}`",
+        )
+        batch = apply_delta(batch, delta)
+    save_snapshot(batch, path, codec=client.json_codec)
+    return batch
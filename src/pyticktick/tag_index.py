@@ -0,0 +1,526 @@
+"""Tag hierarchy and tag membership of TickTick tasks.
+
+This module contains the `TagIndex` class, which materializes the nesting of the
+[`TagV2`](models/v2/models.md#pyticktick.models.v2.models.TagV2) objects in an account,
+along with an inverted index from each tag to the tasks that carry it. This makes it
+cheap to answer questions like "which tasks are tagged with `work`, or with any tag
+nested under `work`?" without scanning every task.
+
+The index can also plan bulk renames, merges, and deletes of tags. The V2 API only
+acts on one tag per request, so a plan groups the operations into waves. Operations
+within a wave do not conflict with each other and can be sent concurrently, while the
+waves themselves are sent in order.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.tag_index import TagIndex, execute_plan
+
+    client = Client()
+    index = TagIndex.from_batch(client.get_batch_v2())
+    print(len(index.tasks_with_tag("work")))
+
+    plan = index.plan(renames={"wrk": "Work"}, deletes=["old", "older"])
+    execute_plan(client, plan)
+    index.apply(plan)
+    ```
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+from loguru import logger
+
+from pyticktick.deadline import check_deadline
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from pyticktick.client import Client
+    from pyticktick.models.v2.models import TagV2, TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+
+class TagOperation(NamedTuple):
+    """A single tag operation, sent to the V2 API as one request."""
+
+    kind: Literal["rename", "merge", "delete"]
+    name: str
+    new_name: str | None = None
+    """The new label of a renamed tag, or the name of the tag to merge into."""
+
+    @property
+    def target(self) -> str | None:
+        """The name of the tag that the tasks are tagged with after the operation."""
+        return None if self.new_name is None else self.new_name.lower()
+
+
+class TagPlan(NamedTuple):
+    """Tag operations grouped into waves of non-conflicting operations."""
+
+    waves: tuple[tuple[TagOperation, ...], ...]
+
+    @property
+    def operations(self) -> list[TagOperation]:
+        """All the operations of the plan, in the order they are sent."""
+        return [op for wave in self.waves for op in wave]
+
+
+def _call(client: Client, op: TagOperation) -> None:
+    data = {"name": op.name, "new_name": op.new_name}
+    if op.kind == "rename":
+        client.put_rename_tag_v2(data)
+    elif op.kind == "merge":
+        client.put_merge_tag_v2(data)
+    else:
+        client.delete_tag_v2({"name": op.name})
+
+
+def execute_plan(client: Client, plan: TagPlan, max_workers: int = 8) -> None:
+    """Send the operations of a plan to the V2 API.
+
+    The operations of each wave are sent concurrently, and a wave only starts once the
+    previous one has fully completed. If any operation of a wave fails, or the current
+    [`deadline`](deadline.md#pyticktick.deadline.deadline) has passed, the remaining
+    waves are not sent.
+
+    Args:
+        client (Client): The client to send the operations with.
+        plan (TagPlan): The plan to execute.
+        max_workers (int): The maximum number of concurrent requests.
+
+    Raises:
+        ValueError: If any operation of a wave failed, chained to the first error.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, wave in enumerate(plan.waves):
+            check_deadline()
+            # Each request runs in a copy of the current context, so that any
+            # deadline set around the plan also applies within the threads.
+            futures = [
+                executor.submit(copy_context().run, _call, client, op) for op in wave
+            ]
+            errors = [e for f in futures if (e := f.exception()) is not None]
+            if errors:
+                msg = (
+                    f"{len(errors)} tag operation(s) failed in wave {i + 1} of "
+                    f"{len(plan.waves)}"
+                )
+                logger.error(msg)
+                raise ValueError(msg) from errors[0]
+
+
+class TagIndex:
+    """Forest of tags along with the tasks tagged with each of them.
+
+    Tags whose parent is not part of the index are treated as roots. Task tags that do
+    not have a matching tag object, which TickTick allows, are still part of the
+    inverted index, but not of the forest.
+
+    The set of tasks carrying a tag or any of its descendants is precomputed for every
+    tag. It is rebuilt lazily, in linear time, the first time it is needed after the
+    tags or the tasks change.
+    """
+
+    def __init__(self, tags: Iterable[TagV2], tasks: Iterable[TaskV2] = ()) -> None:
+        """Build the index from a collection of tags and tasks.
+
+        Args:
+            tags (Iterable[TagV2]): The tags to build the forest from.
+            tasks (Iterable[TaskV2]): The tasks to build the inverted index from.
+        """
+        self._build(tags)
+        self._task_tags: dict[str, frozenset[str]] = {}
+        self._tasks: dict[str, set[str]] = {}
+        for task in tasks:
+            self.upsert_task(task)
+
+        self._closure: dict[str, frozenset[str]] = {}
+        self._dirty = True
+
+    def _build(self, tags: Iterable[TagV2]) -> None:
+        self._parent: dict[str, str | None] = {}
+        self._label: dict[str, str] = {}
+        for tag in tags:
+            self._parent[tag.name] = tag.parent
+            self._label[tag.name] = tag.label
+        self._children: dict[str, list[str]] = {name: [] for name in self._parent}
+        for name, parent in self._parent.items():
+            if parent is not None and parent in self._children:
+                self._children[parent].append(name)
+            else:
+                self._parent[name] = None
+
+        visited: set[str] = set()
+        for root in self.roots:
+            visited.add(root)
+            visited.update(self.descendants(root))
+        for name in self._parent:
+            if name not in visited:
+                # Tags in a cycle are unreachable from any root, so the cycle is
+                # broken by detaching one tag of it and treating it as a root.
+                logger.warning(f"Tag `{name}` is part of a parent cycle, detaching it")
+                if (parent := self._parent[name]) is not None:
+                    self._children[parent].remove(name)
+                self._parent[name] = None
+                visited.add(name)
+                visited.update(self.descendants(name))
+
+    @classmethod
+    def from_batch(cls, batch: GetBatchV2) -> TagIndex:
+        """Build the index from the tags and active tasks in a batch response.
+
+        Args:
+            batch (GetBatchV2): The batch response to build the index from.
+
+        Returns:
+            TagIndex: The index of all tags and active tasks.
+        """
+        return cls(batch.tags, batch.sync_task_bean.update)
+
+    def __contains__(self, name: object) -> bool:  # noqa: D105
+        return name in self._parent
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._parent)
+
+    @property
+    def roots(self) -> list[str]:
+        """The names of all the tags without a parent in the index."""
+        return [name for name, parent in self._parent.items() if parent is None]
+
+    def label(self, name: str) -> str:
+        """Get the label of a tag, as it appears in the UI.
+
+        Args:
+            name (str): The name of the tag.
+
+        Returns:
+            str: The label of the tag.
+        """
+        return self._label[name]
+
+    def parent(self, name: str) -> str | None:
+        """Get the parent of a tag.
+
+        Args:
+            name (str): The name of the tag.
+
+        Returns:
+            str | None: The name of the parent tag, or `None` if it is a root.
+        """
+        return self._parent[name]
+
+    def children(self, name: str) -> list[str]:
+        """Get the tags directly nested under a tag.
+
+        Args:
+            name (str): The name of the tag.
+
+        Returns:
+            list[str]: The names of the direct children.
+        """
+        return list(self._children[name])
+
+    def ancestors(self, name: str) -> list[str]:
+        """Get all the ancestors of a tag, starting from its parent.
+
+        Args:
+            name (str): The name of the tag.
+
+        Returns:
+            list[str]: The names of the ancestors, ordered from the parent to the root.
+        """
+        ancestors = []
+        parent = self._parent[name]
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self._parent[parent]
+        return ancestors
+
+    def descendants(self, name: str) -> list[str]:
+        """Get all the tags nested, at any depth, under a tag.
+
+        Args:
+            name (str): The name of the tag.
+
+        Returns:
+            list[str]: The names of the descendants, in pre-order.
+        """
+        descendants: list[str] = []
+        stack = list(reversed(self._children[name]))
+        while stack:
+            child = stack.pop()
+            descendants.append(child)
+            stack.extend(reversed(self._children[child]))
+        return descendants
+
+    def upsert_task(self, task: TaskV2) -> None:
+        """Add a task to the inverted index, or update its tags.
+
+        Args:
+            task (TaskV2): The task to add or update.
+        """
+        self.remove_task(task.id)
+        tags = frozenset(task.tags)
+        self._task_tags[task.id] = tags
+        for name in tags:
+            self._tasks.setdefault(name, set()).add(task.id)
+        self._dirty = True
+
+    def remove_task(self, task_id: str) -> None:
+        """Remove a task from the inverted index, if it is part of it.
+
+        Args:
+            task_id (str): The ID of the task to remove.
+        """
+        for name in self._task_tags.pop(task_id, ()):
+            self._tasks[name].discard(task_id)
+        self._dirty = True
+
+    def apply_batch(self, batch: GetBatchV2) -> None:
+        """Apply the changes of a batch response, including delta responses.
+
+        The tags of a batch response are always complete, so the forest is rebuilt,
+        while only the tasks that changed are updated in the inverted index.
+
+        Args:
+            batch (GetBatchV2): The batch response to apply.
+        """
+        self._build(batch.tags)
+        self._dirty = True
+        for task in batch.sync_task_bean.update:
+            self.upsert_task(task)
+        for task_id in batch.sync_task_bean.deleted_ids:
+            self.remove_task(task_id)
+
+    def _reindex(self) -> None:
+        closure: dict[str, frozenset[str]] = {}
+        for root in self.roots:
+            order = [root, *self.descendants(root)]
+            for name in reversed(order):
+                tasks = set(self._tasks.get(name, ()))
+                for child in self._children[name]:
+                    tasks.update(closure[child])
+                closure[name] = frozenset(tasks)
+        self._closure = closure
+        self._dirty = False
+
+    def tasks_with_tag(
+        self,
+        name: str,
+        *,
+        include_descendants: bool = True,
+    ) -> frozenset[str]:
+        """Get the tasks tagged with a tag, or with any tag nested under it.
+
+        Args:
+            name (str): The name of the tag.
+            include_descendants (bool): Whether to include the tasks tagged with any
+                descendant of the tag.
+
+        Returns:
+            frozenset[str]: The IDs of the tagged tasks, empty if the tag is unknown.
+        """
+        if include_descendants and name in self._parent:
+            if self._dirty:
+                self._reindex()
+            return self._closure[name]
+        return frozenset(self._tasks.get(name, ()))
+
+    def _collect(
+        self,
+        renames: Mapping[str, str],
+        merges: Mapping[str, str],
+        deletes: Iterable[str],
+    ) -> dict[str, TagOperation]:
+        ops: dict[str, TagOperation] = {}
+        for op in (
+            *(TagOperation("delete", name) for name in dict.fromkeys(deletes)),
+            *(TagOperation("merge", name, target) for name, target in merges.items()),
+            *(TagOperation("rename", name, label) for name, label in renames.items()),
+        ):
+            if op.name not in self._parent:
+                msg = f"Cannot {op.kind} unknown tag `{op.name}`"
+                logger.error(msg)
+                raise ValueError(msg)
+            if op.name in ops:
+                msg = f"Tag `{op.name}` is the source of more than one operation"
+                logger.error(msg)
+                raise ValueError(msg)
+            if op.kind != "rename" or op.new_name != self._label[op.name]:
+                ops[op.name] = op
+        return ops
+
+    def _dependencies(self, ops: dict[str, TagOperation]) -> dict[str, str]:
+        depends: dict[str, str] = {}
+        targets: set[str] = set()
+        for op in ops.values():
+            target = op.target
+            if op.kind == "merge" and (
+                target == op.name or target not in self._parent or target in ops
+            ):
+                msg = (
+                    f"Cannot merge `{op.name}` into `{target}`, it must be another "
+                    "existing tag that is not changed by the plan"
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+            if op.kind != "rename" or target is None or target == op.name:
+                continue
+            if target in targets:
+                msg = f"More than one tag is renamed to `{target}`"
+                logger.error(msg)
+                raise ValueError(msg)
+            targets.add(target)
+            if target in ops:
+                depends[op.name] = target
+            elif target in self._parent:
+                msg = (
+                    f"Cannot rename `{op.name}` to existing tag `{target}`, "
+                    "merge it instead"
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+        return depends
+
+    @staticmethod
+    def _levels(
+        ops: dict[str, TagOperation], depends: dict[str, str]
+    ) -> dict[str, int]:
+        # Each operation depends on at most one other, so dependencies form chains,
+        # and the level of an operation is its distance to the end of its chain.
+        level: dict[str, int] = {}
+        for name in ops:
+            chain = [name]
+            seen = {name}
+            while chain[-1] in depends and chain[-1] not in level:
+                chain.append(depends[chain[-1]])
+                if chain[-1] in seen:
+                    msg = f"Renames form a cycle: {' -> '.join(chain)}"
+                    logger.error(msg)
+                    raise ValueError(msg)
+                seen.add(chain[-1])
+            base = level.get(chain[-1], 0)
+            for i, link in enumerate(reversed(chain)):
+                level.setdefault(link, base + i)
+        return level
+
+    def plan(
+        self,
+        renames: Mapping[str, str] | None = None,
+        merges: Mapping[str, str] | None = None,
+        deletes: Iterable[str] = (),
+    ) -> TagPlan:
+        """Plan renames, merges, and deletes of tags in as few API calls as possible.
+
+        Each tag can only be the source of one operation. Operations that would not
+        change anything, like renaming a tag to its current label, are dropped.
+
+        A tag can be renamed to the name of a tag that is itself renamed, merged, or
+        deleted, in which case the other operation is sent in an earlier wave. Any
+        other operations that touch the same tag, or a parent and its direct child,
+        are also sent in different waves, so that they never run concurrently.
+
+        Args:
+            renames (Mapping[str, str] | None): The new label of each tag to rename,
+                keyed by the name of the tag.
+            merges (Mapping[str, str] | None): The name of the tag to merge each tag
+                into, keyed by the name of the tag.
+            deletes (Iterable[str]): The names of the tags to delete.
+
+        Returns:
+            TagPlan: The planned operations.
+
+        Raises:
+            ValueError: If the operations are invalid, for example if a tag is unknown,
+                is the source of more than one operation, or if renames form a cycle.
+        """  # noqa: DOC502
+        ops = self._collect(renames or {}, merges or {}, deletes)
+        depends = self._dependencies(ops)
+        level = self._levels(ops, depends)
+
+        # Place each operation in the earliest wave without a conflicting operation,
+        # and always after the wave of the operation it depends on, if any.
+        waves: list[list[TagOperation]] = []
+        touched: list[set[str]] = []
+        placed: dict[str, int] = {}
+        for name in sorted(ops, key=level.__getitem__):
+            op = ops[name]
+            names = {op.name, *self._children[op.name]}
+            if (parent := self._parent[op.name]) is not None:
+                names.add(parent)
+            if (target := op.target) is not None:
+                names.add(target)
+            wave = placed[depends[name]] + 1 if name in depends else 0
+            while wave < len(waves) and names & touched[wave]:
+                wave += 1
+            if wave == len(waves):
+                waves.append([])
+                touched.append(set())
+            waves[wave].append(op)
+            touched[wave].add(op.name)
+            if target is not None:
+                touched[wave].add(target)
+            placed[name] = wave
+
+        return TagPlan(tuple(tuple(wave) for wave in waves))
+
+    def _rename(self, name: str, target: str) -> None:
+        parent = self._parent.pop(name)
+        self._parent[target] = parent
+        if parent is not None:
+            siblings = self._children[parent]
+            siblings[siblings.index(name)] = target
+        self._children[target] = self._children.pop(name)
+        for child in self._children[target]:
+            self._parent[child] = target
+        self._retag(name, target)
+
+    def _retag(self, name: str, target: str | None) -> None:
+        for task_id in self._tasks.pop(name, ()):
+            tags = self._task_tags[task_id] - {name}
+            if target is not None:
+                tags |= {target}
+                self._tasks.setdefault(target, set()).add(task_id)
+            self._task_tags[task_id] = tags
+
+    def _remove(self, name: str, new_parent: str | None) -> None:
+        parent = self._parent.pop(name)
+        del self._label[name]
+        if parent is not None:
+            self._children[parent].remove(name)
+        for child in self._children.pop(name):
+            # A tag merged into one of its own children is replaced by that child.
+            child_parent = parent if child == new_parent else new_parent
+            self._parent[child] = child_parent
+            if child_parent is not None:
+                self._children[child_parent].append(child)
+
+    def apply(self, plan: TagPlan) -> None:
+        """Apply the operations of a plan, once it has been executed.
+
+        This keeps the index in sync with the account after a successful call to
+        `execute_plan`, without having to rebuild it. The children of a merged tag are
+        moved under the tag it was merged into, while the children of a deleted tag
+        become roots.
+
+        Args:
+            plan (TagPlan): The executed plan to apply.
+        """
+        for op in plan.operations:
+            target = op.target
+            if target is None:
+                self._remove(op.name, None)
+                self._retag(op.name, None)
+            elif op.kind == "merge":
+                self._remove(op.name, target)
+                self._retag(op.name, target)
+            else:
+                del self._label[op.name]
+                self._rename(op.name, target)
+                self._label[target] = str(op.new_name)
+        self._dirty = True
@@ -0,0 +1,424 @@
+"""Local statistics of completed and open tasks, over any range and grouping.
+
+[`get_statistics_v2`](client/v2.md#pyticktick.client.Client.get_statistics_v2) returns
+task counts by day, week, and month, computed by TickTick for the whole account, over
+ranges it chooses. This module contains the `TaskStatistics` class, which computes the
+same counts locally from the active tasks and the closed task history, over any range,
+and for any project or tag.
+
+For each period, the counts are returned as a
+[`TaskCountV2`](models/v2/responses/user.md#pyticktick.models.v2.responses.user.TaskCountV2),
+where `complete_count` is the number of tasks completed during the period, and
+`not_complete_count` the number of tasks created during the period that are still open.
+Abandoned tasks are not counted. Periods start at midnight in the time zone of the
+statistics, weeks start on `week_start`, and months on their first day.
+
+Tasks are stored in compact columns of timestamps, which new and updated tasks are
+appended to, so the statistics can be kept up to date as closed tasks arrive, without
+being rebuilt. Counts are computed by bucketing the timestamps of the matching tasks
+into the periods of the range at once, with [NumPy](https://numpy.org/) if it is
+installed, or in pure Python otherwise. NumPy is not a dependency of pyticktick, so it
+needs to be installed separately to be used.
+
+!!! example
+    ```python
+    from datetime import date
+
+    from pyticktick import Client
+    from pyticktick.task_statistics import TaskStatistics
+
+    client = Client()
+    stats = TaskStatistics.from_batch(client.get_batch_v2(), tz="Europe/Paris")
+    stats.add_tasks(client.get_project_all_closed_v2(...).root)
+
+    by_week = stats.counts("week", date(2025, 1, 1), date(2025, 3, 31), tag="work")
+    by_project = stats.counts_by_project("month", date(2025, 1, 1), date(2025, 12, 31))
+    ```
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from functools import cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Literal
+from zoneinfo import ZoneInfo
+
+from pyticktick.models.v2.responses.user import (
+    TaskByDayV2,
+    TaskByMonthV2,
+    TaskByWeekV2,
+    TaskCountV2,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from types import ModuleType
+
+    from pyticktick.models.v2.models import TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+Period = Literal["day", "week", "month"]
+"""The length of the periods tasks are counted over."""
+
+TaskCounts = TaskByDayV2 | TaskByWeekV2 | TaskByMonthV2
+"""The task counts of each period of a range."""
+
+_MODELS: dict[str, type[TaskCounts]] = {
+    "day": TaskByDayV2,
+    "week": TaskByWeekV2,
+    "month": TaskByMonthV2,
+}
+_MISSING = -(2**63)
+
+
+@cache
+def _numpy() -> ModuleType | None:
+    try:
+        return import_module("numpy")
+    except ImportError:
+        return None
+
+
+def _histogram(
+    values: array[int],
+    rows: Sequence[int] | None,
+    groups: tuple[array[int] | None, int],
+    bounds: list[int],
+    *,
+    use_numpy: bool,
+) -> list[list[int]]:
+    # Counts the values falling in each bucket `[bounds[i], bounds[i + 1])`, for each
+    # group, optionally only among the given rows, which may repeat. Groups are given
+    # for each of the rows, or for each value if there are none. Missing values are
+    # never counted.
+    n = len(bounds) - 1
+    group_of, n_groups = groups
+    np = _numpy() if use_numpy else None
+    if np is not None and len(values):
+        v = np.frombuffer(values, dtype=np.int64)
+        if rows is not None:
+            v = v[np.asarray(rows, dtype=np.int64)]
+        g = np.zeros_like(v) if group_of is None else np.frombuffer(group_of, np.int64)
+        idx = np.searchsorted(np.asarray(bounds, dtype=np.int64), v, side="right") - 1
+        ok = (idx >= 0) & (idx < n) & (g >= 0)
+        counts = np.bincount(g[ok] * n + idx[ok], minlength=n_groups * n)
+        return counts.reshape(n_groups, n).tolist()
+
+    counts = [[0] * n for _ in range(n_groups)]
+    for k, i in enumerate(range(len(values)) if rows is None else rows):
+        j = bisect_right(bounds, values[i]) - 1
+        group = 0 if group_of is None else group_of[k]
+        if 0 <= j < n and group >= 0:
+            counts[group][j] += 1
+    return counts
+
+
+class TaskStatistics:
+    """Completed and open task counts, computed locally over any range.
+
+    Updating a task overwrites its row in place, and removing a task blanks its row, so
+    the columns only grow with the number of distinct tasks. Instances are not
+    thread-safe.
+
+    Attributes:
+        tz (ZoneInfo): The time zone the periods are computed in.
+        week_start (int): The first day of the week, `0` for Monday to `6` for Sunday.
+        use_numpy (bool): Whether the counts are computed with NumPy.
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[TaskV2] = (),
+        *,
+        tz: str = "UTC",
+        week_start: int = 0,
+        use_numpy: bool | None = None,
+    ) -> None:
+        """Build the statistics from a collection of tasks.
+
+        Args:
+            tasks (Iterable[TaskV2]): The active and closed tasks to count.
+            tz (str): The IANA time zone the periods are computed in. Defaults to
+                `UTC`.
+            week_start (int): The first day of the week, `0` for Monday to `6` for
+                Sunday. Defaults to `0`.
+            use_numpy (bool | None): Whether to compute the counts with NumPy. Defaults
+                to `None`, which uses NumPy if it is installed.
+        """
+        self.tz = ZoneInfo(tz)
+        self.week_start = week_start
+        self.use_numpy = _numpy() is not None if use_numpy is None else use_numpy
+        self._rows: dict[str, int] = {}
+        self._completed: array[int] = array("q")
+        self._open_created: array[int] = array("q")
+        self._project: array[int] = array("q")
+        self._projects: list[str] = []
+        self._project_codes: dict[str, int] = {}
+        self._project_sizes: list[int] = []
+        self._task_tags: list[tuple[str, ...]] = []
+        self._tag_rows: dict[str, set[int]] = {}
+        self.add_tasks(tasks)
+
+    @classmethod
+    def from_batch(cls, batch: GetBatchV2, *, tz: str = "UTC") -> TaskStatistics:
+        """Build the statistics from all the active tasks in a batch response.
+
+        Args:
+            batch (GetBatchV2): The batch response to build the statistics from.
+            tz (str): The IANA time zone the periods are computed in. Defaults to
+                `UTC`.
+
+        Returns:
+            TaskStatistics: The statistics of the active tasks.
+        """
+        return cls(batch.sync_task_bean.update, tz=tz)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._rows)
+
+    def upsert_task(self, task: TaskV2) -> None:
+        """Add a task, or replace the one with the same ID.
+
+        Args:
+            task (TaskV2): The active or closed task to add.
+        """
+        completed = open_created = _MISSING
+        if task.status > 0 and task.completed_time is not None:
+            completed = int(task.completed_time.timestamp())
+        elif task.status == 0 and task.created_time is not None:
+            open_created = int(task.created_time.timestamp())
+
+        code = self._project_codes.get(task.project_id)
+        if code is None:
+            code = self._project_codes[task.project_id] = len(self._projects)
+            self._projects.append(task.project_id)
+            self._project_sizes.append(0)
+
+        row = self._rows.get(task.id)
+        if row is None:
+            row = self._rows[task.id] = len(self._completed)
+            self._completed.append(completed)
+            self._open_created.append(open_created)
+            self._project.append(code)
+            self._task_tags.append(())
+        else:
+            self._completed[row] = completed
+            self._open_created[row] = open_created
+            self._project_sizes[self._project[row]] -= 1
+            self._project[row] = code
+        self._project_sizes[code] += 1
+        self._set_tags(row, tuple(task.tags))
+
+    def add_tasks(self, tasks: Iterable[TaskV2]) -> None:
+        """Add or replace several tasks, like a window of the closed task history.
+
+        Args:
+            tasks (Iterable[TaskV2]): The tasks to add.
+        """
+        for task in tasks:
+            self.upsert_task(task)
+
+    def remove_task(self, task_id: str) -> None:
+        """Stop counting a task, if it is counted.
+
+        Args:
+            task_id (str): The ID of the task to remove.
+        """
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        self._completed[row] = self._open_created[row] = _MISSING
+        self._project_sizes[self._project[row]] -= 1
+        self._project[row] = -1
+        self._set_tags(row, ())
+
+    def apply_batch(self, batch: GetBatchV2) -> None:
+        """Apply the task changes of a batch response, including delta responses.
+
+        Args:
+            batch (GetBatchV2): The batch response to apply.
+        """
+        self.add_tasks(batch.sync_task_bean.update)
+        for task_id in batch.sync_task_bean.deleted_ids:
+            self.remove_task(task_id)
+
+    def _set_tags(self, row: int, tags: tuple[str, ...]) -> None:
+        old = self._task_tags[row]
+        if old == tags:
+            return
+        for tag in old:
+            self._tag_rows[tag].discard(row)
+        for tag in tags:
+            self._tag_rows.setdefault(tag, set()).add(row)
+        self._task_tags[row] = tags
+
+    def _periods(self, period: Period, start: date, end: date) -> list[date]:
+        if period == "day":
+            first = start
+        elif period == "week":
+            first = start - timedelta(days=(start.weekday() - self.week_start) % 7)
+        else:
+            first = start.replace(day=1)
+        periods = []
+        current = first
+        while current <= end:
+            periods.append(current)
+            if period == "day":
+                current += timedelta(days=1)
+            elif period == "week":
+                current += timedelta(days=7)
+            else:
+                current = date(
+                    current.year + current.month // 12,
+                    current.month % 12 + 1,
+                    1,
+                )
+        # The end of the last period bounds the last bucket.
+        periods.append(current)
+        return periods
+
+    def _counts(
+        self,
+        period: Period,
+        start: date,
+        end: date,
+        rows: Sequence[int] | None,
+        groups: tuple[array[int] | None, int],
+    ) -> list[TaskCounts]:
+        periods = self._periods(period, start, end)
+        bounds = [
+            int(datetime.combine(p, time(), self.tz).timestamp()) for p in periods
+        ]
+        completed, open_created = (
+            _histogram(
+                column,
+                rows,
+                groups,
+                bounds,
+                use_numpy=self.use_numpy,
+            )
+            for column in (self._completed, self._open_created)
+        )
+        model = _MODELS[period]
+        return [
+            model.model_construct(
+                root={
+                    p: TaskCountV2(complete_count=c, not_complete_count=o)
+                    for p, c, o in zip(
+                        periods,
+                        completed[group],
+                        open_created[group],
+                        strict=False,
+                    )
+                },
+            )
+            for group in range(groups[1])
+        ]
+
+    def _project_rows(self, code: int, rows: Sequence[int] | None) -> Sequence[int]:
+        # The rows of the project, among the given rows if any.
+        np = _numpy() if self.use_numpy else None
+        if np is not None and len(self._project):
+            project = np.frombuffer(self._project, dtype=np.int64)
+            if rows is None:
+                return np.flatnonzero(project == code)
+            index = np.asarray(rows, dtype=np.int64)
+            return index[project[index] == code]
+        candidates = range(len(self._project)) if rows is None else rows
+        return [i for i in candidates if self._project[i] == code]
+
+    def counts(
+        self,
+        period: Period,
+        start: date,
+        end: date,
+        *,
+        project_id: str | None = None,
+        tag: str | None = None,
+    ) -> TaskCounts:
+        """Count the completed and open tasks in each period of a range.
+
+        Args:
+            period (Period): The length of the periods.
+            start (date): The first day of the range, which the first period contains.
+            end (date): The last day of the range, which the last period contains.
+            project_id (str | None): Only count the tasks of this project. Defaults to
+                `None`.
+            tag (str | None): Only count the tasks with this tag. Defaults to `None`.
+
+        Returns:
+            TaskCounts: The counts of each period, keyed by its first day, as a
+                `TaskByDayV2`, `TaskByWeekV2`, or `TaskByMonthV2`.
+        """
+        rows: Sequence[int] | None = None
+        if tag is not None:
+            rows = sorted(self._tag_rows.get(tag, ()))
+        if project_id is not None:
+            rows = self._project_rows(self._project_codes.get(project_id, -2), rows)
+        return self._counts(period, start, end, rows, (None, 1))[0]
+
+    def counts_by_project(
+        self,
+        period: Period,
+        start: date,
+        end: date,
+    ) -> dict[str, TaskCounts]:
+        """Count the completed and open tasks of each project in each period of a range.
+
+        Args:
+            period (Period): The length of the periods.
+            start (date): The first day of the range, which the first period contains.
+            end (date): The last day of the range, which the last period contains.
+
+        Returns:
+            dict[str, TaskCounts]: The counts of each period, by project ID, for the
+                projects that have tasks.
+        """
+        counts = self._counts(
+            period,
+            start,
+            end,
+            None,
+            (self._project, len(self._projects)),
+        )
+        return {
+            project_id: project_counts
+            for project_id, project_counts, size in zip(
+                self._projects,
+                counts,
+                self._project_sizes,
+                strict=True,
+            )
+            if size
+        }
+
+    def counts_by_tag(
+        self,
+        period: Period,
+        start: date,
+        end: date,
+    ) -> dict[str, TaskCounts]:
+        """Count the completed and open tasks with each tag in each period of a range.
+
+        Args:
+            period (Period): The length of the periods.
+            start (date): The first day of the range, which the first period contains.
+            end (date): The last day of the range, which the last period contains.
+
+        Returns:
+            dict[str, TaskCounts]: The counts of each period, by tag name.
+        """
+        # Every (row, tag) pair is counted at once, with the tag as the group.
+        tags: list[str] = []
+        rows: array[int] = array("q")
+        tag_of: array[int] = array("q")
+        for tag, tag_rows in self._tag_rows.items():
+            if tag_rows:
+                rows.extend(tag_rows)
+                tag_of.extend([len(tags)] * len(tag_rows))
+                tags.append(tag)
+        counts = self._counts(period, start, end, rows, (tag_of, len(tags)))
+        return dict(zip(tags, counts, strict=True))
@@ -0,0 +1,359 @@
+"""Parent / child hierarchy of TickTick tasks.
+
+This module contains the `TaskTree` class, which materializes the subtask hierarchy of
+a set of [`TaskV2`](models/v2/models.md#pyticktick.models.v2.models.TaskV2) objects.
+TickTick only stores the hierarchy as `parent_id` and `child_ids` on each task, so
+answering questions like "is this task nested under that one?" would otherwise need
+repeated scans over all of the tasks.
+
+The tree is built in a single linear pass. It then keeps a pre-order index of the
+forest, so that depth, ancestor, and descendant queries do not need to walk the tree.
+Progress is aggregated per subtree, counting both the tasks themselves and their
+checklist items. See
+[Checklists vs Subtasks](../explanations/ticktick_api/checklists_vs_subtasks.md)
+for the difference between the two.
+
+!!! example
+    ```python
+    from pyticktick import Client
+    from pyticktick.task_tree import TaskTree
+
+    client = Client()
+    tree = TaskTree.from_batch(client.get_batch_v2())
+    for root in tree.roots:
+        print(root, tree.progress(root).ratio)
+    ```
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from loguru import logger
+
+from pyticktick.models.v2.parameters.task_parent import (
+    PostBatchTaskParentV2,
+    SetTaskParentV2,
+    UnSetTaskParentV2,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pyticktick.models.v2.models import TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+
+class SubtreeProgress(NamedTuple):
+    """Completion counts of a task, its subtasks, and all of their checklist items."""
+
+    completed: int
+    total: int
+
+    @property
+    def ratio(self) -> float:
+        """The fraction of completed tasks and checklist items, `0.0` if empty."""
+        return self.completed / self.total if self.total else 0.0
+
+
+def _own_progress(task: TaskV2) -> SubtreeProgress:
+    completed = int(task.status != 0)
+    total = 1
+    for item in task.items:
+        completed += int(item.status not in {None, 0})
+        total += 1
+    return SubtreeProgress(completed, total)
+
+
+class TaskTree:
+    """Forest of tasks linked by their parent / child relationships.
+
+    Tasks whose parent is not part of the tree, for example because the parent has
+    been completed, are treated as roots.
+
+    The depth of each task and the progress of each subtree are always kept up to
+    date. Ancestor and descendant queries use a pre-order index of the forest, which
+    is rebuilt lazily, in linear time, the first time it is needed after the
+    hierarchy changes.
+    """
+
+    def __init__(self, tasks: Iterable[TaskV2]) -> None:
+        """Build the tree from a collection of tasks.
+
+        Args:
+            tasks (Iterable[TaskV2]): The tasks to build the tree from.
+        """
+        self._parent: dict[str, str | None] = {}
+        self._children: dict[str, list[str]] = {}
+        self._own: dict[str, SubtreeProgress] = {}
+        for task in tasks:
+            self._parent[task.id] = task.parent_id
+            self._children[task.id] = []
+            self._own[task.id] = _own_progress(task)
+
+        self._roots: list[str] = []
+        for id_, parent_id in self._parent.items():
+            if parent_id is not None and parent_id in self._children:
+                self._children[parent_id].append(id_)
+            else:
+                self._parent[id_] = None
+                self._roots.append(id_)
+
+        self._depth: dict[str, int] = {}
+        self._subtree: dict[str, SubtreeProgress] = {}
+        self._order: list[str] = []
+        self._pos: dict[str, int] = {}
+        self._size: dict[str, int] = {}
+        self._reindex(aggregate=True)
+
+    @classmethod
+    def from_batch(cls, batch: GetBatchV2) -> TaskTree:
+        """Build the tree from all the active tasks in a batch response.
+
+        Args:
+            batch (GetBatchV2): The batch response to build the tree from.
+
+        Returns:
+            TaskTree: The tree of all active tasks.
+        """
+        return cls(batch.sync_task_bean.update)
+
+    def _reindex(self, *, aggregate: bool = False) -> None:
+        order: list[str] = []
+        stack = list(reversed(self._roots))
+        visited: set[str] = set()
+        depth = self._depth
+        while stack:
+            id_ = stack.pop()
+            if id_ in visited:
+                continue
+            visited.add(id_)
+            parent_id = self._parent[id_]
+            depth[id_] = 0 if parent_id is None else depth[parent_id] + 1
+            order.append(id_)
+            stack.extend(reversed(self._children[id_]))
+
+        if len(order) != len(self._parent):
+            # Tasks in a cycle are unreachable from any root, so the cycle is broken
+            # by detaching one task of it and treating it as a root.
+            id_ = next(id_ for id_ in self._parent if id_ not in visited)
+            logger.warning(f"Task `{id_}` is part of a parent cycle, detaching it")
+            self._detach(id_)
+            self._parent[id_] = None
+            self._roots.append(id_)
+            self._reindex(aggregate=aggregate)
+            return
+
+        self._order = order
+        self._pos = {id_: i for i, id_ in enumerate(order)}
+        size = dict.fromkeys(order, 1)
+        for id_ in reversed(order):
+            if (parent_id := self._parent[id_]) is not None:
+                size[parent_id] += size[id_]
+        self._size = size
+
+        if aggregate:
+            subtree: dict[str, SubtreeProgress] = {}
+            for id_ in reversed(order):
+                completed, total = self._own[id_]
+                for child_id in self._children[id_]:
+                    completed += subtree[child_id].completed
+                    total += subtree[child_id].total
+                subtree[id_] = SubtreeProgress(completed, total)
+            self._subtree = subtree
+
+        self._dirty = False
+
+    def _ensure_index(self) -> None:
+        if self._dirty:
+            self._reindex()
+
+    def __contains__(self, task_id: object) -> bool:  # noqa: D105
+        return task_id in self._parent
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._parent)
+
+    @property
+    def roots(self) -> list[str]:
+        """The IDs of all the tasks without a parent in the tree."""
+        return list(self._roots)
+
+    def parent(self, task_id: str) -> str | None:
+        """Get the parent of a task.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            str | None: The ID of the parent task, or `None` if it is a root.
+        """
+        return self._parent[task_id]
+
+    def children(self, task_id: str) -> list[str]:
+        """Get the direct subtasks of a task.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            list[str]: The IDs of the direct subtasks.
+        """
+        return list(self._children[task_id])
+
+    def depth(self, task_id: str) -> int:
+        """Get the depth of a task, where roots have a depth of `0`.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            int: The number of ancestors of the task.
+        """
+        return self._depth[task_id]
+
+    def is_ancestor(self, ancestor_id: str, task_id: str) -> bool:
+        """Check if a task is nested, at any depth, under another task.
+
+        Args:
+            ancestor_id (str): The ID of the possible ancestor.
+            task_id (str): The ID of the possible descendant.
+
+        Returns:
+            bool: `True` if `task_id` is a descendant of `ancestor_id`.
+        """
+        self._ensure_index()
+        start = self._pos[ancestor_id]
+        return start < self._pos[task_id] < start + self._size[ancestor_id]
+
+    def ancestors(self, task_id: str) -> list[str]:
+        """Get all the ancestors of a task, starting from its parent.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            list[str]: The IDs of the ancestors, ordered from the parent to the root.
+        """
+        ancestors = []
+        parent_id = self._parent[task_id]
+        while parent_id is not None:
+            ancestors.append(parent_id)
+            parent_id = self._parent[parent_id]
+        return ancestors
+
+    def descendants(self, task_id: str) -> list[str]:
+        """Get all the tasks nested, at any depth, under a task.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            list[str]: The IDs of the descendants, in pre-order.
+        """
+        self._ensure_index()
+        start = self._pos[task_id]
+        return self._order[start + 1 : start + self._size[task_id]]
+
+    def progress(self, task_id: str) -> SubtreeProgress:
+        """Get the progress of a task and everything nested under it.
+
+        A task counts as completed when its status is anything other than active,
+        and a checklist item counts as completed when its status is set and not `0`.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            SubtreeProgress: The completion counts of the subtree.
+        """
+        return self._subtree[task_id]
+
+    def _add_to_ancestors(self, task_id: str, sign: int) -> None:
+        completed, total = self._subtree[task_id]
+        for ancestor_id in self.ancestors(task_id):
+            current = self._subtree[ancestor_id]
+            self._subtree[ancestor_id] = SubtreeProgress(
+                current.completed + sign * completed,
+                current.total + sign * total,
+            )
+
+    def _detach(self, task_id: str) -> None:
+        parent_id = self._parent[task_id]
+        if parent_id is None:
+            self._roots.remove(task_id)
+        else:
+            self._children[parent_id].remove(task_id)
+
+    def _shift_depth(self, task_id: str, delta: int) -> None:
+        stack = [task_id]
+        while stack:
+            id_ = stack.pop()
+            self._depth[id_] += delta
+            stack.extend(self._children[id_])
+
+    def set_parent(self, task_id: str, parent_id: str | None) -> None:
+        """Move a task, along with all its subtasks, under a new parent.
+
+        The depth and progress of the affected tasks are updated in place, in time
+        proportional to the size of the moved subtree and the depth of the tree.
+
+        Args:
+            task_id (str): The ID of the task to move.
+            parent_id (str | None): The ID of the new parent, or `None` to make the
+                task a root.
+
+        Raises:
+            ValueError: If the new parent is the task itself or one of its
+                descendants.
+        """
+        if parent_id == self._parent[task_id]:
+            return
+        if parent_id is not None and (
+            parent_id == task_id or task_id in self.ancestors(parent_id)
+        ):
+            msg = f"Cannot set `{parent_id}` as the parent of its ancestor `{task_id}`"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self._add_to_ancestors(task_id, -1)
+        self._detach(task_id)
+        old_depth = self._depth[task_id]
+
+        self._parent[task_id] = parent_id
+        if parent_id is None:
+            self._roots.append(task_id)
+            new_depth = 0
+        else:
+            self._children[parent_id].append(task_id)
+            new_depth = self._depth[parent_id] + 1
+
+        self._add_to_ancestors(task_id, 1)
+        if new_depth != old_depth:
+            self._shift_depth(task_id, new_depth - old_depth)
+        self._dirty = True
+
+    def apply(
+        self,
+        operations: SetTaskParentV2 | UnSetTaskParentV2 | PostBatchTaskParentV2,
+    ) -> None:
+        """Apply the same task parent operations sent to `post_task_parent_v2`.
+
+        This keeps the tree in sync with the account after a successful call to
+        [`post_task_parent_v2`](client/v2.md#pyticktick.client.Client.post_task_parent_v2),
+        without having to rebuild it.
+
+        Args:
+            operations (SetTaskParentV2 | UnSetTaskParentV2 | PostBatchTaskParentV2):
+                A single operation, or a batch of operations, to apply in order.
+        """
+        if isinstance(operations, PostBatchTaskParentV2):
+            ops = operations.root
+        else:
+            ops = [operations]
+
+        for op in ops:
+            if isinstance(op, SetTaskParentV2):
+                self.set_parent(op.task_id, op.parent_id)
+            elif self._parent[op.task_id] == op.old_parent_id:
+                self.set_parent(op.task_id, None)
@@ -0,0 +1,466 @@
+"""Adaptive polling of TickTick accounts for changes, as typed change events.
+
+TickTick does not push changes to third parties, so integrations have to poll. Polling
+[`get_batch_v2`](client/v2.md#pyticktick.client.Client.get_batch_v2) on a fixed timer
+is either wasteful when the account is idle, or slow to notice changes when it is
+busy. This module contains the `Watcher` class, which polls with the `check_point` of
+the previous response, so each poll only returns the tasks that changed, and adapts
+the interval between polls to each account:
+
+- After a poll that found changes, the next poll is sent after `min_interval`, as
+    changes tend to come in bursts.
+- After a poll that found nothing, or failed, the interval grows by up to `backoff`
+    times, up to `max_interval`. Accounts that often change back off more slowly than
+    accounts that rarely do.
+- Every interval is jittered by `jitter`, so that many accounts watched together do
+    not poll in lockstep. Rate limited polls wait at least as long as the `Retry-After`
+    of the response.
+
+Each poll is compared to the state seen so far, and turned into change events, like
+`TaskCreated`, `TaskCompleted`, or `ProjectDeleted`. The first poll of an account only
+records its state, without emitting events. Events are passed to the callbacks added
+with `subscribe`, and to the async iterators returned by `events`.
+
+A single watcher can watch many accounts, each with its own client. The blocking
+requests are sent in threads, while the polls are scheduled on an asyncio event loop.
+
+!!! example
+    ```python
+    import asyncio
+
+    from pyticktick import Client
+    from pyticktick.watcher import TaskCompleted, WatchConfig, Watcher
+
+
+    async def main():
+        watcher = Watcher(WatchConfig(min_interval=5, max_interval=300))
+        watcher.add_account("alice", Client(_env_file=".env.alice"))
+        watcher.add_account("bob", Client(_env_file=".env.bob"))
+        watcher.subscribe(print)
+
+        asyncio.create_task(watcher.run())
+        async for event in watcher.events():
+            if isinstance(event, TaskCompleted):
+                print(f"{event.account} completed {event.task.title}")
+
+
+    asyncio.run(main())
+    ```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from contextlib import suppress
+from typing import TYPE_CHECKING, NamedTuple, Union
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field
+
+from pyticktick.exceptions import RateLimitedError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from pyticktick.client import Client
+    from pyticktick.models.v2.models import ProjectV2, TagV2, TaskV2
+    from pyticktick.models.v2.responses.batch import GetBatchV2
+
+
+class TaskCreated(NamedTuple):
+    """A task was created."""
+
+    account: str
+    task: TaskV2
+
+
+class TaskUpdated(NamedTuple):
+    """A task was updated, without being completed."""
+
+    account: str
+    task: TaskV2
+
+
+class TaskCompleted(NamedTuple):
+    """A task was completed, or abandoned."""
+
+    account: str
+    task: TaskV2
+
+
+class TaskDeleted(NamedTuple):
+    """A task was deleted, or moved to the trash."""
+
+    account: str
+    task_id: str
+
+
+class ProjectCreated(NamedTuple):
+    """A project was created."""
+
+    account: str
+    project: ProjectV2
+
+
+class ProjectUpdated(NamedTuple):
+    """A project was updated."""
+
+    account: str
+    project: ProjectV2
+
+
+class ProjectDeleted(NamedTuple):
+    """A project was deleted, or archived."""
+
+    account: str
+    project_id: str
+
+
+class TagCreated(NamedTuple):
+    """A tag was created."""
+
+    account: str
+    tag: TagV2
+
+
+class TagUpdated(NamedTuple):
+    """A tag was updated."""
+
+    account: str
+    tag: TagV2
+
+
+class TagDeleted(NamedTuple):
+    """A tag was deleted."""
+
+    account: str
+    name: str
+
+
+ChangeEvent = Union[  # noqa: UP007
+    TaskCreated,
+    TaskUpdated,
+    TaskCompleted,
+    TaskDeleted,
+    ProjectCreated,
+    ProjectUpdated,
+    ProjectDeleted,
+    TagCreated,
+    TagUpdated,
+    TagDeleted,
+]
+"""Any of the change events emitted by a `Watcher`."""
+
+
+class WatchConfig(BaseModel):
+    """Configuration of the poll intervals of a `Watcher`."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    min_interval: float = Field(
+        default=5,
+        gt=0,
+        description="The interval, in seconds, between polls after changes were found.",
+    )
+    max_interval: float = Field(
+        default=300,
+        gt=0,
+        description="The maximum interval, in seconds, between polls of an idle account.",  # noqa: E501
+    )
+    backoff: float = Field(
+        default=2,
+        ge=1,
+        description="The maximum factor the interval grows by after an idle poll.",
+    )
+    jitter: float = Field(
+        default=0.2,
+        ge=0,
+        lt=1,
+        description="The relative amount of randomness added to each interval.",
+    )
+    smoothing: float = Field(
+        default=0.3,
+        gt=0,
+        le=1,
+        description="The weight of the latest poll in the observed change rate.",
+    )
+
+
+class _Account:
+    def __init__(self, name: str, client: Client, interval: float) -> None:
+        self.name = name
+        self.client = client
+        self.check_point = 0
+        self.tasks: dict[str, tuple[str, int]] = {}
+        self.projects: dict[str, str] = {}
+        self.tags: dict[str, str] = {}
+        self.interval = interval
+        self.activity = 0.0
+
+    def _diff_tasks(self, batch: GetBatchV2) -> list[ChangeEvent]:
+        events: list[ChangeEvent] = []
+        for task in batch.sync_task_bean.update:
+            previous = self.tasks.get(task.id)
+            self.tasks[task.id] = (task.etag, task.status)
+            if previous is None:
+                events.append(TaskCreated(self.name, task))
+            elif previous[0] == task.etag:
+                continue
+            elif previous[1] == 0 and task.status != 0:
+                events.append(TaskCompleted(self.name, task))
+            else:
+                events.append(TaskUpdated(self.name, task))
+        events.extend(
+            TaskDeleted(self.name, task_id)
+            for task_id in batch.sync_task_bean.deleted_ids
+            if self.tasks.pop(task_id, None) is not None
+        )
+        return events
+
+    def _diff_objects(
+        self,
+        seen: dict[str, str],
+        objects: dict[str, ProjectV2 | TagV2],
+        events: tuple[Callable[..., ChangeEvent], ...],
+    ) -> list[ChangeEvent]:
+        # Projects and tags are always returned in full, so missing ones were deleted.
+        created, updated, deleted = events
+        changes = [
+            (created if seen.get(key) is None else updated)(self.name, obj)
+            for key, obj in objects.items()
+            if seen.get(key) != obj.etag
+        ]
+        changes.extend(deleted(self.name, key) for key in seen if key not in objects)
+        return changes
+
+    def diff(self, batch: GetBatchV2) -> list[ChangeEvent]:
+        initial = self.check_point == 0
+        projects: dict[str, ProjectV2 | TagV2] = {
+            p.id: p for p in batch.project_profiles
+        }
+        tags: dict[str, ProjectV2 | TagV2] = {t.name: t for t in batch.tags}
+        events = [
+            *self._diff_tasks(batch),
+            *self._diff_objects(
+                self.projects,
+                projects,
+                (ProjectCreated, ProjectUpdated, ProjectDeleted),
+            ),
+            *self._diff_objects(self.tags, tags, (TagCreated, TagUpdated, TagDeleted)),
+        ]
+        self.projects = {k: p.etag for k, p in projects.items()}
+        self.tags = {k: t.etag for k, t in tags.items()}
+        self.check_point = batch.check_point
+        return [] if initial else events
+
+
+def _put_threadsafe(
+    loop: asyncio.AbstractEventLoop,
+    queue: asyncio.Queue[ChangeEvent | None],
+    event: ChangeEvent | None,
+) -> None:
+    # `asyncio.Queue` is not thread-safe, so events are put on it from its own loop.
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+    except RuntimeError:
+        logger.debug("Dropping an event, the loop of its iterator is closed")
+
+
+class Watcher:
+    """Poller of one or more accounts, emitting the changes it finds as events.
+
+    Attributes:
+        config (WatchConfig): The configuration of the poll intervals.
+    """
+
+    def __init__(self, config: WatchConfig | None = None) -> None:
+        """Initialize a watcher without any account.
+
+        Args:
+            config (WatchConfig | None): The configuration of the poll intervals.
+                Defaults to `None`, which uses the default configuration.
+        """
+        self.config = config or WatchConfig()
+        self._accounts: dict[str, _Account] = {}
+        self._callbacks: list[Callable[[ChangeEvent], object]] = []
+        # The queue of each event iterator, with the event loop it runs on, as events
+        # are dispatched from the polling threads.
+        self._queues: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.Queue[ChangeEvent | None]]
+        ] = []
+        self._random = random.Random()  # noqa: S311
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._accounts)
+
+    def add_account(self, name: str, client: Client) -> None:
+        """Start watching an account.
+
+        Args:
+            name (str): The name of the account, set as the `account` of its events.
+            client (Client): The client of the account.
+
+        Raises:
+            ValueError: If an account with the same name is already watched.
+        """
+        if name in self._accounts:
+            msg = f"Account `{name}` is already watched"
+            logger.error(msg)
+            raise ValueError(msg)
+        self._accounts[name] = _Account(name, client, self.config.min_interval)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start, name)
+
+    def remove_account(self, name: str) -> None:
+        """Stop watching an account, if it is watched.
+
+        Args:
+            name (str): The name of the account.
+        """
+        self._accounts.pop(name, None)
+        task = self._tasks.pop(name, None)
+        if task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    def subscribe(self, callback: Callable[[ChangeEvent], object]) -> None:
+        """Call a function with every event, in the order they are found.
+
+        Callbacks are called from the thread that polls, or from the event loop when
+        the watcher is run. Errors raised by a callback are logged and ignored.
+
+        Args:
+            callback (Callable[[ChangeEvent], object]): The function to call.
+        """
+        self._callbacks.append(callback)
+
+    def interval(self, name: str) -> float:
+        """Get the current poll interval of an account, before jitter.
+
+        Args:
+            name (str): The name of the account.
+
+        Returns:
+            float: The interval, in seconds.
+        """
+        return self._accounts[name].interval
+
+    def _next_interval(
+        self, account: _Account, changes: int, error: Exception | None
+    ) -> float:
+        config = self.config
+        active = float(changes > 0)
+        account.activity += config.smoothing * (active - account.activity)
+        if changes:
+            account.interval = config.min_interval
+        else:
+            # The more often an account has changed lately, the slower it backs off.
+            factor = 1 + (config.backoff - 1) * (1 - account.activity)
+            account.interval = min(account.interval * factor, config.max_interval)
+        interval = account.interval * self._random.uniform(
+            1 - config.jitter,
+            1 + config.jitter,
+        )
+        if isinstance(error, RateLimitedError) and error.retry_after is not None:
+            interval = max(interval, error.retry_after)
+        return interval
+
+    def _fetch(self, name: str) -> tuple[list[ChangeEvent], float]:
+        account = self._accounts[name]
+        error = None
+        events: list[ChangeEvent] = []
+        try:
+            batch = account.client.get_batch_v2(check_point=account.check_point)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Polling account `{name}` failed: {e}")
+            error = e
+        else:
+            events = account.diff(batch)
+        interval = self._next_interval(account, len(events), error)
+        logger.debug(
+            f"Polled account `{name}`, {len(events)} changes, next poll in "
+            f"{interval:.1f}s",
+        )
+        return events, interval
+
+    def _dispatch(self, events: list[ChangeEvent]) -> None:
+        for event in events:
+            for callback in self._callbacks:
+                try:
+                    callback(event)
+                except Exception:  # noqa: BLE001, PERF203
+                    logger.exception(f"Callback {callback!r} failed on {event!r}")
+            for loop, queue in self._queues:
+                _put_threadsafe(loop, queue, event)
+
+    def poll(self, name: str) -> list[ChangeEvent]:
+        """Poll an account once, and dispatch the events found.
+
+        Args:
+            name (str): The name of the account.
+
+        Returns:
+            list[ChangeEvent]: The events found by the poll.
+        """
+        events, _ = self._fetch(name)
+        self._dispatch(events)
+        return events
+
+    async def _watch(self, name: str) -> None:
+        stop = self._stop
+        while name in self._accounts and stop is not None and not stop.is_set():
+            events, interval = await asyncio.to_thread(self._fetch, name)
+            self._dispatch(events)
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+
+    def _start(self, name: str) -> None:
+        if name in self._accounts and name not in self._tasks:
+            self._tasks[name] = asyncio.ensure_future(self._watch(name))
+
+    async def run(self) -> None:
+        """Poll every account, until `stop` is called.
+
+        Accounts added while the watcher runs are polled as soon as they are added.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for name in self._accounts:
+            self._start(name)
+        try:
+            await self._stop.wait()
+        finally:
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks.clear()
+            self._loop = self._stop = None
+            for loop, queue in self._queues:
+                _put_threadsafe(loop, queue, None)
+
+    def stop(self) -> None:
+        """Stop a running watcher, and end its event iterators.
+
+        This can be called from any thread.
+        """
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    async def events(self) -> AsyncIterator[ChangeEvent]:
+        """Iterate over the events found from now on, until the watcher stops.
+
+        Yields:
+            ChangeEvent: The events, in the order they are found.
+        """
+        queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue()
+        entry = (asyncio.get_running_loop(), queue)
+        self._queues.append(entry)
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            self._queues.remove(entry)
@@ -1,8 +1,10 @@
 from collections.abc import Callable
 from time import time
+from typing import Any
 from uuid import uuid4
 
 import pytest
+from bson import ObjectId
 
 from pyticktick.models.v2 import UserSignOnV2
 
@@ -75,3 +77,60 @@ def test_v2_usersignonv2(test_v2_username, test_v2_token) -> UserSignOnV2:
             "registerDate": "2000-01-01T01:01:01.000+0000",
         },
     )
+
+
+@pytest.fixture()
+def test_task_v2_data() -> Callable[..., dict[str, Any]]:
+    def _test_task_v2_data(**kwargs: Any) -> dict[str, Any]:
+        return {
+            "id": str(ObjectId()),
+            "etag": "abcd1234",
+            "isFloating": False,
+            "items": [],
+            "modifiedTime": "2025-04-15T15:15:35.000+0000",
+            "priority": 0,
+            "projectId": "inbox123",
+            "status": 0,
+            "title": "Test Task",
+            "creator": 123,
+            "deleted": 0,
+            "sortOrder": 0,
+            **kwargs,
+        }
+
+    return _test_task_v2_data
+
+
+@pytest.fixture()
+def test_batch_v2_data() -> Callable[..., dict[str, Any]]:
+    def _test_batch_v2_data(
+        tasks: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        return {
+            "inboxId": "inbox123",
+            "projectGroups": None,
+            "projectProfiles": [],
+            "syncTaskBean": {
+                "update": tasks or [],
+                "add": [],
+                "delete": [],
+                "empty": False,
+                "tagUpdate": [],
+            },
+            "tags": [],
+            "checkPoint": 1,
+            "checks": None,
+            "filters": None,
+            "syncOrderBean": {},
+            "syncOrderBeanV3": {"orderByType": {}},
+            "syncTaskOrderBean": {
+                "taskOrderByDate": {},
+                "taskOrderByPriority": {},
+                "taskOrderByProject": {},
+            },
+            "remindChanges": [],
+            **kwargs,
+        }
+
+    return _test_batch_v2_data
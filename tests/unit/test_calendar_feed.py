@@ -0,0 +1,137 @@
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from icalendar import Calendar
+
+from pyticktick.calendar_feed import CalendarFeed, task_component
+from pyticktick.models.v2 import GetBatchV2, TaskV2
+
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+
+
+@pytest.fixture()
+def test_tasks(test_task_v2_data) -> list[TaskV2]:
+    return [
+        TaskV2.model_validate(
+            test_task_v2_data(
+                id=A,
+                title="Standup",
+                content="Daily sync",
+                startDate="2025-04-15T13:00:00.000+0000",
+                dueDate="2025-04-15T13:30:00.000+0000",
+                timeZone="America/New_York",
+                repeatFlag="RRULE:FREQ=MONTHLY;INTERVAL=1;TT_WORKDAY=-1",
+                reminders=[{"trigger": "TRIGGER:-PT5M"}],
+                priority=5,
+                tags=["work"],
+            ),
+        ),
+        TaskV2.model_validate(
+            test_task_v2_data(
+                id=B,
+                title="Birthday",
+                dueDate="2025-04-16T04:00:00.000+0000",
+                startDate="2025-04-16T04:00:00.000+0000",
+                isAllDay=True,
+                timeZone="America/New_York",
+                repeatFlag="ERULE:NAME=CUSTOM;BYDATE=20250416,20260416",
+            ),
+        ),
+        TaskV2.model_validate(test_task_v2_data(id=C, title="Someday")),
+    ]
+
+
+def test_task_component_todo(test_tasks):
+    todo = task_component(test_tasks[0])
+    assert todo.name == "VTODO"
+    assert str(todo["UID"]) == A
+    assert str(todo["DESCRIPTION"]) == "Daily sync"
+    new_york = ZoneInfo("America/New_York")
+    assert todo.decoded("DTSTART") == datetime(2025, 4, 15, 9, tzinfo=new_york)
+    assert todo.decoded("DUE") == datetime(2025, 4, 15, 9, 30, tzinfo=new_york)
+    assert (
+        todo["RRULE"].to_ical()
+        == b"FREQ=MONTHLY;INTERVAL=1;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1"
+    )
+    assert todo["PRIORITY"] == 1
+    assert str(todo["STATUS"]) == "NEEDS-ACTION"
+    (alarm,) = todo.subcomponents
+    assert alarm.decoded("TRIGGER") == timedelta(minutes=-5)
+
+    all_day = task_component(test_tasks[1])
+    assert all_day.decoded("DTSTART") == date(2025, 4, 16)
+    assert "DUE" not in all_day
+    assert b"RDATE;VALUE=DATE:20250416,20260416" in all_day.to_ical()
+
+
+def test_task_component_event(test_tasks):
+    event = task_component(test_tasks[1], "VEVENT")
+    assert event.name == "VEVENT"
+    assert event.decoded("DTSTART") == date(2025, 4, 16)
+    assert event.decoded("DTEND") == date(2025, 4, 17)
+    assert task_component(test_tasks[2], "VEVENT") is None
+
+
+def test_calendar_feed(test_tasks, test_task_v2_data, test_batch_v2_data):
+    feed = CalendarFeed(test_tasks, name="Tasks")
+    assert len(feed) == 3
+    assert feed.rebuilt == 3
+    ics = feed.to_ical()
+    calendar = Calendar.from_ical(ics)
+    assert str(calendar["X-WR-CALNAME"]) == "Tasks"
+    assert [str(c["UID"]) for c in calendar.walk("VTODO")] == [A, B, C]
+    etag = feed.etag
+    assert feed.to_ical() is ics
+    assert feed.not_modified(etag)
+    assert feed.not_modified(f'W/{etag}, "other"')
+    assert not feed.not_modified(None)
+
+    # unchanged tasks are not rebuilt, and leave the feed untouched
+    feed.apply_batch(
+        GetBatchV2.model_validate(
+            test_batch_v2_data(tasks=[test_tasks[0].model_dump(by_alias=True)]),
+        ),
+    )
+    assert feed.rebuilt == 3
+    assert feed.etag == etag
+
+    batch = test_batch_v2_data(
+        tasks=[test_task_v2_data(id=C, title="Today", etag="efgh5678")],
+    )
+    batch["syncTaskBean"]["delete"] = [{"taskId": B}]
+    feed.apply_batch(GetBatchV2.model_validate(batch))
+    assert feed.rebuilt == 4
+    assert len(feed) == 2
+    assert feed.etag != etag
+    assert not feed.not_modified(etag)
+    summaries = [
+        str(c["SUMMARY"]) for c in Calendar.from_ical(feed.to_ical()).walk("VTODO")
+    ]
+    assert summaries == ["Standup", "Today"]
+
+
+def test_calendar_feed_timezones(test_tasks, test_task_v2_data):
+    tokyo = TaskV2.model_validate(
+        test_task_v2_data(
+            startDate="2025-04-15T01:00:00.000+0000",
+            timeZone="Asia/Tokyo",
+        ),
+    )
+    feed = CalendarFeed([*test_tasks, tokyo])
+    calendar = Calendar.from_ical(feed.to_ical())
+    assert calendar.get_used_tzids() == {"America/New_York", "Asia/Tokyo"}
+    assert calendar.get_missing_tzids() == set()
+    assert [str(tz["TZID"]) for tz in calendar.walk("VTIMEZONE")] == [
+        "America/New_York",
+        "Asia/Tokyo",
+    ]
+
+    # time zones that are no longer used are dropped from the feed
+    feed.remove_task(tokyo.id)
+    feed.remove_task(A)
+    calendar = Calendar.from_ical(feed.to_ical())
+    assert calendar.get_used_tzids() == set()
+    assert calendar.walk("VTIMEZONE") == []
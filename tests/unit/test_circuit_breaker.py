@@ -0,0 +1,112 @@
+import httpx
+import pytest
+
+from pyticktick.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    is_failure,
+)
+from pyticktick.exceptions import AuthExpiredError, QuotaExceededError, ServerError
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.ticktick.com/api/v2/")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (_status_error(500), True),
+        (_status_error(503), True),
+        (_status_error(429), True),
+        (_status_error(404), False),
+        (httpx.ReadTimeout("timed out"), True),
+        (httpx.ConnectError("refused"), True),
+        (ValueError("oops"), False),
+        (ServerError(502, "Bad Gateway"), True),
+        (QuotaExceededError(500, "exceed_query_limit"), True),
+        (AuthExpiredError(401, "Unauthorized"), False),
+    ],
+)
+def test_is_failure(error, expected):
+    assert is_failure(error) is expected
+
+
+def test_circuit_breaker(mocker):
+    now = mocker.patch("pyticktick.circuit_breaker.monotonic", return_value=0.0)
+    changes = []
+    breaker = CircuitBreaker(
+        "v2",
+        CircuitBreakerConfig(
+            failure_ratio=0.5,
+            window_size=4,
+            min_calls=4,
+            reset_timeout=10,
+            half_open_calls=2,
+            on_state_change=lambda *args: changes.append(args),
+        ),
+    )
+    for success in (True, False, True):
+        breaker.before_call()
+        breaker.record(success=success, duration=0.1)
+    assert breaker.state == "closed"
+    assert breaker.failure_ratio == pytest.approx(1 / 3)
+
+    breaker.before_call()
+    breaker.record(success=False, duration=0.1)
+    assert breaker.state == "open"
+    with pytest.raises(
+        CircuitOpenError, match=r"Circuit `v2` is open, retry in 10\.0s"
+    ):
+        breaker.before_call()
+
+    now.return_value = 10.0
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError, match="waiting on its probes"):
+        breaker.before_call()
+    breaker.record(success=True, duration=0.1)
+    breaker.record(success=False, duration=0.1)
+    assert breaker.state == "open"
+
+    now.return_value = 20.0
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record(success=True, duration=0.1)
+    assert breaker.state == "closed"
+    assert breaker.failure_ratio == 0
+    assert changes == [
+        ("v2", "closed", "open"),
+        ("v2", "open", "half_open"),
+        ("v2", "half_open", "open"),
+        ("v2", "open", "half_open"),
+        ("v2", "half_open", "closed"),
+    ]
+
+
+def test_circuit_breaker_guard():
+    breaker = CircuitBreaker(
+        "v1",
+        CircuitBreakerConfig(min_calls=2, window_size=2, slow_call_duration=1),
+    )
+    with pytest.raises(httpx.HTTPStatusError), breaker.guard():
+        raise _status_error(404)
+    assert breaker.failure_ratio == 0
+
+    with pytest.raises(httpx.HTTPStatusError), breaker.guard():
+        raise _status_error(502)
+    assert breaker.state == "open"
+
+    breaker = CircuitBreaker("v1", CircuitBreakerConfig(min_calls=1))
+    breaker.record(success=True, duration=0.5)
+    assert breaker.state == "closed"
+    breaker = CircuitBreaker(
+        "v1",
+        CircuitBreakerConfig(min_calls=1, slow_call_duration=1),
+    )
+    breaker.record(success=True, duration=2)
+    assert breaker.state == "open"
@@ -1,6 +1,22 @@
+import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from threading import Event
+
+import httpx
 import pytest
+from loguru import logger
+from pydantic import ValidationError
 
 from pyticktick import Client
+from pyticktick import client as client_module
+from pyticktick.circuit_breaker import CircuitBreakerConfig, CircuitOpenError
+from pyticktick.deadline import DeadlineExceededError, deadline
+from pyticktick.exceptions import RateLimitedError
+from pyticktick.models.v2 import PostBatchTagV2, PostBatchTaskV2, TaskV2
+from pyticktick.pydantic import update_model_config
+from pyticktick.response_cache import CacheStats, ResponseCacheConfig
 from pyticktick.settings import TokenV1
 
 
@@ -25,3 +41,383 @@ def test_client(
         v2_password=test_v2_password,
         v2_token=test_v2_token,
     )
+
+
+@pytest.mark.parametrize("validation_workers", [1, 2])
+def test_get_batch_v2_validation_workers(
+    mocker,
+    test_client,
+    test_task_v2_data,
+    test_batch_v2_data,
+    validation_workers,
+):
+    test_client.validation_workers = validation_workers
+    executor = mocker.spy(client_module, "validation_executor")
+    tasks = [test_task_v2_data(title=f"Task {i}") for i in range(2500)]
+    mocker.patch.object(
+        Client,
+        "_get_api_v2",
+        side_effect=lambda *_: test_batch_v2_data(tasks=deepcopy(tasks)),
+    )
+    batch = test_client.get_batch_v2()
+    assert [t.title for t in batch.sync_task_bean.update] == [t["title"] for t in tasks]
+
+    tasks[2000]["etag"] = "invalid"
+    with pytest.raises(ValidationError, match=r"syncTaskBean\.update\.2000\.etag"):
+        test_client.get_batch_v2()
+
+    # The pool of workers is shared by all the calls, until the client is closed.
+    assert executor.call_count == (1 if validation_workers > 1 else 0)
+    test_client.close()
+    assert test_client._validation_pool is None
+
+
+def test_list_responses(mocker, test_client, test_task_v2_data):
+    project = {"id": "abc123", "name": "Project", "kind": "TASK", "sortOrder": 0}
+    mocker.patch.object(Client, "_get_api_v1", side_effect=lambda _: [project])
+    task = test_task_v2_data(status=2)
+    mocker.patch.object(Client, "_get_api_v2", side_effect=lambda *_, **__: [task])
+
+    projects = test_client.get_projects_list_v1()
+    assert type(projects) is list
+    assert [p.id for p in projects] == ["abc123"]
+    assert test_client.get_projects_v1().root == projects
+
+    tasks = test_client.get_project_all_closed_list_v2({"status": "Completed"})
+    assert type(tasks) is list
+    assert [t.status for t in tasks] == [2]
+    closed = test_client.get_project_all_closed_v2({"status": "Completed"})
+    assert closed.root == tasks
+
+
+def test_list_responses_override_forbid_extra(mocker, test_client, test_task_v2_data):
+    task = test_task_v2_data(status=2, newField="new")
+    mocker.patch.object(Client, "_get_api_v2", side_effect=lambda *_, **__: [task])
+    with pytest.raises(ValidationError, match="newField"):
+        test_client.get_project_all_closed_list_v2({"status": "Completed"})
+
+    test_client.override_forbid_extra = True
+    try:
+        (closed,) = test_client.get_project_all_closed_list_v2({"status": "Completed"})
+        assert closed.newField == "new"
+    finally:
+        update_model_config(TaskV2, extra="forbid")
+
+
+def test_request_sends_model_json(mocker, test_client):
+    request = mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            200,
+            content=b'{"id2etag": {}, "id2error": {}}',
+            request=httpx.Request("POST", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    data = PostBatchTagV2.model_validate({"add": [{"label": "Work"}]})
+    resp = test_client._post_api_v2("/batch/tag", data=data)
+    assert resp == {"id2etag": {}, "id2error": {}}
+    kwargs = request.call_args.kwargs
+    assert kwargs["content"] == data.model_dump_json(by_alias=True).encode()
+    assert kwargs["headers"]["Content-Type"] == "application/json"
+
+
+def test_post_without_validation(mocker, test_client):
+    request = mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            200,
+            content=b'{"id2etag": {}, "id2error": {}}',
+            request=httpx.Request("POST", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    model = PostBatchTaskV2.model_validate(
+        {"add": [{"project_id": "inbox123", "title": "Task"}]},
+    )
+    wire = model.model_dump(by_alias=True, mode="json")
+    with pytest.raises(ValidationError, match=r"add\.0\.projectId"):
+        test_client.post_task_v2(wire)
+
+    test_client.post_task_v2(wire, validate=False)
+    content = request.call_args.kwargs["content"]
+    assert json.loads(content) == json.loads(model.model_dump_json(by_alias=True))
+
+    test_client.post_task_v2(model, validate=False)
+    expected = model.model_dump_json(by_alias=True).encode()
+    assert request.call_args.kwargs["content"] == expected
+
+
+def test_request_errors(mocker, test_client):
+    mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            500,
+            content=b"oops",
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    with pytest.raises(ValueError, match=r"Response \[500\]: oops"):
+        test_client._get_api_v2("/batch/check/0")
+
+    mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            200,
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    with pytest.raises(ValueError, match="Response content is empty"):
+        test_client._get_api_v2("/batch/check/0")
+
+
+def test_http_client(mocker, test_client):
+    mocker.patch("pyticktick.client.find_spec", return_value=None)
+    assert test_client.accept_encoding == "gzip, deflate"
+    test_client.http_compression = False
+    assert test_client.accept_encoding == "identity"
+
+    with test_client:
+        http_client = test_client.http_client
+        assert test_client.http_client is http_client
+        assert http_client.headers["Accept-Encoding"] == "identity"
+    assert http_client.is_closed
+    assert test_client.http_client is not http_client
+
+    test_client.close()
+    test_client.http2 = True
+    with pytest.raises(ValueError, match="`http2` requires the `h2` package"):
+        _ = test_client.http_client
+
+
+def test_http_client_ignores_cookies(mocker, test_client, test_v2_token):
+    sent = []
+
+    def _handle(_, request):
+        sent.append(request.headers.get("Cookie"))
+        return httpx.Response(
+            200,
+            content=b"{}",
+            headers={"Set-Cookie": "t=evil; Path=/"},
+            request=request,
+        )
+
+    mocker.patch.object(httpx.HTTPTransport, "handle_request", _handle)
+    test_client._get_api_v2("/user/status")
+    test_client._get_api_v2("/user/status")
+    test_client._get_api_v1("/project")
+    assert sent == [f"t={test_v2_token}", f"t={test_v2_token}", None]
+    assert not test_client.http_client.cookies
+
+
+def test_client_copy_and_pickle(mocker, test_client):
+    mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            200,
+            content=b"[]",
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    test_client.response_cache = ResponseCacheConfig()
+    test_client.circuit_breaker = CircuitBreakerConfig()
+    test_client._get_api_v2("/projects")
+    test_client._cached_get("get_projects_v2", test_client._get_api_v2, "/projects")
+
+    pickled = pickle.loads(pickle.dumps(test_client))  # noqa: S301
+    for copied in (deepcopy(test_client), pickled):
+        assert copied.model_dump() == test_client.model_dump()
+        assert copied.v2_token == test_client.v2_token
+        # the runtime state is not copied, it is created again when needed
+        assert copied._http_client is None
+        assert copied._response_cache is None
+        assert copied.circuit_breakers == {}
+        assert copied._http_client_lock is not test_client._http_client_lock
+        assert copied._single_flight is not test_client._single_flight
+        assert copied._get_api_v2("/projects") == []
+    test_client.close()
+
+
+def test_http_client_is_created_once(test_client):
+    with ThreadPoolExecutor(8) as executor:
+        clients = list(executor.map(lambda _: test_client.http_client, range(32)))
+    assert all(client is clients[0] for client in clients)
+    test_client.close()
+
+
+def test_request_timeout(mocker, test_client):
+    request = mocker.patch(
+        "httpx.Client.request",
+        side_effect=httpx.ReadTimeout("timed out"),
+    )
+    with pytest.raises(httpx.ReadTimeout):
+        test_client._get_api_v2("/batch/check/0")
+    assert request.call_args.kwargs["timeout"] is httpx.USE_CLIENT_DEFAULT
+
+    test_client.request_timeout = 2
+    with pytest.raises(DeadlineExceededError):
+        test_client._get_api_v2("/batch/check/0")
+    assert 0 < request.call_args.kwargs["timeout"] <= 2
+
+    with deadline(-1), pytest.raises(DeadlineExceededError, match="exceeded by"):
+        test_client._get_api_v2("/batch/check/0")
+    assert request.call_count == 2
+
+
+def test_circuit_breaker(mocker, test_client):
+    request = mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            503,
+            content=b"unavailable",
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    with pytest.raises(ValueError, match=r"Response \[503\]"):
+        test_client._get_api_v2("/batch/check/0")
+    assert test_client.circuit_breakers == {}
+
+    test_client.circuit_breaker = CircuitBreakerConfig(
+        min_calls=2,
+        window_size=2,
+        per_endpoint=True,
+    )
+    for _ in range(2):
+        with pytest.raises(ValueError, match=r"Response \[503\]"):
+            test_client._get_api_v2("/batch/check/0")
+    with pytest.raises(CircuitOpenError, match="Circuit `v2/batch` is open"):
+        test_client._get_api_v2("/batch/check/0")
+    assert request.call_count == 3
+
+    with pytest.raises(ValueError, match=r"Response \[503\]"):
+        test_client._get_api_v2("/user/profile")
+    assert {k: v.state for k, v in test_client.circuit_breakers.items()} == {
+        "v2/batch": "open",
+        "v2/user": "closed",
+    }
+
+
+def test_response_cache(mocker, test_client):
+    project = {"id": "abc123", "name": "Project", "kind": "TASK", "sortOrder": 0}
+    get = mocker.patch.object(Client, "_get_api_v1", side_effect=lambda _: [project])
+    post = mocker.patch.object(Client, "_post_api_v1", return_value=project)
+
+    test_client.get_projects_v1()
+    test_client.get_projects_v1()
+    assert get.call_count == 2
+    assert test_client.cache_stats is None
+
+    test_client.response_cache = ResponseCacheConfig(ttls={"get_projects_v1": 60})
+    first = test_client.get_projects_v1()
+    second = test_client.get_projects_v1()
+    assert get.call_count == 3
+    assert first == second
+    assert first is not second
+
+    test_client.create_project_v1({"name": "Project"})
+    assert post.call_count == 1
+    test_client.get_projects_v1()
+    assert get.call_count == 4
+    assert test_client.cache_stats == CacheStats(
+        hits=1,
+        misses=2,
+        evictions=0,
+        invalidations=1,
+        size=1,
+    )
+
+    test_client.clear_response_cache()
+    test_client.get_projects_v1()
+    assert get.call_count == 5
+
+
+def test_coalesce_reads(mocker, test_client):
+    started, release = Event(), Event()
+
+    def _get(*_: object) -> dict:
+        started.set()
+        release.wait(5)
+        return {"score": 10}
+
+    get = mocker.patch.object(Client, "_get_api_v2", side_effect=_get)
+    mocker.patch("pyticktick.client.UserStatisticsV2.model_validate", side_effect=dict)
+    test_client.coalesce_reads = True
+    with ThreadPoolExecutor(3) as executor:
+        futures = [executor.submit(test_client.get_statistics_v2)]
+        started.wait(5)
+        futures += [executor.submit(test_client.get_statistics_v2) for _ in range(2)]
+        (call,) = test_client._single_flight._calls.values()
+        while call.waiters < 2:
+            pass
+        release.set()
+        results = [f.result(5) for f in futures]
+    assert get.call_count == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_request_error_logs(mocker, test_client):
+    mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            500,
+            content=b"x" * 100,
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    records = []
+    handler_id = logger.add(records.append, format="{message}")
+    test_client.log_body_limit = 10
+    with pytest.raises(ValueError, match=r"Response \[500\]: x{100}"):
+        test_client._get_api_v2("/batch/check/0")
+    logger.remove(handler_id)
+
+    (record,) = [r.record for r in records]
+    assert record["message"] == "Response [500]: xxxxxxxxxx... (90 more characters)"
+    assert record["extra"]["endpoint"] == "/api/v2/batch/check/0"
+    assert record["extra"]["status"] == 500
+    assert record["extra"]["duration"] >= 0
+
+
+def test_log_sink(mocker, test_client, tmp_path):
+    mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            500,
+            content=b"oops",
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    path = str(tmp_path / "pyticktick.log")
+    settings = test_client.model_dump() | {"log_sink": path, "log_sink_level": "ERROR"}
+    client = Client(**settings)
+    Client(**settings)
+    with pytest.raises(ValueError, match=r"Response \[500\]: oops"):
+        client._get_api_v2("/batch/check/0")
+    logger.remove(client_module.shared_sink(path, level="ERROR"))
+
+    # Both clients share a single sink, so the error is only written once.
+    (line,) = (tmp_path / "pyticktick.log").read_text().splitlines()
+    record = json.loads(line)["record"]
+    assert record["message"] == "Response [500]: oops"
+    assert record["extra"]["status"] == 500
+
+
+def test_request_typed_errors(mocker, test_client):
+    mocker.patch(
+        "httpx.Client.request",
+        return_value=httpx.Response(
+            429,
+            headers={"Retry-After": "7"},
+            content=b'{"errorCode": "too_many_requests"}',
+            request=httpx.Request("GET", "https://api.ticktick.com/api/v2/"),
+        ),
+    )
+    with pytest.raises(RateLimitedError) as e:
+        test_client._get_api_v2("/batch/check/0")
+    assert e.value.status == 429
+    assert e.value.endpoint == "/api/v2/batch/check/0"
+    assert e.value.error_code == "too_many_requests"
+    assert e.value.retry_after == 7
+
+    test_client.max_retry_after = 5
+    with pytest.raises(RateLimitedError) as e:
+        test_client._get_api_v2("/batch/check/0")
+    assert e.value.retry_after == 5
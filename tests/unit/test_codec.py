@@ -0,0 +1,36 @@
+import pytest
+
+from pyticktick.codec import get_codec
+
+
+@pytest.fixture(autouse=True)
+def _clear_codec_cache():
+    get_codec.cache_clear()
+    yield
+    get_codec.cache_clear()
+
+
+@pytest.mark.parametrize("name", ["auto", "json"])
+def test_get_codec_round_trip(name):
+    codec = get_codec(name)
+    data = {"title": "Café", "items": [1, 2.5, None, True]}
+    encoded = codec.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == data
+    assert codec.loads(encoded.decode()) == data
+    with pytest.raises(codec.errors):
+        codec.loads(b"not json")
+
+
+def test_get_codec_orjson():
+    pytest.importorskip("orjson")
+    assert get_codec("auto").name == "orjson"
+    assert get_codec("orjson").name == "orjson"
+
+
+def test_get_codec_not_installed(mocker):
+    mocker.patch("pyticktick.codec.find_spec", return_value=None)
+    mocker.patch("pyticktick.codec.import_module", side_effect=ImportError)
+    assert get_codec("auto").name == "json"
+    with pytest.raises(ValueError, match="JSON codec `msgspec` is not installed"):
+        get_codec("msgspec")
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pyticktick.compact import (
+    CompactItemV2,
+    CompactTaskV2,
+    compact_tasks,
+    get_compact_tasks_v2,
+)
+from pyticktick.models.v2 import TaskV2
+
+
+def test_compact_task(test_task_v2_data):
+    data = test_task_v2_data(
+        kind="CHECKLIST",
+        dueDate="2025-04-16T04:00:00.000+0000",
+        timeZone="America/New_York",
+        tags=["work"],
+        items=[{"id": "67ec273212e1101e875f0b01", "title": "a", "status": 1}],
+        reminders=[{"trigger": "TRIGGER:-PT5M"}],
+    )
+    task = CompactTaskV2.from_dict(data)
+    model = TaskV2.model_validate(data)
+
+    for name in ["id", "project_id", "title", "kind", "status", "due_date"]:
+        assert getattr(task, name) == getattr(model, name)
+    assert task.tags == ("work",)
+    assert task.due_date == datetime(2025, 4, 16, 4, tzinfo=timezone.utc)
+    assert task.start_date is None
+    assert task.items == (
+        CompactItemV2(
+            id="67ec273212e1101e875f0b01",
+            title="a",
+            status=1,
+            completed_time=None,
+            start_date=None,
+            is_all_day=None,
+            sort_order=None,
+        ),
+    )
+    assert task.reminders == ("TRIGGER:-PT5M",)
+    assert task.to_model() == model
+    assert not hasattr(task, "__dict__")
+
+
+def test_compact_task_from_model(test_task_v2_data):
+    model = TaskV2.model_validate(test_task_v2_data())
+    task = CompactTaskV2.from_model(model)
+    assert task == CompactTaskV2.from_dict(test_task_v2_data(id=model.id))
+    assert task.to_model() == model
+
+
+def test_compact_tasks_share_strings(test_task_v2_data):
+    tasks = compact_tasks(
+        [test_task_v2_data(projectId="inbox123") for _ in range(2)],
+    )
+    assert tasks[0].project_id is tasks[1].project_id
+
+
+def test_get_compact_tasks_v2(mocker, test_task_v2_data, test_batch_v2_data):
+    client = mocker.Mock()
+    client.get_batch_raw_v2.return_value = test_batch_v2_data(
+        tasks=[test_task_v2_data()]
+    )
+    tasks = get_compact_tasks_v2(client, check_point=5)
+    client.get_batch_raw_v2.assert_called_once_with(5)
+    assert len(tasks) == 1
+
+
+def test_compact_task_without_raw(test_task_v2_data):
+    data = test_task_v2_data()
+    task = CompactTaskV2.from_dict(data, keep_raw=False)
+    assert task.raw is None
+    assert task == CompactTaskV2.from_dict(data)
+    with pytest.raises(ValueError, match="keep_raw=False"):
+        task.to_model()
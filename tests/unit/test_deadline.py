@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from pyticktick.deadline import (
+    DeadlineExceededError,
+    check_deadline,
+    deadline,
+    remaining,
+)
+
+
+def test_deadline_nesting():
+    assert remaining() is None
+    check_deadline(1000)
+
+    with deadline(10):
+        assert 9 < remaining() <= 10
+        with deadline(100):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        with deadline(None):
+            assert 9 < remaining() <= 10
+        check_deadline(5)
+        with pytest.raises(DeadlineExceededError, match="left before the deadline"):
+            check_deadline(20)
+    assert remaining() is None
+
+
+def test_deadline_exceeded():
+    with deadline(-1), pytest.raises(DeadlineExceededError, match="exceeded by"):
+        check_deadline()
+
+
+def test_deadline_propagates_to_tasks():
+    async def _remaining() -> float | None:
+        await asyncio.sleep(0)
+        return remaining()
+
+    async def _main() -> float | None:
+        with deadline(10):
+            return await asyncio.create_task(_remaining())
+
+    assert asyncio.run(_main()) <= 10
@@ -0,0 +1,82 @@
+import pickle
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from pyticktick.exceptions import (
+    AuthExpiredError,
+    QuotaExceededError,
+    RateLimitedError,
+    ServerError,
+    TickTickAPIError,
+    ValidationFailedError,
+    error_from_response,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    ("status", "body", "expected"),
+    [
+        (500, {"errorCode": "exceed_query_limit"}, QuotaExceededError),
+        (500, "exceed_query_limit", QuotaExceededError),
+        (429, "Too Many Requests", RateLimitedError),
+        (401, {"errorCode": "user_not_sign_on"}, AuthExpiredError),
+        (403, "Forbidden", AuthExpiredError),
+        (400, {"errorCode": "param_invalid"}, ValidationFailedError),
+        (422, "Unprocessable", ValidationFailedError),
+        (500, "oops", ServerError),
+        (503, "Service Unavailable", ServerError),
+        (404, "Not Found", TickTickAPIError),
+    ],
+)
+def test_error_from_response(status, body, expected):
+    error = error_from_response(status, body, method="GET", endpoint="/project")
+    assert type(error) is expected
+    assert isinstance(error, ValueError)
+    assert str(error) == f"Response [{status}]: {body}"
+    assert error.status == status
+    assert error.body == body
+    assert error.method == "GET"
+    assert error.endpoint == "/project"
+    assert error.error_code == (
+        body.get("errorCode") if isinstance(body, dict) else None
+    )
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("0") == 0
+    assert parse_retry_after("soon") is None
+    date = format_datetime(
+        datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True
+    )
+    assert 50 < parse_retry_after(date) <= 60
+    assert error_from_response(429, "", retry_after="5").retry_after == 5
+
+
+@pytest.mark.parametrize("value", ["-1", "nan", "inf", "-inf", "Infinity", "1e999"])
+def test_parse_retry_after_invalid(value):
+    assert parse_retry_after(value) is None
+    assert error_from_response(429, "", retry_after=value).retry_after is None
+
+
+def test_error_from_response_max_retry_after():
+    assert error_from_response(429, "", retry_after="86400").retry_after == 300
+    error = error_from_response(429, "", retry_after="86400", max_retry_after=60)
+    assert error.retry_after == 60
+    error = error_from_response(429, "", retry_after="86400", max_retry_after=None)
+    assert error.retry_after == 86400
+
+
+def test_pickle():
+    error = error_from_response(
+        429, {"errorCode": "x"}, endpoint="/batch", retry_after="5"
+    )
+    unpickled = pickle.loads(pickle.dumps(error))  # noqa: S301
+    assert type(unpickled) is RateLimitedError
+    assert str(unpickled) == str(error)
+    assert unpickled.__dict__ == error.__dict__
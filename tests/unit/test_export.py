@@ -0,0 +1,131 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pyticktick.client import Client
+from pyticktick.export import (
+    EARLIEST_CLOSED_TIME,
+    ExportSummary,
+    export_account,
+    export_accounts,
+)
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def client(mocker):
+    def _get_closed(params):
+        data = Client._model_dump(params)
+        return [{"id": f"{data['status']}-{data['from_']}"}]
+
+    client = mocker.Mock(json_codec="json")
+    client.get_batch_raw_v2.side_effect = lambda: {
+        "projectProfiles": [{"id": "p1"}, {"id": "p2"}],
+        "projectGroups": [{"id": "g1"}],
+        "tags": [{"name": "work"}],
+        "syncTaskBean": {"update": [{"id": "t1"}]},
+    }
+    client.get_project_all_closed_raw_v2.side_effect = _get_closed
+    return client
+
+
+def _read(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("name", ["export.ndjson", "export.ndjson.gz"])
+def test_export_account(mocker, client, tmp_path, name):
+    now = mocker.patch("pyticktick.export.datetime", wraps=datetime).now
+    now.return_value = SINCE + timedelta(days=45)
+    path = tmp_path / name
+    summary = export_account(client, path, since=SINCE, window=timedelta(days=30))
+    assert summary == ExportSummary(
+        projects=2,
+        project_groups=1,
+        tags=1,
+        tasks=1,
+        closed_tasks=4,
+        resumed=False,
+    )
+    lines = _read(path)
+    assert [line["type"] for line in lines] == [
+        "project",
+        "project",
+        "project_group",
+        "tag",
+        "task",
+        *["closed_task"] * 4,
+    ]
+    assert [line["data"]["id"] for line in lines[5:]] == [
+        "Completed-2025-01-01 00:00:00",
+        "Completed-2025-01-31 00:00:00",
+        "Abandoned-2025-01-01 00:00:00",
+        "Abandoned-2025-01-31 00:00:00",
+    ]
+    assert not path.with_name(f"{name}.checkpoint").exists()
+
+
+def test_export_account_default_since(mocker, client, tmp_path):
+    now = mocker.patch("pyticktick.export.datetime", wraps=datetime).now
+    now.return_value = EARLIEST_CLOSED_TIME + timedelta(days=65)
+    summary = export_account(client, tmp_path / "export.ndjson")
+    # the whole history is still requested in windows, from the earliest time
+    assert summary.closed_tasks == 6
+    params = [c.args[0] for c in client.get_project_all_closed_raw_v2.call_args_list]
+    assert [p.from_ for p in params[:3]] == [
+        EARLIEST_CLOSED_TIME + timedelta(days=d) for d in (0, 30, 60)
+    ]
+
+
+def test_export_account_resume(client, tmp_path):
+    path = tmp_path / "export.ndjson.gz"
+    get = client.get_project_all_closed_raw_v2.side_effect
+    failing = {"Abandoned"}
+
+    def _flaky(params):
+        if params.status in failing:
+            msg = "Response [500]: oops"
+            raise ValueError(msg)
+        return get(params)
+
+    client.get_project_all_closed_raw_v2.side_effect = _flaky
+    since = datetime.now(tz=timezone.utc) - timedelta(days=50)
+    with pytest.raises(ValueError, match="oops"):
+        export_account(client, path, since=since)
+    checkpoint = json.loads(path.with_name("export.ndjson.gz.checkpoint").read_text())
+    assert checkpoint["active"]
+    assert list(checkpoint["closed"]) == ["Completed"]
+
+    failing.clear()
+    summary = export_account(client, path, since=since)
+    assert summary.resumed
+    assert summary.tasks == 0
+    assert summary.closed_tasks == 2
+    lines = _read(path)
+    assert len(lines) == 9
+    assert len({line["data"].get("id") for line in lines[5:]}) == 4
+
+
+def test_export_accounts(mocker, client, tmp_path):
+    broken = mocker.Mock(json_codec="json")
+    broken.get_batch_raw_v2.side_effect = ValueError("Response [401]: expired")
+    paths = [tmp_path / "ok.ndjson", tmp_path / "broken.ndjson"]
+    with pytest.raises(ValueError, match="expired"):
+        export_accounts({paths[0]: client, paths[1]: broken}, closed=False, workers=2)
+    assert len(_read(paths[0])) == 5
+    assert not paths[0].with_name("ok.ndjson.checkpoint").exists()
+    assert not paths[1].with_name("broken.ndjson.checkpoint").exists()
+
+    summaries = export_accounts({paths[0]: client}, closed=False)
+    assert summaries[paths[0]].projects == 2
+
+
+def test_export_account_zstd(mocker, client, tmp_path):
+    mocker.patch("pyticktick.export.import_module", side_effect=ImportError)
+    with pytest.raises(ValueError, match="requires the `zstandard` package"):
+        export_account(client, tmp_path / "export.ndjson.zst")
@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pyticktick.importer import ImportPlan, import_plan
+
+CSV = """id,parent,project,title,tags,priority,due_date
+a,,Work,Task A,"Deep Work, urgent",5,2025-01-01T09:00:00+00:00
+b,a,,Subtask B,,,
+c,b,,Subtask C,,,
+d,,,Inbox task,,,
+"""
+
+ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//test//EN
+X-WR-CALNAME:Errands
+BEGIN:VTODO
+UID:parent@example.com
+SUMMARY:Groceries
+DESCRIPTION:Weekly shop
+DUE;VALUE=DATE:20250103
+PRIORITY:1
+CATEGORIES:Home,Food
+END:VTODO
+BEGIN:VTODO
+UID:child@example.com
+SUMMARY:Milk
+RELATED-TO;RELTYPE=PARENT:parent@example.com
+STATUS:COMPLETED
+COMPLETED:20250102T100000Z
+END:VTODO
+END:VCALENDAR
+"""
+
+
+def test_from_csv(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text(CSV)
+    plan = ImportPlan.from_csv(path, default_project="Inbox")
+    assert sorted(p.name for p in plan.projects) == ["Inbox", "Work"]
+    projects = {p.name: p.id for p in plan.projects}
+    tasks = {t.title: t for t in plan.tasks}
+    assert tasks["Task A"].tags == ["deep", "work", "urgent"]
+    assert tasks["Task A"].priority == 5
+    assert tasks["Subtask C"].project_id == projects["Work"]
+    assert tasks["Inbox task"].project_id == projects["Inbox"]
+    links = {(p.task_id, p.parent_id) for p in plan.parents}
+    assert links == {
+        (tasks["Subtask B"].id, tasks["Task A"].id),
+        (tasks["Subtask C"].id, tasks["Subtask B"].id),
+    }
+    assert all(p.project_id == projects["Work"] for p in plan.parents)
+
+
+@pytest.mark.parametrize(
+    ("rows", "match"),
+    [
+        ("a,x,,A\n", "unknown parent `x`"),
+        ("a,,P1,A\nb,a,P2,B\n", "same project"),
+        ("a,b,,A\nb,a,,B\n", "its own ancestor"),
+    ],
+)
+def test_from_csv_invalid(tmp_path, rows, match):
+    path = tmp_path / "tasks.csv"
+    path.write_text(f"id,parent,project,title\n{rows}")
+    with pytest.raises(ValueError, match=match):
+        ImportPlan.from_csv(path)
+
+
+def test_from_ics(tmp_path):
+    path = tmp_path / "tasks.ics"
+    path.write_text(ICS)
+    plan = ImportPlan.from_ics(path)
+    assert [p.name for p in plan.projects] == ["Errands"]
+    parent, child = plan.tasks
+    assert parent.title == "Groceries"
+    assert parent.content == "Weekly shop"
+    assert parent.is_all_day
+    assert parent.priority == 5
+    assert parent.tags == ["home", "food"]
+    assert child.status == 2
+    assert child.completed_time is not None
+    assert plan.parents[0].task_id == child.id
+    assert plan.parents[0].parent_id == parent.id
+
+
+def test_import_plan(mocker, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text(CSV)
+    plan = ImportPlan.from_csv(path)
+    task_id = plan.tasks[0].id
+    client = mocker.Mock()
+    client.post_project_v2.return_value = SimpleNamespace(id2error={})
+    client.post_task_v2.side_effect = lambda data: SimpleNamespace(
+        id2error={task_id: "ERROR"} if data.add[0].id == task_id else {},
+    )
+    client.post_task_parent_v2.return_value = SimpleNamespace(id2error={})
+    summary = import_plan(client, plan, batch_size=1, max_workers=3)
+
+    assert (summary.projects, summary.tasks, summary.parents) == (2, 3, 2)
+    assert summary.errors == {task_id: "ERROR"}
+    assert summary.rate > 0
+    assert client.post_task_v2.call_count == 4
+    sent = client.post_task_v2.call_args_list
+    assert sorted(t.title for c in sent for t in c.args[0].add) == sorted(
+        t.title for t in plan.tasks
+    )
+
+
+def test_import_plan_failed_dependency(mocker, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text(CSV)
+    plan = ImportPlan.from_csv(path)
+    failing = {p.id for p in plan.projects if p.name == "Work"}
+
+    def _post_project(data):
+        if data.add[0].id in failing:
+            msg = "Response [500]: oops"
+            raise ValueError(msg)
+        return SimpleNamespace(id2error={})
+
+    client = mocker.Mock()
+    client.post_project_v2.side_effect = _post_project
+    client.post_task_v2.return_value = SimpleNamespace(id2error={})
+    with pytest.raises(ValueError, match="import batch"):
+        import_plan(client, plan, batch_size=1)
+    titles = [c.args[0].add[0].title for c in client.post_task_v2.call_args_list]
+    assert titles == ["Inbox task"]
+    client.post_task_parent_v2.assert_not_called()
@@ -1,4 +1,19 @@
-from pyticktick.logger import InterceptHandler, _logger
+import json
+
+import pytest
+from loguru import logger
+
+from pyticktick.deadline import DeadlineExceededError, check_deadline, deadline
+from pyticktick.logger import (
+    InterceptHandler,
+    LogConfig,
+    _depths,
+    _logger,
+    add_sink,
+    excerpt,
+    log_config,
+    log_event,
+)
 
 
 def test_logger():
@@ -6,3 +21,93 @@ def test_logger():
     assert _logger.level == 10
     assert len(_logger.handlers) == 1
     assert isinstance(_logger.handlers[0], InterceptHandler)
+
+
+@pytest.fixture()
+def records():
+    records = []
+    handler_id = logger.add(records.append, level="DEBUG", format="{message}")
+    yield records
+    logger.remove(handler_id)
+
+
+def test_intercept_handler(records):
+    _depths.clear()
+    for _ in range(2):
+        _logger.info("Standard %s message", "logging")
+    assert [r.record["message"] for r in records] == ["Standard logging message"] * 2
+    assert all(r.record["function"] == "test_intercept_handler" for r in records)
+    assert len(_depths) == 1
+
+
+@pytest.mark.parametrize(
+    ("body", "limit", "expected"),
+    [
+        ("short", 10, "short"),
+        ("a" * 20, 10, "aaaaaaaaaa... (10 more characters)"),
+        (b"bytes body", 5, "bytes... (5 more characters)"),
+        ({"error": "oops"}, 100, "{'error': 'oops'}"),
+    ],
+)
+def test_excerpt(body, limit, expected):
+    assert excerpt(body, limit) == expected
+
+
+def test_excerpt_config():
+    with log_config(LogConfig(body_limit=3)):
+        assert excerpt("abcdef") == "abc... (3 more characters)"
+    assert excerpt("abcdef") == "abcdef"
+
+
+def test_log_event(records):
+    called = []
+
+    def _expensive() -> str:
+        called.append(1)
+        return "excerpt"
+
+    log_event("DEBUG", "test", "Response [{}]: {}", 500, _expensive, status=500)
+    assert records[0].record["message"] == "Response [500]: excerpt"
+    assert records[0].record["extra"] == {
+        "event": "test",
+        "suppressed": 0,
+        "status": 500,
+    }
+    assert records[0].record["function"] == "test_log_event"
+    assert len(called) == 1
+
+    log_event("TRACE", "test", "{}", _expensive)
+    assert len(called) == 1
+    assert len(records) == 1
+
+
+def test_log_event_sampling(mocker, records):
+    now = mocker.patch("pyticktick.logger.monotonic", return_value=100.0)
+    with log_config(LogConfig(sample_interval=10)):
+        for _ in range(3):
+            log_event("INFO", "sampled", "Sampled")
+        log_event("INFO", "other", "Other")
+        now.return_value = 110.0
+        log_event("INFO", "sampled", "Sampled")
+    log_event("INFO", "sampled", "Sampled")
+    assert [
+        (r.record["message"], r.record["extra"]["suppressed"]) for r in records
+    ] == [
+        ("Sampled", 0),
+        ("Other", 0),
+        ("Sampled", 2),
+        ("Sampled", 0),
+    ]
+
+
+def test_add_sink(tmp_path):
+    path = tmp_path / "pyticktick.log"
+    handler_id = add_sink(path, level="ERROR")
+    with deadline(-1), pytest.raises(DeadlineExceededError):
+        check_deadline()
+    logger.error("Not from pyticktick")
+    logger.remove(handler_id)
+    (line,) = path.read_text().splitlines()
+    record = json.loads(line)["record"]
+    assert record["message"].startswith("Deadline exceeded by")
+    assert record["name"] == "pyticktick.deadline"
@@ -0,0 +1,203 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pyticktick.mirror import Mirror
+from pyticktick.models.v2 import ClosedRespV2, GetBatchV2
+
+
+@pytest.fixture()
+def test_project_v2_data():
+    return {
+        "id": "67ec23b18f08cf38dd957e10",
+        "etag": "abcd1234",
+        "groupId": None,
+        "inAll": True,
+        "modifiedTime": "2025-04-15T15:15:35.000+0000",
+        "name": "Project 1",
+        "sortOption": None,
+        "background": None,
+        "barcodeNeedAudit": False,
+        "isOwner": True,
+        "sortOrder": 0,
+        "sortType": None,
+        "userCount": 1,
+        "closed": None,
+        "muted": False,
+        "transferred": None,
+        "notificationOptions": None,
+        "teamId": None,
+        "permission": None,
+        "timeline": None,
+        "needAudit": False,
+        "openToTeam": None,
+        "teamMemberPermission": None,
+        "source": 1,
+        "showType": None,
+        "reminderType": None,
+    }
+
+
+@pytest.fixture()
+def test_tag_v2_data():
+    return {
+        "etag": "abcd1234",
+        "label": "Work",
+        "name": "work",
+        "rawName": "work",
+        "sortOrder": 0,
+        "type": 1,
+    }
+
+
+def test_mirror_apply_batch(
+    test_task_v2_data,
+    test_batch_v2_data,
+    test_project_v2_data,
+    test_tag_v2_data,
+):
+    project_id = test_project_v2_data["id"]
+    tasks = [
+        test_task_v2_data(
+            projectId=project_id,
+            tags=["work"],
+            items=[{"id": "67ec273212e1101e875f0700", "title": "a", "status": 1}],
+            reminders=[{"trigger": "TRIGGER:-PT5M"}],
+        ),
+        test_task_v2_data(projectId=project_id),
+        test_task_v2_data(),
+    ]
+    batch = GetBatchV2.model_validate(
+        test_batch_v2_data(
+            tasks=tasks,
+            projectProfiles=[test_project_v2_data],
+            tags=[test_tag_v2_data],
+            checkPoint=10,
+        ),
+    )
+
+    with Mirror() as mirror:
+        assert mirror.check_point == 0
+        mirror.apply_batch(batch, full=True)
+        assert mirror.check_point == 10
+
+        rows = mirror.query(
+            "SELECT project_id, COUNT(*) AS n FROM tasks GROUP BY project_id "
+            "ORDER BY n DESC",
+        )
+        assert [(r["project_id"], r["n"]) for r in rows] == [
+            (project_id, 2),
+            ("inbox123", 1),
+        ]
+        assert mirror.query("SELECT name FROM projects")[0]["name"] == "Project 1"
+        assert mirror.query("SELECT label FROM tags")[0]["label"] == "Work"
+        assert mirror.query("SELECT task_id FROM task_tags")[0][0] == tasks[0]["id"]
+        assert mirror.query("SELECT title FROM task_items")[0][0] == "a"
+        assert mirror.query('SELECT "trigger" FROM task_reminders')[0][0] == (
+            "TRIGGER:-PT5M"
+        )
+
+        data = mirror.query("SELECT data FROM tasks WHERE id = ?", (tasks[0]["id"],))
+        assert '"project_id"' in data[0]["data"]
+        task = mirror.get_task(tasks[0]["id"])
+        assert task is not None
+        assert task == batch.sync_task_bean.update[0]
+        assert mirror.get_task("67ec273212e1101e875f0799") is None
+
+
+def test_mirror_apply_batch_delta(test_task_v2_data, test_batch_v2_data):
+    tasks = [test_task_v2_data(title=str(i)) for i in range(3)]
+    with Mirror() as mirror:
+        mirror.apply_batch(
+            GetBatchV2.model_validate(test_batch_v2_data(tasks=tasks)),
+            full=True,
+        )
+
+        delta = test_batch_v2_data(
+            tasks=[{**tasks[0], "etag": "zzzz9999", "title": "changed"}],
+            checkPoint=2,
+        )
+        delta["syncTaskBean"]["delete"] = [
+            {"taskId": tasks[1]["id"], "projectId": "inbox123"},
+        ]
+        mirror.apply_batch(GetBatchV2.model_validate(delta))
+
+        rows = mirror.query("SELECT id, title, etag FROM tasks ORDER BY title")
+        assert [tuple(r) for r in rows] == [
+            (tasks[2]["id"], "2", "abcd1234"),
+            (tasks[0]["id"], "changed", "zzzz9999"),
+        ]
+        assert mirror.check_point == 2
+        assert mirror.query("SELECT closed FROM tasks WHERE closed = 1") == []
+
+        completed = {**tasks[2], "etag": "done0000", "status": 2}
+        mirror.apply_batch(
+            GetBatchV2.model_validate(test_batch_v2_data(tasks=[completed])),
+        )
+        rows = mirror.query("SELECT id FROM tasks WHERE closed = 1")
+        assert [r["id"] for r in rows] == [tasks[2]["id"]]
+
+        mirror.apply_batch(
+            GetBatchV2.model_validate(test_batch_v2_data(tasks=tasks[:1])),
+            full=True,
+        )
+        assert len(mirror.query("SELECT id FROM tasks WHERE closed = 0")) == 1
+
+
+def test_mirror_apply_batch_full_resync(test_task_v2_data, test_batch_v2_data):
+    tasks = [test_task_v2_data() for _ in range(1200)]
+    with Mirror() as mirror:
+        mirror.apply_batch(
+            GetBatchV2.model_validate(test_batch_v2_data(tasks=tasks)),
+            full=True,
+        )
+        mirror.apply_batch(
+            GetBatchV2.model_validate(test_batch_v2_data(tasks=tasks[::2])),
+            full=True,
+        )
+        rows = mirror.query("SELECT id FROM tasks")
+        assert {r["id"] for r in rows} == {t["id"] for t in tasks[::2]}
+        # the temporary table of the batch IDs is emptied once the tasks are deleted
+        assert mirror.query("SELECT id FROM batch_ids") == []
+
+
+def test_mirror_apply_batch_skips_unchanged_etags(
+    test_task_v2_data,
+    test_batch_v2_data,
+):
+    # More tasks than the parameters of a single statement, so etags are read in chunks.
+    tasks = [test_task_v2_data() for _ in range(1200)]
+    with Mirror() as mirror:
+        batch = GetBatchV2.model_validate(test_batch_v2_data(tasks=tasks))
+        assert mirror._upsert_tasks(batch.sync_task_bean.update) == 1200
+        assert mirror._upsert_tasks(batch.sync_task_bean.update) == 0
+
+
+def test_mirror_sync(mocker, test_task_v2_data, test_batch_v2_data):
+    closed_task = test_task_v2_data(
+        status=2,
+        completedTime="2025-04-15T15:15:35.000+0000",
+    )
+    client = mocker.Mock()
+    client.get_batch_v2.return_value = GetBatchV2.model_validate(
+        test_batch_v2_data(tasks=[test_task_v2_data()], checkPoint=5),
+    )
+    client.get_project_all_closed_v2.side_effect = [
+        ClosedRespV2.model_validate([closed_task]),
+        ClosedRespV2.model_validate([]),
+    ]
+
+    with Mirror() as mirror:
+        mirror.sync(client)
+        client.get_batch_v2.assert_called_once_with(check_point=0)
+        assert client.get_project_all_closed_v2.call_count == 2
+        assert mirror.check_point == 5
+        assert mirror.closed_until is not None
+        assert mirror.closed_until <= datetime.now(tz=timezone.utc)
+
+        rows = mirror.query("SELECT id, closed FROM tasks WHERE closed = 1")
+        assert [r["id"] for r in rows] == [closed_task["id"]]
+
+        client.get_batch_v2.reset_mock()
+        mirror.sync(client, closed=False)
+        client.get_batch_v2.assert_called_once_with(check_point=5)
@@ -1,8 +1,17 @@
+import json
+
 import pytest
-from pydantic import ValidationError
+from pydantic import BaseModel, ConfigDict, ValidationError
 
-from pyticktick.models.v2 import PostBatchTaskV2
-from pyticktick.pydantic import update_model_config
+from pyticktick.models.v2 import PostBatchTaskV2, TagV2
+from pyticktick.pydantic import (
+    _shared,
+    intern_value,
+    list_adapter,
+    update_model_config,
+    validate_in_parallel,
+    validation_executor,
+)
 
 
 def test_update_model_config_nested():
@@ -55,3 +64,85 @@ def test_update_model_config_nested():
     assert data.update[0].extra_nested_field == "value"  # pyright: ignore[reportAttributeAccessIssue] # ty: ignore[unresolved-attribute]
     assert data.update[0].reminders[0].extra_extra_nested_field == "value"  # pyright: ignore[reportOptionalSubscript,reportAttributeAccessIssue] # ty: ignore[not-subscriptable, unresolved-attribute]
     assert data.delete[0].extra_nested_field == "value"  # pyright: ignore[reportAttributeAccessIssue] # ty: ignore[unresolved-attribute]
+
+
+def test_intern_value():
+    raw = '["abc", 1234567890, ["xy"]]'
+    assert json.loads(raw)[0] is not json.loads(raw)[0]
+
+    first, second = intern_value(json.loads(raw)), intern_value(json.loads(raw))
+    assert first == second
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+    assert first[2][0] is second[2][0]
+    assert type(intern_value(1)) is int
+    assert intern_value({"a": 1}) == {"a": 1}
+
+    # Distinct values are only kept up to the size of the cache.
+    for i in range(5000):
+        intern_value(f"unique-{i}")
+    assert _shared.cache_info().currsize <= _shared.cache_info().maxsize
+
+
+def test_validate_in_parallel():
+    data = [
+        {
+            "etag": "abcd1234",
+            "label": f"Tag{i}",
+            "name": f"tag{i}",
+            "raw_name": f"tag{i}",
+            "sort_order": i,
+            "type": 1,
+            "extra_field": "value",
+        }
+        for i in range(10)
+    ]
+    with pytest.raises(ValidationError, match=r"0\.extra_field"):
+        validate_in_parallel(TagV2, data, 2, min_chunk_size=3)
+
+    tags = validate_in_parallel(TagV2, data, 2, min_chunk_size=3, extra="allow")
+    assert [tag.name for tag in tags] == [f"tag{i}" for i in range(10)]
+
+    data[4]["sort_order"] = "invalid"
+    with validation_executor(2) as executor:
+        with pytest.raises(ValidationError, match=r"4\.sort_order"):
+            validate_in_parallel(
+                TagV2,
+                data,
+                2,
+                min_chunk_size=3,
+                executor=executor,
+                extra="allow",
+            )
+        # Only the chunk of the invalid tag is left unvalidated.
+        items = validate_in_parallel(
+            TagV2,
+            data,
+            2,
+            min_chunk_size=3,
+            executor=executor,
+            revalidate_failed=False,
+            extra="allow",
+        )
+    assert [type(item) for item in items] == [TagV2] * 3 + [dict] * 3 + [TagV2] * 4
+
+
+def test_list_adapter():
+    class Model(BaseModel):
+        model_config = ConfigDict(extra="forbid")
+
+        value: int
+
+    adapter = list_adapter(Model)
+    assert list_adapter(Model) is adapter
+    assert adapter.validate_python([{"value": 1}, {"value": "2"}]) == [
+        Model(value=1),
+        Model(value=2),
+    ]
+    with pytest.raises(ValidationError, match=r"0\.extra_field"):
+        adapter.validate_python([{"value": 1, "extra_field": "value"}])
+
+    update_model_config(Model, extra="allow")
+    assert list_adapter(Model) is not adapter
+    models = list_adapter(Model).validate_python([{"value": 1, "extra_field": "x"}])
+    assert models[0].extra_field == "x"  # pyright: ignore[reportAttributeAccessIssue] # ty: ignore[unresolved-attribute]
@@ -0,0 +1,153 @@
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from pyticktick.models.v2 import TaskV2
+from pyticktick.recurrence import compile_tt_rrule, expand_tasks, expand_tt_rrule
+
+UTC = timezone.utc
+
+
+def _dates(occurrences: list[datetime]) -> list[date]:
+    return [o.date() for o in occurrences]
+
+
+@pytest.mark.parametrize(
+    ("rule", "dtstart", "expected"),
+    [
+        (
+            "RRULE:FREQ=WEEKLY;INTERVAL=1;WKST=SU;BYDAY=FR,TH,WE",
+            datetime(2025, 5, 28, 9, 30, tzinfo=UTC),
+            [date(2025, 5, 28), date(2025, 5, 29), date(2025, 5, 30), date(2025, 6, 4)],
+        ),
+        (
+            "RRULE:FREQ=DAILY;INTERVAL=1;TT_SKIP=WEEKEND",
+            datetime(2025, 5, 30, tzinfo=UTC),
+            [date(2025, 5, 30), date(2025, 6, 2), date(2025, 6, 3), date(2025, 6, 4)],
+        ),
+        (
+            "RRULE:FREQ=MONTHLY;INTERVAL=1;BYMONTHDAY=1;TT_WORKDAY=1",
+            datetime(2025, 5, 1, tzinfo=UTC),
+            [date(2025, 5, 1), date(2025, 6, 2), date(2025, 7, 1), date(2025, 8, 1)],
+        ),
+        (
+            "RRULE:FREQ=MONTHLY;INTERVAL=1;BYMONTHDAY=-1;TT_WORKDAY=-1",
+            datetime(2025, 5, 1, tzinfo=UTC),
+            [
+                date(2025, 5, 30),
+                date(2025, 6, 30),
+                date(2025, 7, 31),
+                date(2025, 8, 29),
+            ],
+        ),
+        (
+            "ERULE:NAME=CUSTOM;BYDATE=20250819,20250731,20250101",
+            datetime(2025, 5, 1, 8, tzinfo=UTC),
+            [date(2025, 7, 31), date(2025, 8, 19)],
+        ),
+    ],
+)
+def test_expand_tt_rrule(rule, dtstart, expected):
+    occurrences = expand_tt_rrule(rule, dtstart, count=4)
+    assert _dates(occurrences) == expected
+    assert all(o.time() == dtstart.time() for o in occurrences)
+    assert all(o.tzinfo is UTC for o in occurrences)
+
+
+def test_expand_tt_rrule_window():
+    occurrences = expand_tt_rrule(
+        "RRULE:FREQ=DAILY;INTERVAL=2",
+        datetime(2025, 1, 1, 12, tzinfo=UTC),
+        start=datetime(2025, 3, 1, tzinfo=UTC),
+        end=datetime(2025, 3, 8, tzinfo=UTC),
+    )
+    assert _dates(occurrences) == [
+        date(2025, 3, 2),
+        date(2025, 3, 4),
+        date(2025, 3, 6),
+    ]
+
+    occurrences = expand_tt_rrule(
+        "ERULE:NAME=CUSTOM;BYDATE=20250731,20250819",
+        datetime(2025, 1, 1, tzinfo=UTC),
+        start=datetime(2025, 8, 1, tzinfo=UTC),
+        end=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+    assert _dates(occurrences) == [date(2025, 8, 19)]
+
+
+def test_expand_tt_rrule_keeps_wall_clock_time():
+    new_york = ZoneInfo("America/New_York")
+    occurrences = expand_tt_rrule(
+        "RRULE:FREQ=DAILY;INTERVAL=1",
+        datetime(2025, 3, 8, 9, tzinfo=new_york),
+        count=2,
+    )
+    assert [o.hour for o in occurrences] == [9, 9]
+    assert [o.utcoffset() for o in occurrences] != [occurrences[0].utcoffset()] * 2
+
+
+def test_expand_tt_rrule_errors():
+    with pytest.raises(ValueError, match="Either `end` or `count`"):
+        expand_tt_rrule("RRULE:FREQ=DAILY", datetime(2025, 1, 1, tzinfo=UTC))
+    with pytest.raises(ValueError, match="Invalid TickTick RRULE"):
+        compile_tt_rrule("RRULE:FREQ=SOMETIMES")
+    with pytest.raises(ValueError, match="Invalid TickTick RRULE"):
+        compile_tt_rrule("ERULE:NAME=CUSTOM;BYDATE=2025")
+
+
+def test_compile_tt_rrule_is_cached():
+    compile_tt_rrule.cache_clear()
+    rule = compile_tt_rrule("RRULE:FREQ=WEEKLY;TT_SKIP=WEEKEND")
+    assert rule.skip_weekend
+    assert compile_tt_rrule("RRULE:FREQ=WEEKLY;TT_SKIP=WEEKEND") is rule
+    assert compile_tt_rrule.cache_info().hits == 1
+
+
+def test_expand_tasks(test_task_v2_data):
+    tasks = [
+        TaskV2.model_validate(
+            test_task_v2_data(
+                repeatFlag="RRULE:FREQ=WEEKLY;INTERVAL=1",
+                startDate="2025-03-01T14:00:00.000+0000",
+                timeZone="America/New_York",
+            ),
+        ),
+        TaskV2.model_validate(
+            test_task_v2_data(
+                repeatFlag="RRULE:FREQ=DAILY;INTERVAL=1",
+                dueDate="2025-03-14T10:00:00.000+0000",
+            ),
+        ),
+        TaskV2.model_validate(test_task_v2_data()),
+    ]
+    expanded = expand_tasks(
+        tasks,
+        datetime(2025, 3, 5, tzinfo=UTC),
+        datetime(2025, 3, 16, tzinfo=UTC),
+    )
+    assert list(expanded) == [tasks[0].id, tasks[1].id]
+    assert _dates(expanded[tasks[0].id]) == [date(2025, 3, 8), date(2025, 3, 15)]
+    assert [o.hour for o in expanded[tasks[0].id]] == [9, 9]
+    assert [o.astimezone(UTC).hour for o in expanded[tasks[0].id]] == [14, 13]
+    assert _dates(expanded[tasks[1].id]) == [date(2025, 3, 14), date(2025, 3, 15)]
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "RRULE:FREQ=DAILY;INTERVAL=3;TT_SKIP=WEEKEND",
+        "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,SA",
+        "RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=40",
+        "RRULE:FREQ=MONTHLY;INTERVAL=1;BYMONTHDAY=31",
+    ],
+)
+def test_expand_tt_rrule_window_matches_full_expansion(rule):
+    dtstart = datetime(2024, 1, 31, 9, tzinfo=UTC)
+    start = datetime(2024, 6, 5, tzinfo=UTC)
+    end = datetime(2024, 9, 1, tzinfo=UTC)
+    full = expand_tt_rrule(rule, dtstart, end=end)
+    assert expand_tt_rrule(rule, dtstart, start=start, end=end) == [
+        o for o in full if o >= start
+    ]
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pyticktick.models.v2 import GetBatchV2, TaskV2
+from pyticktick.reminders import Reminder, ReminderSchedule
+
+UTC = timezone.utc
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+
+
+@pytest.fixture()
+def test_schedule(test_task_v2_data) -> ReminderSchedule:
+    return ReminderSchedule(
+        [
+            TaskV2.model_validate(
+                test_task_v2_data(
+                    id=A,
+                    startDate="2025-04-15T15:00:00.000+0000",
+                    reminders=[
+                        {"trigger": "TRIGGER:PT0S"},
+                        {"trigger": "TRIGGER:-PT30M"},
+                    ],
+                ),
+            ),
+            TaskV2.model_validate(
+                # all-day task on April 16th in New York, reminded at 9:00 am the
+                # day before, which is 13:00 UTC
+                test_task_v2_data(
+                    id=B,
+                    dueDate="2025-04-16T04:00:00.000+0000",
+                    isAllDay=True,
+                    timeZone="America/New_York",
+                    reminders=[{"trigger": "TRIGGER:-P0DT15H0M0S"}],
+                ),
+            ),
+            TaskV2.model_validate(
+                test_task_v2_data(
+                    id=C,
+                    status=2,
+                    dueDate="2025-04-15T15:00:00.000+0000",
+                    reminders=[{"trigger": "TRIGGER:PT0S"}],
+                ),
+            ),
+        ],
+    )
+
+
+def test_reminder_schedule(test_schedule):
+    assert len(test_schedule) == 3
+    assert test_schedule.between(
+        datetime(2025, 4, 15, tzinfo=UTC),
+        datetime(2025, 4, 16, tzinfo=UTC),
+    ) == [
+        Reminder(datetime(2025, 4, 15, 13, tzinfo=UTC), B, "TRIGGER:-P0DT15H0M0S"),
+        Reminder(datetime(2025, 4, 15, 14, 30, tzinfo=UTC), A, "TRIGGER:-PT30M"),
+        Reminder(datetime(2025, 4, 15, 15, tzinfo=UTC), A, "TRIGGER:PT0S"),
+    ]
+    assert test_schedule.between(
+        datetime(2025, 4, 15, 14, 30, tzinfo=UTC),
+        datetime(2025, 4, 15, 15, tzinfo=UTC),
+    ) == [Reminder(datetime(2025, 4, 15, 14, 30, tzinfo=UTC), A, "TRIGGER:-PT30M")]
+    assert test_schedule.due_within(
+        timedelta(minutes=15),
+        now=datetime(2025, 4, 15, 14, 50, tzinfo=UTC),
+    ) == [Reminder(datetime(2025, 4, 15, 15, tzinfo=UTC), A, "TRIGGER:PT0S")]
+    assert test_schedule.for_task(C) == []
+    assert [r.trigger for r in test_schedule.for_task(A)] == [
+        "TRIGGER:-PT30M",
+        "TRIGGER:PT0S",
+    ]
+
+
+def test_reminder_schedule_next_after(test_schedule):
+    assert test_schedule.next_after(datetime(2025, 4, 15, 14, tzinfo=UTC)) == (
+        Reminder(datetime(2025, 4, 15, 14, 30, tzinfo=UTC), A, "TRIGGER:-PT30M")
+    )
+    assert test_schedule.next_after(datetime(2025, 4, 16, tzinfo=UTC)) is None
+
+
+def test_reminder_schedule_updates(test_schedule, test_task_v2_data):
+    test_schedule.upsert_task(
+        TaskV2.model_validate(
+            test_task_v2_data(
+                id=A,
+                startDate="2025-04-17T15:00:00.000+0000",
+                reminders=[{"trigger": "TRIGGER:-PT5M"}],
+            ),
+        ),
+    )
+    assert len(test_schedule) == 2
+    assert test_schedule.next_after(datetime(2025, 4, 16, tzinfo=UTC)) == (
+        Reminder(datetime(2025, 4, 17, 14, 55, tzinfo=UTC), A, "TRIGGER:-PT5M")
+    )
+
+    test_schedule.remove_task(B)
+    test_schedule.remove_task(B)
+    assert [r.task_id for r in test_schedule.for_task(B)] == []
+    assert len(test_schedule) == 1
+
+
+def test_reminder_schedule_apply_batch(test_task_v2_data, test_batch_v2_data):
+    task = test_task_v2_data(
+        dueDate="2025-04-15T15:00:00.000+0000",
+        reminder="TRIGGER:-PT5M",
+    )
+    schedule = ReminderSchedule.from_batch(
+        GetBatchV2.model_validate(test_batch_v2_data(tasks=[task])),
+    )
+    assert [r.fire_time for r in schedule.for_task(task["id"])] == [
+        datetime(2025, 4, 15, 14, 55, tzinfo=UTC),
+    ]
+
+    delta = test_batch_v2_data()
+    delta["syncTaskBean"]["delete"] = [{"taskId": task["id"], "projectId": "inbox123"}]
+    schedule.apply_batch(GetBatchV2.model_validate(delta))
+    assert len(schedule) == 0
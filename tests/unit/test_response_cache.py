@@ -0,0 +1,60 @@
+import pytest
+
+from pyticktick.response_cache import CacheStats, ResponseCache, ResponseCacheConfig
+
+
+def test_response_cache_config():
+    config = ResponseCacheConfig(ttls={"get_projects_v1": 5, "get_status_v2": 0})
+    assert config.ttl("get_projects_v1") == 5
+    assert config.ttl("get_status_v2") == 0
+    assert config.ttl("get_profile_v2") == 300
+    assert config.ttl("get_batch_v2") == 0
+
+
+def test_response_cache(mocker):
+    now = mocker.patch("pyticktick.response_cache.monotonic", return_value=0.0)
+    cache = ResponseCache(max_size=2)
+    assert cache.get(("a",)) == (False, None)
+
+    cache.set(("a",), 1, "project", ttl=10)
+    cache.set(("b",), 2, "user", ttl=10)
+    assert cache.get(("a",)) == (True, 1)
+    cache.set(("c",), 3, "project", ttl=10)
+    assert cache.get(("b",)) == (False, None)
+    assert len(cache) == 2
+
+    now.return_value = 10.0
+    assert cache.get(("a",)) == (False, None)
+    assert cache.stats == CacheStats(
+        hits=1,
+        misses=3,
+        evictions=1,
+        invalidations=0,
+        size=1,
+    )
+
+
+def test_response_cache_invalidate():
+    cache = ResponseCache(max_size=10)
+    cache.set(("a",), 1, "project", ttl=10)
+    cache.set(("b",), 2, "user", ttl=10)
+    generation = cache.generation("project")
+
+    cache.invalidate("project", "statistics")
+    assert cache.get(("a",)) == (False, None)
+    assert cache.get(("b",)) == (True, 2)
+    assert cache.stats.invalidations == 1
+
+    cache.set(("a",), 1, "project", ttl=10, generation=generation)
+    assert cache.get(("a",)) == (False, None)
+    cache.set(("a",), 1, "project", ttl=10, generation=cache.generation("project"))
+    assert cache.get(("a",)) == (True, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("max_size", [0, -1])
+def test_response_cache_config_invalid(max_size):
+    with pytest.raises(ValueError, match="greater than or equal to 1"):
+        ResponseCacheConfig(max_size=max_size)
@@ -5,8 +5,10 @@
 from types import FunctionType
 
 import pytest
-from tenacity import RetryError, Retrying, retry_if_exception_message
+from tenacity import RetryError, Retrying, retry_if_exception
 
+from pyticktick.deadline import DeadlineExceededError, deadline
+from pyticktick.exceptions import QuotaExceededError, RateLimitedError, ServerError
 from pyticktick.retry import retry_api_v1
 
 
@@ -39,11 +41,68 @@ def test_retry_api_v1():
     assert wrapped_function.retry.wait.min == min_wait
     assert wrapped_function.retry.wait.max == max_wait
 
-    retries = wrapped_function.retry.retry.retries
-    assert len(retries) == 2
-    assert any(isinstance(retry, retry_if_exception_message) for retry in retries)
+    assert isinstance(wrapped_function.retry.retry, retry_if_exception)
 
     assert wrapped_function.statistics == {}
     with pytest.raises(RetryError):
         wrapped_function()
     assert wrapped_function.statistics.get("attempt_number") == attempts
+
+
+def test_retry_api_v1_deadline():
+    calls = []
+
+    @retry_api_v1(attempts=5, min_wait=4, max_wait=4)
+    def _func() -> None:
+        calls.append(1)
+        msg = "exceed_query_limit"
+        raise ValueError(msg)
+
+    with deadline(3), pytest.raises(DeadlineExceededError, match=r"4\.00s needed"):
+        _func()
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (ValueError("exceed_query_limit"), True),
+        (ValueError('Response [500]: {"errorCode": "exceed_query_limit"}'), True),
+        (RateLimitedError(429, "Too Many Requests"), True),
+        (QuotaExceededError(500, {"errorCode": "exceed_query_limit"}), True),
+        (ValueError("Response [500]: oops"), False),
+        (ServerError(500, "exceed_query_limit"), False),
+        (TypeError("exceed_query_limit"), False),
+    ],
+)
+def test_retry_api_v1_classification(error, expected):
+    calls = []
+
+    @retry_api_v1(attempts=2, min_wait=0, max_wait=0)
+    def _func() -> None:
+        calls.append(1)
+        raise error
+
+    with pytest.raises(RetryError if expected else type(error)):
+        _func()
+    assert len(calls) == (2 if expected else 1)
+
+
+def test_retry_api_v1_retry_after():
+    @retry_api_v1(attempts=3, min_wait=1, max_wait=2)
+    def _func() -> None:
+        raise RateLimitedError(429, "Too Many Requests", retry_after=30)
+
+    with pytest.raises(RetryError):
+        _func()
+    assert _func.statistics["idle_for"] == 60
+
+
+def test_retry_api_v1_max_retry_after():
+    @retry_api_v1(attempts=3, min_wait=1, max_wait=2, max_retry_after=5)
+    def _func() -> None:
+        raise RateLimitedError(429, "Too Many Requests", retry_after=float("inf"))
+
+    with pytest.raises(RetryError):
+        _func()
+    assert _func.statistics["idle_for"] == 10
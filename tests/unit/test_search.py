@@ -0,0 +1,98 @@
+import pytest
+
+from pyticktick.models.v2 import GetBatchV2, TaskV2
+from pyticktick.search import SearchIndex, tokenize
+
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+
+
+@pytest.fixture()
+def test_index(test_task_v2_data) -> SearchIndex:
+    return SearchIndex(
+        [
+            TaskV2.model_validate(
+                test_task_v2_data(id=A, title="Buy groceries", content="milk, eggs"),
+            ),
+            TaskV2.model_validate(
+                test_task_v2_data(
+                    id=B,
+                    title="Weekly review",
+                    desc="Review the grocery budget",
+                    kind="CHECKLIST",
+                    items=[
+                        {"id": "67ec273212e1101e875f0b01", "title": "Check milk"},
+                    ],
+                ),
+            ),
+            TaskV2.model_validate(test_task_v2_data(id=C, title="Call Mom")),
+        ],
+    )
+
+
+def test_tokenize():
+    assert tokenize("Buy 2 Äpfel, über-fast!") == ["buy", "2", "äpfel", "über", "fast"]
+    assert tokenize(None) == []
+
+
+def test_search_index(test_index):
+    assert len(test_index) == 3
+    assert A in test_index
+    assert {h.task_id for h in test_index.search("milk")} == {A, B}
+    assert [h.task_id for h in test_index.search("MILK check")] == [B]
+    assert [h.task_id for h in test_index.search("milk call")] == []
+    assert test_index.search("") == []
+
+
+def test_search_index_prefix(test_index):
+    assert [h.task_id for h in test_index.search("groc")] == [A, B]
+    assert test_index.search("groc", prefix=False) == []
+    assert [h.task_id for h in test_index.search("budget groc")] == [B]
+    assert [h.task_id for h in test_index.search("groc", limit=1)] == [A]
+
+
+def test_search_index_ranks_titles_higher(test_index):
+    hits = test_index.search("review")
+    assert [h.task_id for h in hits] == [B]
+    hits = test_index.search("groceries grocery", prefix=False)
+    assert hits == []
+    hits = test_index.search("grocer")
+    assert hits[0].task_id == A
+    assert hits[0].score > hits[1].score > 0
+
+
+def test_search_index_updates(test_index, test_task_v2_data, test_batch_v2_data):
+    test_index.upsert_task(
+        TaskV2.model_validate(test_task_v2_data(id=C, title="Call Dad")),
+    )
+    assert test_index.search("mom") == []
+    assert [h.task_id for h in test_index.search("dad")] == [C]
+
+    delta = test_batch_v2_data()
+    delta["syncTaskBean"]["delete"] = [{"taskId": A, "projectId": "inbox123"}]
+    test_index.apply_batch(GetBatchV2.model_validate(delta))
+    assert [h.task_id for h in test_index.search("milk")] == [B]
+    assert test_index.search("eggs") == []
+    assert "eggs" not in test_index._vocabulary
+
+
+def test_search_index_from_batch(test_task_v2_data, test_batch_v2_data):
+    index = SearchIndex.from_batch(
+        GetBatchV2.model_validate(
+            test_batch_v2_data(tasks=[test_task_v2_data(id=A, title="Active")]),
+        ),
+        closed=[TaskV2.model_validate(test_task_v2_data(id=B, title="Closed"))],
+    )
+    assert len(index) == 2
+    assert [h.task_id for h in index.search("closed")] == [B]
+
+
+def test_search_index_save_and_load(test_index, tmp_path):
+    path = tmp_path / "search.db"
+    test_index.save(path)
+    test_index.save(path)
+
+    loaded = SearchIndex.load(path)
+    assert len(loaded) == 3
+    assert loaded.search("groc") == test_index.search("groc")
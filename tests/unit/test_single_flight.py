@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from pyticktick.deadline import DeadlineExceededError, deadline
+from pyticktick.exceptions import RateLimitedError
+from pyticktick.single_flight import SingleFlight
+
+
+def test_single_flight():
+    group = SingleFlight()
+    started, release = Event(), Event()
+    calls = []
+
+    def _func() -> list[int]:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [1, 2, 3]
+
+    with ThreadPoolExecutor(5) as executor:
+        leader = executor.submit(group.do, "key", _func)
+        started.wait(5)
+        followers = [executor.submit(group.do, "key", _func) for _ in range(3)]
+        other = executor.submit(group.do, "other", lambda: [4])
+        assert other.result(5) == ([4], False)
+        while group._calls["key"].waiters < 3:
+            pass
+        release.set()
+        result, shared = leader.result(5)
+        assert shared
+        assert all(f.result(5)[0] is result for f in followers)
+    assert len(calls) == 1
+    assert len(group) == 0
+
+    assert group.do("key", lambda: [5]) == ([5], False)
+
+
+def test_single_flight_errors():
+    group = SingleFlight()
+    started, release = Event(), Event()
+
+    def _func() -> None:
+        started.set()
+        release.wait(5)
+        msg = "Response [500]: oops"
+        raise ValueError(msg)
+
+    def _wait_with_deadline() -> None:
+        with deadline(0.01):
+            group.do("key", _func)
+
+    with ThreadPoolExecutor(3) as executor:
+        leader = executor.submit(group.do, "key", _func)
+        started.wait(5)
+        follower = executor.submit(group.do, "key", _func)
+        impatient = executor.submit(_wait_with_deadline)
+        with pytest.raises(DeadlineExceededError, match="call in flight"):
+            impatient.result(5)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match=r"Response \[500\]: oops"):
+                future.result(5)
+    assert len(group) == 0
+
+
+def test_single_flight_timeout():
+    group = SingleFlight()
+    started, release = Event(), Event()
+
+    def _func() -> int:
+        started.set()
+        release.wait(5)
+        return 1
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(group.do, "key", _func)
+        started.wait(5)
+        impatient = executor.submit(group.do, "key", _func, timeout=0.01)
+        with pytest.raises(DeadlineExceededError, match="call in flight"):
+            impatient.result(5)
+        release.set()
+        assert leader.result(5)[0] == 1
+
+
+def test_single_flight_error_copies():
+    group = SingleFlight()
+    started, release = Event(), Event()
+
+    def _func() -> None:
+        started.set()
+        release.wait(5)
+        raise RateLimitedError(429, {"errorCode": "slow_down"}, retry_after=3)
+
+    with ThreadPoolExecutor(3) as executor:
+        futures = [executor.submit(group.do, "key", _func)]
+        started.wait(5)
+        futures += [executor.submit(group.do, "key", _func) for _ in range(2)]
+        while group._calls["key"].waiters < 2:
+            pass
+        release.set()
+        errors = [future.exception(5) for future in futures]
+    assert len({id(e) for e in errors}) == 3
+    for e in errors:
+        assert isinstance(e, RateLimitedError)
+        assert str(e) == str(errors[0])
+        assert e.status == 429
+        assert e.retry_after == 3
@@ -0,0 +1,163 @@
+import json
+import pickle
+from importlib.metadata import PackageNotFoundError
+
+import pytest
+
+from pyticktick.models.v2 import GetBatchV2
+from pyticktick.snapshot import apply_delta, load_snapshot, save_snapshot, warm_start
+
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+
+
+@pytest.mark.parametrize("codec", ["auto", "json"])
+def test_snapshot_round_trip(tmp_path, test_task_v2_data, test_batch_v2_data, codec):
+    batch = GetBatchV2.model_validate(
+        test_batch_v2_data(
+            tasks=[test_task_v2_data(id=A), test_task_v2_data(id=B)],
+            checkPoint=7,
+        ),
+    )
+    path = tmp_path / "account.snapshot"
+    save_snapshot(batch, path, codec=codec)
+
+    loaded = load_snapshot(path, codec=codec)
+    assert loaded == batch
+    assert loaded.check_point == 7
+    assert not (tmp_path / "account.snapshot.tmp").exists()
+
+
+def test_load_snapshot_invalid(tmp_path, test_batch_v2_data):
+    path = tmp_path / "account.snapshot"
+    assert load_snapshot(path) is None
+
+    batch = GetBatchV2.model_validate(test_batch_v2_data())
+    path.write_bytes(b"PYTTSNAP0:0.0.0:0.0.0\n" + batch.model_dump_json().encode())
+    assert load_snapshot(path) is None
+
+    save_snapshot(batch, path)
+    path.write_bytes(path.read_bytes()[:-20])
+    assert load_snapshot(path) is None
+
+    save_snapshot(batch, path)
+    header = path.read_bytes().split(b"\n", 1)[0] + b"\n"
+    path.write_bytes(header + json.dumps({"not": "a batch"}).encode())
+    assert load_snapshot(path) is None
+
+
+def test_load_snapshot_never_unpickles(tmp_path, test_batch_v2_data):
+    class _Exploit:
+        def __reduce__(self):
+            # Fails the test if the payload is ever unpickled.
+            return (pytest.fail, ("The snapshot was unpickled",))
+
+    path = tmp_path / "account.snapshot"
+    save_snapshot(GetBatchV2.model_validate(test_batch_v2_data()), path)
+    header = path.read_bytes().split(b"\n", 1)[0] + b"\n"
+    path.write_bytes(header + pickle.dumps(_Exploit()))
+    assert load_snapshot(path) is None
+
+
+def test_snapshot_without_installed_version(mocker, tmp_path, test_batch_v2_data):
+    mocker.patch(
+        "pyticktick.snapshot.version",
+        side_effect=PackageNotFoundError("pyticktick"),
+    )
+    batch = GetBatchV2.model_validate(test_batch_v2_data())
+    path = tmp_path / "account.snapshot"
+    save_snapshot(batch, path)
+    assert path.read_bytes().startswith(b"PYTTSNAP2:0:0\n")
+    assert load_snapshot(path) == batch
+
+
+@pytest.mark.parametrize("cut", [1, 10, 100, 0.5, 0.9])
+def test_load_snapshot_truncated(tmp_path, test_task_v2_data, test_batch_v2_data, cut):
+    path = tmp_path / "account.snapshot"
+    batch = GetBatchV2.model_validate(
+        test_batch_v2_data(tasks=[test_task_v2_data(id=A), test_task_v2_data(id=B)]),
+    )
+    save_snapshot(batch, path)
+    data = path.read_bytes()
+    header = data.split(b"\n", 1)[0] + b"\n"
+    size = len(header) + (cut if isinstance(cut, int) else int(len(data) * cut))
+    path.write_bytes(data[:size])
+    assert load_snapshot(path) is None
+
+
+@pytest.mark.parametrize(
+    "garbage",
+    [
+        b"",
+        b"\x80",
+        b"\x80\x05K",
+        b"garbage",
+        b"\x80\x05]\x94(K\x01e.",
+        bytes(range(256)),
+    ],
+)
+def test_load_snapshot_garbage(tmp_path, test_batch_v2_data, garbage):
+    path = tmp_path / "account.snapshot"
+    save_snapshot(GetBatchV2.model_validate(test_batch_v2_data()), path)
+    header = path.read_bytes().split(b"\n", 1)[0] + b"\n"
+    path.write_bytes(header + garbage)
+    assert load_snapshot(path) is None
+
+
+def test_apply_delta(test_task_v2_data, test_batch_v2_data):
+    batch = GetBatchV2.model_validate(
+        test_batch_v2_data(
+            tasks=[
+                test_task_v2_data(id=A, title="a"),
+                test_task_v2_data(id=B, title="b"),
+            ],
+            checkPoint=1,
+        ),
+    )
+    data = test_batch_v2_data(
+        tasks=[test_task_v2_data(id=A, title="a2"), test_task_v2_data(id=C)],
+        checkPoint=2,
+    )
+    data["syncTaskBean"]["delete"] = [{"taskId": B, "projectId": "inbox123"}]
+    delta = GetBatchV2.model_validate(data)
+
+    merged = apply_delta(batch, delta)
+    assert merged.check_point == 2
+    assert {t.id: t.title for t in merged.sync_task_bean.update} == {
+        A: "a2",
+        C: "Test Task",
+    }
+
+    # tasks completed or abandoned since are no longer active
+    data = test_batch_v2_data(
+        tasks=[test_task_v2_data(id=A, status=2), test_task_v2_data(id=B, status=-1)],
+        checkPoint=3,
+    )
+    merged = apply_delta(merged, GetBatchV2.model_validate(data))
+    assert [t.id for t in merged.sync_task_bean.update] == [C]
+    assert merged.sync_task_bean.deleted_ids == []
+    assert len(batch.sync_task_bean.update) == 2
+
+
+def test_warm_start(mocker, tmp_path, test_task_v2_data, test_batch_v2_data):
+    path = tmp_path / "account.snapshot"
+    client = mocker.Mock(json_codec="auto")
+    client.get_batch_v2.side_effect = [
+        GetBatchV2.model_validate(
+            test_batch_v2_data(tasks=[test_task_v2_data(id=A)], checkPoint=3),
+        ),
+        GetBatchV2.model_validate(
+            test_batch_v2_data(tasks=[test_task_v2_data(id=B)], checkPoint=4),
+        ),
+    ]
+
+    batch = warm_start(client, path)
+    client.get_batch_v2.assert_called_once_with()
+    assert batch.check_point == 3
+
+    batch = warm_start(client, path)
+    client.get_batch_v2.assert_called_with(check_point=3)
+    assert batch.check_point == 4
+    assert {t.id for t in batch.sync_task_bean.update} == {A, B}
+    assert load_snapshot(path) == batch
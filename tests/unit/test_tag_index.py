@@ -0,0 +1,192 @@
+import pytest
+
+from pyticktick.models.v2 import GetBatchV2, TagV2, TaskV2
+from pyticktick.tag_index import TagIndex, TagOperation, TagPlan, execute_plan
+
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+
+
+def _tag(name: str, parent: str | None = None) -> dict:
+    return {
+        "etag": "abcd1234",
+        "label": name.capitalize(),
+        "name": name,
+        "parent": parent,
+        "rawName": name,
+        "sortOrder": 0,
+        "type": 1,
+    }
+
+
+@pytest.fixture()
+def test_index(test_task_v2_data) -> TagIndex:
+    #  work        home
+    #  ├── meet
+    #  │   └── call
+    #  └── code
+    return TagIndex(
+        [
+            TagV2.model_validate(_tag("work")),
+            TagV2.model_validate(_tag("meet", "work")),
+            TagV2.model_validate(_tag("call", "meet")),
+            TagV2.model_validate(_tag("code", "work")),
+            TagV2.model_validate(_tag("home")),
+        ],
+        [
+            TaskV2.model_validate(test_task_v2_data(id=A, tags=["call", "home"])),
+            TaskV2.model_validate(test_task_v2_data(id=B, tags=["code"])),
+            TaskV2.model_validate(test_task_v2_data(id=C, tags=["untracked"])),
+        ],
+    )
+
+
+def test_tag_index(test_index):
+    assert len(test_index) == 5
+    assert "meet" in test_index
+    assert "untracked" not in test_index
+    assert test_index.roots == ["work", "home"]
+    assert test_index.children("work") == ["meet", "code"]
+    assert test_index.parent("call") == "meet"
+    assert test_index.ancestors("call") == ["meet", "work"]
+    assert test_index.descendants("work") == ["meet", "call", "code"]
+    assert test_index.label("meet") == "Meet"
+
+
+def test_tag_index_tasks_with_tag(test_index, test_task_v2_data):
+    assert test_index.tasks_with_tag("work") == {A, B}
+    assert test_index.tasks_with_tag("work", include_descendants=False) == set()
+    assert test_index.tasks_with_tag("meet") == {A}
+    assert test_index.tasks_with_tag("untracked") == {C}
+    assert test_index.tasks_with_tag("missing") == set()
+
+    test_index.upsert_task(TaskV2.model_validate(test_task_v2_data(id=A, tags=[])))
+    assert test_index.tasks_with_tag("work") == {B}
+    test_index.remove_task(B)
+    assert test_index.tasks_with_tag("work") == set()
+
+
+def test_tag_index_cycles():
+    index = TagIndex(
+        [
+            TagV2.model_validate(_tag("a", "b")),
+            TagV2.model_validate(_tag("b", "a")),
+            TagV2.model_validate(_tag("c", "missing")),
+        ],
+    )
+    assert sorted(index.roots) == ["a", "c"]
+    assert index.descendants("a") == ["b"]
+
+
+def test_tag_index_apply_batch(test_task_v2_data, test_batch_v2_data):
+    index = TagIndex.from_batch(
+        GetBatchV2.model_validate(
+            test_batch_v2_data(
+                tasks=[test_task_v2_data(id=A, tags=["meet"])],
+                tags=[_tag("work"), _tag("meet", "work")],
+            ),
+        ),
+    )
+    assert index.tasks_with_tag("work") == {A}
+
+    delta = test_batch_v2_data(
+        tasks=[test_task_v2_data(id=B, tags=["work"])],
+        tags=[_tag("work"), _tag("meet")],
+    )
+    delta["syncTaskBean"]["delete"] = [{"taskId": A, "projectId": "inbox123"}]
+    index.apply_batch(GetBatchV2.model_validate(delta))
+    assert index.roots == ["work", "meet"]
+    assert index.tasks_with_tag("work") == {B}
+    assert index.tasks_with_tag("meet") == set()
+
+
+def test_tag_index_plan(test_index):
+    plan = test_index.plan(
+        renames={"home": "Home", "code": "Coding", "call": "Meet"},
+        merges={"meet": "work"},
+    )
+    assert plan.waves == (
+        (TagOperation("merge", "meet", "work"),),
+        (
+            TagOperation("rename", "code", "Coding"),
+            TagOperation("rename", "call", "Meet"),
+        ),
+    )
+    assert len(plan.operations) == 3
+
+
+def test_tag_index_plan_deletes_parents_and_children_separately(test_index):
+    plan = test_index.plan(deletes=["work", "meet", "call", "code", "home"])
+    assert [[op.name for op in wave] for wave in plan.waves] == [
+        ["work", "call", "home"],
+        ["meet", "code"],
+    ]
+
+
+def test_tag_index_plan_rename_chain(test_index):
+    plan = test_index.plan(renames={"home": "work", "work": "job"})
+    assert plan.operations == [
+        TagOperation("rename", "work", "job"),
+        TagOperation("rename", "home", "work"),
+    ]
+    assert len(plan.waves) == 2
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"deletes": ["missing"]}, "unknown tag"),
+        ({"deletes": ["work"], "renames": {"work": "job"}}, "more than one"),
+        ({"renames": {"home": "work"}}, "merge it instead"),
+        ({"renames": {"home": "job", "code": "Job"}}, "More than one tag"),
+        ({"renames": {"home": "work", "work": "home"}}, "cycle"),
+        ({"merges": {"home": "home"}}, "Cannot merge"),
+        ({"merges": {"home": "work"}, "deletes": ["work"]}, "Cannot merge"),
+    ],
+)
+def test_tag_index_plan_invalid(test_index, kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        test_index.plan(**kwargs)
+
+
+def test_tag_index_apply(test_index):
+    test_index.apply(
+        TagPlan(
+            (
+                (
+                    TagOperation("merge", "meet", "work"),
+                    TagOperation("rename", "code", "Coding"),
+                    TagOperation("delete", "home"),
+                ),
+            ),
+        ),
+    )
+    assert test_index.roots == ["work"]
+    assert test_index.children("work") == ["coding", "call"]
+    assert test_index.label("coding") == "Coding"
+    assert "home" not in test_index
+    assert test_index.tasks_with_tag("work", include_descendants=False) == set()
+    assert test_index.tasks_with_tag("coding") == {B}
+    assert test_index.tasks_with_tag("home") == set()
+    assert test_index.tasks_with_tag("work") == {A, B}
+
+
+def test_execute_plan(mocker):
+    client = mocker.Mock()
+    plan = TagPlan(
+        (
+            (TagOperation("delete", "a"), TagOperation("merge", "b", "c")),
+            (TagOperation("rename", "d", "E"),),
+        ),
+    )
+    execute_plan(client, plan)
+    client.delete_tag_v2.assert_called_once_with({"name": "a"})
+    client.put_merge_tag_v2.assert_called_once_with({"name": "b", "new_name": "c"})
+    client.put_rename_tag_v2.assert_called_once_with({"name": "d", "new_name": "E"})
+
+    client.reset_mock()
+    client.delete_tag_v2.side_effect = ValueError("Response [500]: error")
+    with pytest.raises(ValueError, match="failed in wave 1 of 2"):
+        execute_plan(client, plan)
+    client.put_rename_tag_v2.assert_not_called()
@@ -0,0 +1,155 @@
+from datetime import date
+
+import pytest
+
+from pyticktick.models.v2 import GetBatchV2, TaskV2
+from pyticktick.models.v2.responses.user import TaskByMonthV2, TaskByWeekV2
+from pyticktick.task_statistics import TaskStatistics
+
+P1 = "67ec23b18f08cf38dd957e10"
+P2 = "67ec23b18f08cf38dd957e11"
+
+
+@pytest.fixture(params=[False, True], ids=["array", "numpy"])
+def use_numpy(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+@pytest.fixture()
+def test_tasks(test_task_v2_data):
+    def _task(id_, project, created, completed=None, *, status=0, tags=()):
+        return TaskV2.model_validate(
+            test_task_v2_data(
+                id=id_,
+                projectId=project,
+                createdTime=created,
+                completedTime=completed,
+                status=status,
+                tags=list(tags),
+            ),
+        )
+
+    return [
+        _task("a" * 24, P1, "2025-01-05T10:00:00.000+0000", tags=["work"]),
+        _task(
+            "b" * 24,
+            P1,
+            "2025-01-01T10:00:00.000+0000",
+            "2025-01-06T23:30:00.000+0000",
+            status=2,
+            tags=["work"],
+        ),
+        _task(
+            "c" * 24,
+            P2,
+            "2025-01-01T10:00:00.000+0000",
+            "2025-02-03T10:00:00.000+0000",
+            status=2,
+        ),
+        _task(
+            "d" * 24,
+            P2,
+            "2025-01-01T10:00:00.000+0000",
+            "2025-01-07T10:00:00.000+0000",
+            status=-1,
+        ),
+    ]
+
+
+def _counts(counts):
+    return {k: (v.complete_count, v.not_complete_count) for k, v in counts.root.items()}
+
+
+def test_counts(test_tasks, use_numpy):
+    stats = TaskStatistics(test_tasks, tz="Europe/Paris", use_numpy=use_numpy)
+    assert len(stats) == 4
+
+    by_day = stats.counts("day", date(2025, 1, 5), date(2025, 1, 7))
+    # completed at 23:30 UTC, which is already the next day in Paris
+    assert _counts(by_day) == {
+        date(2025, 1, 5): (0, 1),
+        date(2025, 1, 6): (0, 0),
+        date(2025, 1, 7): (1, 0),
+    }
+
+    by_week = stats.counts("week", date(2025, 1, 1), date(2025, 2, 5))
+    assert isinstance(by_week, TaskByWeekV2)
+    assert next(iter(by_week.root)) == date(2024, 12, 30)
+    assert _counts(by_week)[date(2024, 12, 30)] == (0, 1)
+    assert _counts(by_week)[date(2025, 1, 6)] == (1, 0)
+    assert _counts(by_week)[date(2025, 2, 3)] == (1, 0)
+
+    by_month = stats.counts("month", date(2024, 12, 15), date(2025, 2, 1), tag="work")
+    assert isinstance(by_month, TaskByMonthV2)
+    assert _counts(by_month) == {
+        date(2024, 12, 1): (0, 0),
+        date(2025, 1, 1): (1, 1),
+        date(2025, 2, 1): (0, 0),
+    }
+    assert _counts(
+        stats.counts("month", date(2025, 1, 1), date(2025, 2, 1), project_id=P2),
+    ) == {date(2025, 1, 1): (0, 0), date(2025, 2, 1): (1, 0)}
+
+
+def test_counts_by_group(test_tasks, use_numpy):
+    stats = TaskStatistics(test_tasks, use_numpy=use_numpy)
+    by_project = stats.counts_by_project("month", date(2025, 1, 1), date(2025, 2, 1))
+    assert {k: _counts(v) for k, v in by_project.items()} == {
+        P1: {date(2025, 1, 1): (1, 1), date(2025, 2, 1): (0, 0)},
+        P2: {date(2025, 1, 1): (0, 0), date(2025, 2, 1): (1, 0)},
+    }
+    by_tag = stats.counts_by_tag("month", date(2025, 1, 1), date(2025, 1, 1))
+    assert {k: _counts(v) for k, v in by_tag.items()} == {
+        "work": {date(2025, 1, 1): (1, 1)},
+    }
+
+
+def test_incremental_updates(test_tasks, test_batch_v2_data):
+    stats = TaskStatistics(test_tasks[:1], use_numpy=False)
+    start, end = date(2025, 1, 1), date(2025, 1, 31)
+    assert _counts(stats.counts("month", start, end)) == {date(2025, 1, 1): (0, 1)}
+
+    # the open task is completed, and another task arrives
+    completed = test_tasks[0].model_copy(
+        update={"status": 2, "completed_time": test_tasks[2].completed_time},
+    )
+    stats.add_tasks([completed, test_tasks[1]])
+    assert len(stats) == 2
+    assert _counts(stats.counts("month", start, end)) == {date(2025, 1, 1): (1, 0)}
+    assert _counts(stats.counts("month", start, end, tag="work")) == {
+        date(2025, 1, 1): (1, 0),
+    }
+
+    batch = test_batch_v2_data()
+    batch["syncTaskBean"]["delete"] = [{"taskId": "b" * 24}]
+    stats.apply_batch(GetBatchV2.model_validate(batch))
+    assert len(stats) == 1
+    assert _counts(stats.counts("month", start, end)) == {date(2025, 1, 1): (0, 0)}
+    by_tag = stats.counts_by_tag("month", date(2025, 2, 1), date(2025, 2, 1))
+    assert {k: _counts(v) for k, v in by_tag.items()} == {
+        "work": {date(2025, 2, 1): (1, 0)},
+    }
+
+
+def test_counts_by_group_updates(test_tasks, use_numpy):
+    stats = TaskStatistics(test_tasks, use_numpy=use_numpy)
+    start, end = date(2025, 1, 1), date(2025, 2, 1)
+
+    # a task with several tags is counted once for each of them
+    stats.upsert_task(test_tasks[1].model_copy(update={"tags": ["work", "home"]}))
+    by_tag = stats.counts_by_tag("month", start, end)
+    assert {k: _counts(v) for k, v in by_tag.items()} == {
+        tag: _counts(stats.counts("month", start, end, tag=tag))
+        for tag in ("work", "home")
+    }
+    assert _counts(by_tag["home"]) == {date(2025, 1, 1): (1, 0), end: (0, 0)}
+
+    # projects without tasks left are skipped
+    stats.remove_task("c" * 24)
+    stats.upsert_task(test_tasks[3].model_copy(update={"project_id": P1}))
+    assert list(stats.counts_by_project("month", start, end)) == [P1]
+    assert _counts(
+        stats.counts("month", start, end, project_id=P1, tag="work"),
+    ) == {date(2025, 1, 1): (1, 1), end: (0, 0)}
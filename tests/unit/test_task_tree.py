@@ -0,0 +1,129 @@
+import pytest
+
+from pyticktick.models.v2 import (
+    GetBatchV2,
+    PostBatchTaskParentV2,
+    SetTaskParentV2,
+    TaskV2,
+    UnSetTaskParentV2,
+)
+from pyticktick.task_tree import SubtreeProgress, TaskTree
+
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+D = "67ec273212e1101e875f0a04"
+E = "67ec273212e1101e875f0a05"
+
+
+@pytest.fixture()
+def test_tree(test_task_v2_data) -> TaskTree:
+    #  A          E
+    #  ├── B
+    #  │   └── C
+    #  └── D
+    return TaskTree(
+        [
+            TaskV2.model_validate(test_task_v2_data(id=A)),
+            TaskV2.model_validate(test_task_v2_data(id=B, parentId=A, status=2)),
+            TaskV2.model_validate(
+                test_task_v2_data(
+                    id=C,
+                    parentId=B,
+                    kind="CHECKLIST",
+                    items=[
+                        {"id": "67ec273212e1101e875f0b01", "status": 1},
+                        {"id": "67ec273212e1101e875f0b02", "status": 0},
+                    ],
+                ),
+            ),
+            TaskV2.model_validate(test_task_v2_data(id=D, parentId=A)),
+            TaskV2.model_validate(test_task_v2_data(id=E)),
+        ],
+    )
+
+
+def test_task_tree(test_tree):
+    assert len(test_tree) == 5
+    assert test_tree.roots == [A, E]
+    assert test_tree.children(A) == [B, D]
+    assert test_tree.parent(C) == B
+    assert [test_tree.depth(i) for i in (A, B, C, D, E)] == [0, 1, 2, 1, 0]
+    assert test_tree.ancestors(C) == [B, A]
+    assert test_tree.descendants(A) == [B, C, D]
+    assert test_tree.descendants(C) == []
+    assert test_tree.is_ancestor(A, C)
+    assert not test_tree.is_ancestor(C, A)
+    assert not test_tree.is_ancestor(A, A)
+    assert not test_tree.is_ancestor(D, C)
+
+
+def test_task_tree_progress(test_tree):
+    assert test_tree.progress(C) == SubtreeProgress(completed=1, total=3)
+    assert test_tree.progress(B) == SubtreeProgress(completed=2, total=4)
+    assert test_tree.progress(A) == SubtreeProgress(completed=2, total=6)
+    assert test_tree.progress(A).ratio == pytest.approx(1 / 3)
+    assert SubtreeProgress(0, 0).ratio == 0.0
+
+
+def test_task_tree_orphans_and_cycles(test_task_v2_data):
+    tree = TaskTree(
+        [
+            TaskV2.model_validate(test_task_v2_data(id=A, parentId=E)),
+            TaskV2.model_validate(test_task_v2_data(id=B, parentId=C)),
+            TaskV2.model_validate(test_task_v2_data(id=C, parentId=B)),
+        ],
+    )
+    assert tree.parent(A) is None
+    assert sorted(tree.roots) == sorted([A, B])
+    assert tree.descendants(B) == [C]
+
+
+def test_task_tree_from_batch(test_task_v2_data, test_batch_v2_data):
+    batch = GetBatchV2.model_validate(
+        test_batch_v2_data(
+            tasks=[test_task_v2_data(id=A), test_task_v2_data(id=B, parentId=A)],
+        ),
+    )
+    tree = TaskTree.from_batch(batch)
+    assert tree.descendants(A) == [B]
+
+
+def test_task_tree_set_parent(test_tree):
+    test_tree.set_parent(B, E)
+    assert test_tree.parent(B) == E
+    assert test_tree.children(A) == [D]
+    assert test_tree.depth(C) == 2
+    assert test_tree.descendants(E) == [B, C]
+    assert test_tree.is_ancestor(E, C)
+    assert not test_tree.is_ancestor(A, C)
+    assert test_tree.progress(A) == SubtreeProgress(completed=0, total=2)
+    assert test_tree.progress(E) == SubtreeProgress(completed=2, total=5)
+
+    test_tree.set_parent(B, None)
+    assert test_tree.roots == [A, E, B]
+    assert test_tree.depth(C) == 1
+    assert test_tree.progress(E) == SubtreeProgress(completed=0, total=1)
+
+    with pytest.raises(ValueError, match="Cannot set"):
+        test_tree.set_parent(B, C)
+    with pytest.raises(ValueError, match="Cannot set"):
+        test_tree.set_parent(B, B)
+
+
+def test_task_tree_apply(test_tree):
+    test_tree.apply(
+        PostBatchTaskParentV2.model_validate(
+            [
+                UnSetTaskParentV2(old_parent_id=A, project_id="inbox123", task_id=D),
+                SetTaskParentV2(parent_id=C, project_id="inbox123", task_id=D),
+            ],
+        ),
+    )
+    assert test_tree.ancestors(D) == [C, B, A]
+    assert test_tree.depth(D) == 3
+
+    test_tree.apply(
+        UnSetTaskParentV2(old_parent_id=E, project_id="inbox123", task_id=D)
+    )
+    assert test_tree.parent(D) == C
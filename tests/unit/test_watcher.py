@@ -0,0 +1,200 @@
+import asyncio
+from threading import Thread
+from time import perf_counter
+
+import pytest
+
+from pyticktick.exceptions import RateLimitedError
+from pyticktick.models.v2 import GetBatchV2
+from pyticktick.watcher import (
+    ProjectCreated,
+    ProjectDeleted,
+    TagUpdated,
+    TaskCompleted,
+    TaskCreated,
+    TaskDeleted,
+    TaskUpdated,
+    WatchConfig,
+    Watcher,
+)
+
+A = "67ec273212e1101e875f0a01"
+B = "67ec273212e1101e875f0a02"
+C = "67ec273212e1101e875f0a03"
+P1 = "67ec23b18f08cf38dd957e10"
+P2 = "67ec23b18f08cf38dd957e11"
+
+
+@pytest.fixture()
+def test_batches(test_task_v2_data, test_batch_v2_data):
+    def _project(id_):
+        return {
+            "id": id_,
+            "etag": "abcd1234",
+            "groupId": None,
+            "inAll": True,
+            "modifiedTime": "2025-04-15T15:15:35.000+0000",
+            "name": id_,
+            "sortOption": None,
+            "background": None,
+            "barcodeNeedAudit": False,
+            "isOwner": True,
+            "sortOrder": 0,
+            "sortType": None,
+            "userCount": 1,
+            "closed": None,
+            "muted": False,
+            "transferred": None,
+            "notificationOptions": None,
+            "teamId": None,
+            "permission": None,
+            "timeline": None,
+            "needAudit": False,
+            "openToTeam": None,
+            "teamMemberPermission": None,
+            "source": 1,
+            "showType": None,
+            "reminderType": None,
+        }
+
+    def _tag(etag):
+        return {
+            "etag": etag,
+            "label": "Work",
+            "name": "work",
+            "rawName": "work",
+            "sortOrder": 0,
+            "type": 1,
+        }
+
+    initial = test_batch_v2_data(
+        tasks=[test_task_v2_data(id=A), test_task_v2_data(id=B)],
+        projectProfiles=[_project(P1)],
+        tags=[_tag("abcd1234")],
+    )
+    delta = test_batch_v2_data(
+        tasks=[
+            test_task_v2_data(id=A, etag="efgh5678", status=2),
+            test_task_v2_data(id=B, etag="efgh5678", title="Renamed"),
+            test_task_v2_data(id=C),
+        ],
+        projectProfiles=[_project(P2)],
+        tags=[_tag("efgh5678")],
+        checkPoint=2,
+    )
+    delta["syncTaskBean"]["delete"] = [{"taskId": A}]
+    idle = test_batch_v2_data(
+        projectProfiles=[_project(P2)],
+        tags=[_tag("efgh5678")],
+        checkPoint=3,
+    )
+    return [GetBatchV2.model_validate(b) for b in (initial, delta, idle)]
+
+
+def test_watcher_poll(mocker, test_batches):
+    client = mocker.Mock()
+    client.get_batch_v2.side_effect = test_batches
+    watcher = Watcher(WatchConfig(min_interval=1, backoff=2, jitter=0, smoothing=1))
+    watcher.add_account("alice", client)
+    received = []
+    watcher.subscribe(received.append)
+
+    assert watcher.poll("alice") == []
+    assert watcher.interval("alice") == 2
+
+    events = watcher.poll("alice")
+    assert [type(e) for e in events] == [
+        TaskCompleted,
+        TaskUpdated,
+        TaskCreated,
+        TaskDeleted,
+        ProjectCreated,
+        ProjectDeleted,
+        TagUpdated,
+    ]
+    assert all(e.account == "alice" for e in events)
+    assert events[1].task.title == "Renamed"
+    assert events[5].project_id == P1
+    assert received == events
+    assert watcher.interval("alice") == 1
+    client.get_batch_v2.assert_called_with(check_point=1)
+
+    # a busy account backs off slowly, until it has been idle for a while
+    assert watcher.poll("alice") == []
+    assert watcher.interval("alice") == 2
+    client.get_batch_v2.assert_called_with(check_point=2)
+
+
+def test_watcher_backoff(mocker):
+    client = mocker.Mock()
+    client.get_batch_v2.side_effect = RateLimitedError(429, "slow down", retry_after=60)
+    watcher = Watcher(WatchConfig(min_interval=1, max_interval=5, jitter=0))
+    watcher.add_account("alice", client)
+    with pytest.raises(ValueError, match="already watched"):
+        watcher.add_account("alice", client)
+
+    intervals = []
+    for _ in range(4):
+        _, interval = watcher._fetch("alice")
+        intervals.append(watcher.interval("alice"))
+        assert interval == 60
+    assert intervals == [2, 4, 5, 5]
+
+
+def test_watcher_run(mocker, test_batches):
+    alice = mocker.Mock()
+    alice.get_batch_v2.side_effect = [*test_batches, *[test_batches[2]] * 100]
+    bob = mocker.Mock()
+    bob.get_batch_v2.side_effect = RuntimeError("offline")
+    watcher = Watcher(WatchConfig(min_interval=0.01, max_interval=0.01))
+    watcher.add_account("alice", alice)
+
+    async def _main():
+        runner = asyncio.create_task(watcher.run())
+        received = []
+        async for event in watcher.events():
+            if not received:
+                watcher.add_account("bob", bob)
+            received.append(event)
+            if len(received) == 7:
+                await asyncio.sleep(0.1)
+                watcher.stop()
+        await runner
+        return received
+
+    received = asyncio.run(_main())
+    assert len(received) == 7
+    assert bob.get_batch_v2.called
+
+
+def test_watcher_events_from_thread(mocker, test_batches):
+    client = mocker.Mock()
+    client.get_batch_v2.side_effect = test_batches
+    watcher = Watcher()
+    watcher.add_account("alice", client)
+    polled = []
+
+    def _poll() -> None:
+        watcher.poll("alice")
+        polled.extend(watcher.poll("alice"))
+
+    async def _main():
+        events = watcher.events()
+        first = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        # Events dispatched from another thread wake up the iterator on its own loop,
+        # without waiting for anything else to wake the loop up.
+        thread = Thread(target=_poll)
+        thread.start()
+        start = perf_counter()
+        received = [await asyncio.wait_for(first, timeout=5)]
+        elapsed = perf_counter() - start
+        thread.join()
+        received += [await anext(events) for _ in polled[1:]]
+        await events.aclose()
+        return received, elapsed
+
+    received, elapsed = asyncio.run(_main())
+    assert elapsed < 1
+    assert len(polled) == 7
+    assert received == polled
@@ -1,7 +1,9 @@
+import json
+
 import pytest
 from pydantic import ValidationError
 
-from pyticktick.models.v2 import BaseModelV2, TagV2
+from pyticktick.models.v2 import BaseModelV2, TagV2, TaskV2
 
 
 def test_inherited_models_are_strict():
@@ -46,3 +48,18 @@ def test_override_forbid_extra_message_injector():
     match_ = r"Extra inputs are not permitted by default for `CustomModel`. Please set `override_forbid_extra` to `True` if you believe the TickTick API has diverged from the model."  # noqa: E501
     with pytest.raises(ValidationError, match=match_):
         CustomModel.model_validate(invalid_data)
+
+
+def test_shared_values_are_deduplicated(test_task_v2_data):
+    data = test_task_v2_data(
+        timeZone="America/New_York",
+        repeatFlag="RRULE:FREQ=DAILY;INTERVAL=1",
+        tags=["work"],
+        creator=1234567890,
+    )
+    # decode the JSON twice, so that each task starts from separate string objects
+    tasks = [TaskV2.model_validate(json.loads(json.dumps(data))) for _ in range(2)]
+    for name in ["project_id", "time_zone", "repeat_flag", "creator"]:
+        assert getattr(tasks[0], name) is getattr(tasks[1], name)
+    assert tasks[0].tags[0] is tasks[1].tags[0]
+    assert tasks[0].title is not tasks[1].title